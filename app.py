@@ -1,6 +1,23 @@
+import time
+# Start of the rerun, for the time-to-first-paint measurement (debug mode)
+RUN_STARTED = time.perf_counter()
+
+import os
+from contextlib import nullcontext
+from functools import partial
+
 import streamlit as st
 import pandas as pd
-import pydeck as pdk
+
+from readiness import runtime
+from readiness.aggregates import summary_cards
+from readiness.cards import deep_dive_cards, definition, detail_panel
+from readiness.history import snapshot_version
+from readiness.instrumentation import Profiler
+from readiness.lod import DEFAULT_MIN_SITES as LOD_MIN_SITES, viewport_bounds
+from readiness.layers import build_deck, view_state_for
+from readiness.scenarios import ALL_ROWS, EDITABLE_COLUMNS
+from readiness.scoring import FACTOR_LEVELS
 
 # --------------------
 # 1. Page Configuration
@@ -11,6 +28,28 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
+# Header goes out before anything heavy (styles, data) so a cold start
+# paints immediately
+st.title("AI Inference Flow Map — Africa (v2)")
+st.caption("Visual decision-support tool for AI inference paths (local, regional, offshore).")
+
+# Opt-in rerun instrumentation: READINESS_PROFILE=1, or ?debug=1 in the URL
+# when the deployment allows it with READINESS_DEBUG_PARAM=1
+@st.cache_resource
+def get_profiler():
+    # Shared ring buffer across sessions
+    return Profiler(track_allocations=os.environ.get("READINESS_PROFILE_ALLOC") == "1")
+
+DEBUG_PARAM = os.environ.get("READINESS_DEBUG_PARAM") == "1"
+PROFILING = os.environ.get("READINESS_PROFILE") == "1" or (DEBUG_PARAM and st.query_params.get("debug") == "1")
+profiler = get_profiler()
+if PROFILING:
+    profiler.begin_run()
+    st.session_state.full_rerun = True
+
+def profile(section):
+    return profiler.section(section) if PROFILING else nullcontext()
+
 # --------------------
 # 2. Styling (CSS Tooltips & Legend)
 # --------------------
@@ -157,93 +196,81 @@ st.markdown("""
 # --------------------
 # 3. Data Loading
 # --------------------
-@st.cache_data
-def load_data():
-    try:
-        df = pd.read_csv("data/ai_inference_readiness_africa_v0.csv")
-        # Clean column names to avoid KeyErrors from trailing spaces
-        df.columns = df.columns.str.strip()
-
-        # 1. Sanitize Coordinates
-        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
-        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
-        df = df.dropna(subset=['latitude', 'longitude'])
-
-        # ---------------------------
-        # FALLBACK FOR MISSING V2 DATA
-        # ---------------------------
-        # Ensure v2 columns exist even if CSV is outdated, to prevent app crash
-        v2_defaults = {
-            'ai_policy_signal': 'Unclear',
-            'ai_data_governance_posture': 'Unclear',
-            'ai_compute_policy_commitment': 'Absent',
-            'cross_border_ai_alignment': 'Unclear'
-        }
-        for col, default_val in v2_defaults.items():
-            if col not in df.columns:
-                df[col] = default_val
-
-        # ---------------------------
-        # FALLBACK FOR MISSING FOUNDER DATA (non-destructive)
-        # ---------------------------
-        founder_defaults = {
-            'primary_inference_route': 'Unclear',
-            'ai_compute_availability': 'Unclear',
-            'power_reliability': 'Unclear',
-            'cloud_maturity': 'Unclear',
-            'ops_friction': 'Unclear',
-            'founder_insight': 'Founder insight pending.',
-        }
-        for col, default_val in founder_defaults.items():
-            if col not in df.columns:
-                df[col] = default_val
-            else:
-                df[col] = df[col].fillna(default_val)
-
-        # ---------------------------
-        # COLOR MAPPING LOGIC
-        # ---------------------------
-        # 1. Founder Mode Colors (Readiness)
-        founder_colors = {
-            "Viable": [26, 150, 65],      # Green
-            "Emerging": [253, 174, 97],   # Orange
-            "Emerging (Early)": [215, 25, 28], # Red
-        }
-        # 2. Policy Mode Colors (Signal) - DIFFERENT PALETTE (Blues/Purples)
-        policy_colors = {
-            "Strong": [30, 64, 175],      # Strong Blue
-            "Emerging": [96, 165, 250],   # Light Blue
-            "Unclear": [156, 163, 175],   # Gray
-        }
-        # 3. Opacity
-        opacities = {"Viable": 230, "Emerging": 190, "Emerging (Early)": 150}
-
-        def get_founder_rgba(readiness):
-            rgb = founder_colors.get(readiness, [128, 128, 128])
-            alpha = opacities.get(readiness, 150)
-            return rgb + [alpha]
-
-        def get_policy_rgba(signal):
-            rgb = policy_colors.get(signal, [128, 128, 128])
-            # Policy mode: Make strong signals more opaque
-            alpha = 240 if signal == "Strong" else (180 if signal == "Emerging" else 100)
-            return rgb + [alpha]
-
-        df["color_founder"] = df["ai_inference_readiness"].apply(get_founder_rgba)
-        df["color_policy"] = df["ai_policy_signal"].apply(get_policy_rgba)
-        # 4. Radius Mapping
-        radius_map = {"Viable": 220000, "Emerging": 170000, "Emerging (Early)": 130000}
-        df["radius"] = df["ai_inference_readiness"].map(radius_map).fillna(120000)
-        return df
-    except FileNotFoundError:
-        return None
-import numpy as np
-
-def safe(val, fallback="Unclear"):
-    import pandas as pd
-    return val if pd.notna(val) and str(val).strip() != "" else fallback
-
-df = load_data()
+@st.cache_resource
+def get_dataset_store():
+    # One store per server process: every session reads the same frames by
+    # reference (no per-rerun copies), bounded by READINESS_CACHE_MAX_MB.
+    # It is the same store `python -m readiness.runtime serve` warms at boot.
+    # Frames are typed and categorical, with a Parquet sidecar under
+    # data/.cache/; extra sources in data/sources/ are merged in by country.
+    return runtime.shared_store()
+
+@st.cache_resource
+def get_dataset_watcher():
+    # Background mtime poll: edited CSVs are diffed by country and patched
+    # into the store before sessions switch to the new version on rerun
+    return runtime.shared_watcher()
+
+def load_data(dataset_version=None):
+    return get_dataset_store().get(dataset_version)
+
+# Derived artifacts, built once per dataset version (see readiness/runtime.py)
+def load_routing_engine(dataset_version=None):
+    return runtime.routing_engine(get_dataset_store(), dataset_version)
+
+def build_route_paths(dataset_version=None):
+    return runtime.route_paths(get_dataset_store(), dataset_version)
+
+def load_aggregates(dataset_version=None):
+    return runtime.aggregates(get_dataset_store(), dataset_version)
+
+def load_latency_model(dataset_version=None):
+    return runtime.latency_model(get_dataset_store(), dataset_version)
+
+def load_site_grid(dataset_version=None):
+    return runtime.site_grid(get_dataset_store(), dataset_version)
+
+def load_scenario_engine(dataset_version=None):
+    return runtime.scenario_engine(get_dataset_store(), dataset_version)
+
+def load_layer_urls(dataset_version=None):
+    return runtime.layer_urls(get_dataset_store(), dataset_version)
+
+@st.cache_resource
+def get_history():
+    # Snapshots recorded with `python -m readiness.history record`
+    return runtime.shared_history()
+
+LATEST = "Latest"
+
+def render_time_slider(history, live_version):
+    # Each snapshot is a store version of its own ("history-<seq>"), so
+    # moving the slider back and forth swaps cached frames and artifacts
+    entries = history.entries
+    choice = st.select_slider(
+        "Dataset as of",
+        options=[*range(len(entries)), LATEST],
+        value=LATEST,
+        format_func=lambda o: o if o == LATEST else entries[o]["as_of"] + (f" · {entries[o]['label']}" if entries[o]["label"] else ""),
+        key="as_of",
+    )
+    if choice == LATEST:
+        return live_version
+    if choice > 0:
+        # Only the countries the snapshot's delta touched are compared
+        changes = history.diff(choice - 1, choice)
+        st.caption(
+            f"Snapshot of {changes['to']}: {len(changes['changed'])} changed, "
+            f"{len(changes['added'])} added, {len(changes['removed'])} removed since {changes['from']}"
+        )
+    return snapshot_version(choice)
+
+with profile("data_loading"):
+    dataset_version = get_dataset_watcher().version
+    history = get_history().refresh()
+    if len(history):
+        dataset_version = render_time_slider(history, dataset_version)
+    df, country_index = load_data(dataset_version)
 
 if df is None:
     st.error("⚠️ CSV Not Loaded. Please check data path.")
@@ -252,15 +279,12 @@ if df is None:
 # --------------------
 # 4. Session State & Logic
 # --------------------
-if 'selected_country' not in st.session_state:
-    st.session_state.selected_country = sorted(df["country"].unique())[0]
+if st.session_state.get('selected_country') not in country_index:
+    st.session_state.selected_country = country_index.countries[0]
 
 # --------------------
 # 5. Header & Mode Switch
 # --------------------
-st.title("AI Inference Flow Map — Africa (v2)")
-st.caption("Visual decision-support tool for AI inference paths (local, regional, offshore).")
-
 # Mode Toggle
 col_mode_spacer, col_mode, col_mode_spacer2 = st.columns([3, 2, 3])
 with col_mode:
@@ -292,62 +316,44 @@ def render_summary_card(col, label, value, subtext):
         </div>
         """, unsafe_allow_html=True)
 
-if is_policy_mode:
-    # Policy Metrics
-    strong_policy = len(df[df['ai_policy_signal'] == 'Strong'])
-    data_open = len(df[df['ai_data_governance_posture'] == 'Flexible'])
-    explicit_compute = len(df[df['ai_compute_policy_commitment'] == 'Explicit'])
-    
-    render_summary_card(m1, "Markets w/ AI Strategy", strong_policy, "Official strategy + execution signals")
-    render_summary_card(m2, "Flexible Data Governance", data_open, "Supportive of AI data flows")
-    render_summary_card(m3, "Compute Commitment", explicit_compute, "Explicit state-backed infrastructure")
-else:
-    # Founder Metrics (v1)
-    viable_mkts = len(df[df['ai_inference_readiness'] == 'Viable'])
-    gpu_mkts = len(df[df['ai_compute_availability'].str.contains('GPU', case=False, na=False)])
-    render_summary_card(m1, "Tracked Markets", len(df), "Total African markets analyzed")
-    render_summary_card(m2, "Viable Inference Hubs", viable_mkts, "Ready for immediate deployment")
-    render_summary_card(m3, "Markets w/ Local GPU", gpu_mkts, "Confirmed H100/A100 availability")
+# Precomputed per dataset version (see readiness/aggregates.py)
+with profile("summary_metrics"):
+    aggregates = load_aggregates(dataset_version)
+    for col, (label, value, subtext) in zip((m1, m2, m3), summary_cards(aggregates, view_mode)):
+        render_summary_card(col, label, value, subtext)
+
+if PROFILING:
+    profiler.record("first_paint", time.perf_counter() - RUN_STARTED)
 
 st.markdown("---")
 
 # --------------------
 # 6. Main Content: Map + Selector
 # --------------------
-col_map, col_details = st.columns([2, 1])
-
-with col_details:
+# The selection lives in st.session_state.selected_country. The selectbox is
+# bound to it by key and map clicks update it from a callback, so changing the
+# market reruns only the market_explorer fragment (below), in a single pass.
+MAPBOX_TOKEN = st.secrets.get("MAPBOX_TOKEN", None)
+STATIC_LAYERS = st.get_option("server.enableStaticServing")
+
+def on_map_select(map_key, country_index, positions=None):
+    event = st.session_state.get(map_key)
+    indices = event["selection"]["indices"].get("base-scatter", []) if event else []
+    if len(indices) > 0:
+        # Clustered maps: a bin selects its representative (top-scoring) site
+        position = indices[0] if positions is None else positions[indices[0]]
+        st.session_state.selected_country = country_index.country_at(position)
+
+def render_selector(df, country_index, is_policy_mode):
     st.subheader("Select Market")
 
-    country_list = sorted(df["country"].unique())
+    # Dropdown logic (bound to the shared selection)
+    st.selectbox("Choose a country:", country_index.countries, key="selected_country")
 
-    # Dropdown logic
-    selected_country_name = st.selectbox(
-        "Choose a country:",
-        country_list,
-        index=country_list.index(st.session_state.selected_country)
-    )
-
-    if selected_country_name != st.session_state.selected_country:
-        st.session_state.selected_country = selected_country_name
-        st.rerun()
+    country_data = country_index.row(df, st.session_state.selected_country)
 
-    country_data = df[df["country"] == st.session_state.selected_country].iloc[0]
-
-    # Details Panel - Dynamic Content
-    if is_policy_mode:
-        status_label = "Policy Signal"
-        status_value = country_data['ai_policy_signal']
-        badge_style = "badge-strong" if status_value == "Strong" else ("badge-unclear" if status_value == "Unclear" else "badge-emerging")
-        insight_label = "Policy Insight"
-        # Dynamic insight text based on data points since separate column missing
-        insight_text = f"National policy signal is {status_value} with {country_data['ai_data_governance_posture'].lower()} data governance frameworks."
-    else:
-        status_label = "Readiness Status"
-        status_value = safe(country_data.get('ai_inference_readiness'))
-        badge_style = "badge-viable" if "Viable" in status_value else ("badge-early" if "Early" in status_value else "badge-emerging")
-        insight_label = "Founder Insight"
-        insight_text = safe(country_data.get('founder_insight'), "Founder insight not yet documented.")
+    # Details Panel - Dynamic Content (see readiness/cards.py)
+    status_label, status_value, badge_style, insight_label, insight_text = detail_panel(country_data, is_policy_mode)
 
     st.markdown(f"""
         <div style="margin-top: 20px; padding: 20px; border: 1px solid #e2e8f0; border-radius: 12px; background: white;">
@@ -361,103 +367,47 @@ with col_details:
             <div class="insight-box">"{insight_text}"</div>
         </div>
     """, unsafe_allow_html=True)
-
-with col_map:
-    # -- Map Logic --
-    MAPBOX_TOKEN = st.secrets.get("MAPBOX_TOKEN", None)
-    map_style = "mapbox://styles/mapbox/light-v11" if MAPBOX_TOKEN else None
-
-    view_state = pdk.ViewState(
-        latitude=float(country_data["latitude"]), 
-        longitude=float(country_data["longitude"]),
-        zoom=5.2, pitch=45.0, bearing=0
-    )
-
-    # 1. Path Layer (Same for both modes, context useful in both)
-    EU_HUB = {"lat": 43.0, "lon": 3.0}
-    REGIONAL_HUBS = {
-        "East": {"lat": -1.286389, "lon": 36.817223},
-        "West": {"lat": 6.524379, "lon": 3.379206},
-        "Southern": {"lat": -33.9249, "lon": 18.4241},
-        "North": {"lat": 30.0444, "lon": 31.2357},
-    }
-    paths = []
-    for _, row in df.iterrows():
-        start = [row["longitude"], row["latitude"]]
-        route = str(row.get("primary_inference_route", ""))
-        if route == "Regional-Tethered":
-            hub = REGIONAL_HUBS.get(row["region"])
-            if hub: paths.append({"path": [start, [hub["lon"], hub["lat"]]]})
-        elif route == "Hybrid-Edge":
-            paths.append({"path": [start, [EU_HUB["lon"], EU_HUB["lat"]]]})
-    
-    path_layer = pdk.Layer(
-        "PathLayer", data=pd.DataFrame(paths),
-        get_path="path", get_width=4,
-        get_color=[60, 120, 216], opacity=0.5, pickable=False
-    )
-
-    # 2. Base Scatter Layer - COLOR SWAPS HERE
-    active_color_col = "color_policy" if is_policy_mode else "color_founder"
-    
-    scatter_layer = pdk.Layer(
-        "ScatterplotLayer",
-        id="base-scatter",
-        data=df,
-        get_position=["longitude", "latitude"],
-        get_fill_color=active_color_col, # Dynamic Color Column
-        get_radius="radius",
-        get_line_color=[255, 255, 255],
-        get_line_width=2,
-        pickable=True, 
-        stroked=True,
-        auto_highlight=True,
-        radius_min_pixels=10,
-        radius_max_pixels=45,
-    )
-
-    # 3. Highlight Layer
-    highlight_df = df[df['country'] == st.session_state.selected_country]
-    halo_layer = pdk.Layer(
-        "ScatterplotLayer",
-        id="highlight-halo",
-        data=highlight_df,
-        get_position=["longitude", "latitude"],
-        get_radius="radius",
-        get_fill_color=[0, 0, 0, 0], 
-        get_line_color=[0, 200, 255], 
-        get_line_width=8000, 
-        stroked=True, filled=False,
-        radius_scale=1.2, radius_min_pixels=15, pickable=False
+    return country_data
+
+def render_map(df, country_index, country_data, dataset_version, view_mode):
+    view_state = view_state_for(country_data)
+    positions = None
+    if len(df) >= LOD_MIN_SITES:
+        # Dense datasets: per-cell bins for this zoom and viewport
+        grid = load_site_grid(dataset_version)
+        bounds = viewport_bounds(view_state.latitude, view_state.longitude, view_state.zoom)
+        level, bins = grid.query(view_state.zoom, bounds)
+        base_data, path_data = bins, grid.route_bins(level, bounds)
+        positions = bins["site"].to_numpy()
+    elif STATIC_LAYERS:
+        # Base layers by URL: the browser downloads them once per dataset
+        # version and only the halo + view state change
+        urls = load_layer_urls(dataset_version)
+        base_data, path_data = urls["scatter"], urls["paths"]
+    else:
+        base_data, path_data = df, build_route_paths(dataset_version)
+
+    # Path, base scatter (colors swap per mode) and highlight layers
+    deck = build_deck(
+        base_data,
+        path_data,
+        country_index.rows(df, st.session_state.selected_country),
+        view_state,
+        is_policy_mode=view_mode == "Policy Mode",
+        mapbox_token=MAPBOX_TOKEN,
     )
 
-    tooltip_html = "<b>{country}</b><br/>Policy Signal: {ai_policy_signal}" if is_policy_mode else "<b>{country}</b><br/>Status: {ai_inference_readiness}"
-
-    deck = pdk.Deck(
-        map_style=map_style,
-        api_keys={"mapbox": MAPBOX_TOKEN} if MAPBOX_TOKEN else None,
-        layers=[path_layer, scatter_layer, halo_layer],
-        initial_view_state=view_state,
-        tooltip={"html": tooltip_html},
-    )
-    
-    event = st.pydeck_chart(
+    # Stable per mode: a new selection updates the existing map (halo layer
+    # + initial view state) instead of remounting it; the mode toggle still
+    # remounts so the scatter colors refresh
+    map_key = f"map_{view_mode}"
+    st.pydeck_chart(
         deck,
         width="stretch",
-        selection_mode="single-object", 
-        on_select="rerun",
-        key=f"map_{st.session_state.selected_country}_{view_mode}" # Add view_mode to key to force refresh on toggle
+        selection_mode="single-object",
+        on_select=partial(on_map_select, map_key, country_index, positions),
+        key=map_key,
     )
-    
-    # Handle Map Selection
-    if event.selection and "base-scatter" in event.selection.indices:
-        indices = event.selection.indices["base-scatter"]
-        if len(indices) > 0:
-            clicked_index = indices[0]
-            clicked_country = df.iloc[clicked_index]["country"]
-            if clicked_country != st.session_state.selected_country:
-                st.session_state.selected_country = clicked_country
-                st.rerun()
 
 # --------------------
 # 7. Legend (Dynamic)
@@ -496,79 +446,165 @@ else:
         </div>
     </div>
     """
-st.markdown(legend_html, unsafe_allow_html=True)
 
 # --------------------
 # 8. Deep Dive Grid
 # --------------------
-st.markdown("### 🔍 Infrastructure Deep Dive")
-
-# Combined Definitions
-definitions = {
-    # Founder Mode
-    "Inference Route": "Where the AI model actually runs. 'Local' means it runs in-country. 'Hybrid' routes to a regional hub.",
-    "Latency to Europe": "Round-trip time (RTT) to major EU cloud hubs. Critical for real-time voice/video AI.",
-    "Compute Availability": "Local availability of GPU capacity (H100/A100s) versus CPU-only infrastructure.",
-    "Readiness Status": "Overall score combining power, compute, and policy for deployment feasibility.",
-    "Active Data Centers": "Number of operational, enterprise-grade facilities (Tier III equivalent).",
-    "Power Reliability": "Grid stability. Frequent outages force reliance on diesel, increasing inference costs.",
-    "Cloud Maturity": "Presence of Hyperscalers (AWS/Azure) or strong local cloud providers.",
-    "Ops Friction": "Difficulty of doing business: payments, cross-border data laws, or support.",
-    # Policy Mode
-    "AI Policy Signal": "Directional strength of national AI strategy. Strong = Clear framework; Unclear = No visible posture.",
-    "Data Governance": "Legal treatment of AI data. Flexible = Innovation friendly; Restricted = Sovereignty focused.",
-    "Compute Commitment": "Whether the state treats AI compute as strategic national infrastructure.",
-    "Cross-Border Alignment": "Openness to cross-border data flows essential for regional inference."
-}
-
-with st.container():
-    def render_card(col, label, value, subtext=None):
-        tooltip_text = definitions.get(label, "No definition available.")
-        with col:
-            st.markdown(f"""
-            <div class="metric-card">
-                <div class="metric-label">
-                    {label} 
-                    <div class="tooltip-container">
-                        <span class="info-icon">ⓘ</span>
-                        <span class="tooltip-text">{tooltip_text}</span>
-                    </div>
+# Card contents and the glossary live in readiness/cards.py
+def render_card(col, label, value, subtext=None):
+    tooltip_text = definition(label)
+    with col:
+        st.markdown(f"""
+        <div class="metric-card">
+            <div class="metric-label">
+                {label}
+                <div class="tooltip-container">
+                    <span class="info-icon">ⓘ</span>
+                    <span class="tooltip-text">{tooltip_text}</span>
                 </div>
-                <div class="metric-value" style="font-size: 1.1rem;">{value}</div>
-                {f'<div style="font-size:0.75rem; color:#9ca3af; margin-top:4px;">{subtext}</div>' if subtext else ''}
             </div>
-            """, unsafe_allow_html=True)
+            <div class="metric-value" style="font-size: 1.1rem;">{value}</div>
+            {f'<div style="font-size:0.75rem; color:#9ca3af; margin-top:4px;">{subtext}</div>' if subtext else ''}
+        </div>
+        """, unsafe_allow_html=True)
 
-    c1, c2, c3, c4 = st.columns(4)
-    
-    if is_policy_mode:
-        # Policy Mode Cards
-        render_card(c1, "AI Policy Signal", country_data['ai_policy_signal'])
-        render_card(c2, "Data Governance", country_data['ai_data_governance_posture'])
-        render_card(c3, "Compute Commitment", country_data['ai_compute_policy_commitment'])
-        render_card(c4, "Cross-Border Alignment", country_data['cross_border_ai_alignment'])
-
-        st.write("") # Row Break
-        # Just 4 cards for Policy Mode v2 for now, or repeat relevant ones
-        c5, c6, c7, c8 = st.columns(4)
-        render_card(c5, "Active Data Centers", country_data['active_data_centers'], "(Context)")
-        render_card(c6, "Power Reliability", safe(country_data.get('power_reliability')), "(Context)")
-        render_card(c7, "Cloud Maturity", safe(country_data.get('cloud_maturity')), "(Context)")
-        render_card(c8, "Ops Friction", safe(country_data.get('ops_friction')), "(Context)")
-    else:
-        # Founder Mode Cards (v1)
-        render_card(c1, "Inference Route", safe(country_data.get('primary_inference_route')))
-        render_card(c2, "Latency to Europe (RTT)", f"{safe(country_data.get('est_rtt_to_europe_ms'), 'N/A')} ms")
-        render_card(c3, "Compute Availability", safe(country_data.get('ai_compute_availability')))
-        render_card(c4, "Readiness Status", safe(country_data.get('ai_inference_readiness')))
-
-        st.write("")
-        c5, c6, c7, c8 = st.columns(4)
-        render_card(c5, "Active Data Centers", country_data['active_data_centers'], f"Pipeline: {country_data['dc_pipeline']}")
-        render_card(c6, "Power Reliability", safe(country_data.get('power_reliability')))
-        render_card(c7, "Cloud Maturity", safe(country_data.get('cloud_maturity')))
-        render_card(c8, "Ops Friction", safe(country_data.get('ops_friction')))
+def render_deep_dive(country_data, dataset_version, is_policy_mode):
+    nearest_hub = None if is_policy_mode else \
+        load_latency_model(dataset_version).nearest_hub(st.session_state.selected_country)
+    for i, cards in enumerate(deep_dive_cards(country_data, is_policy_mode, nearest_hub)):
+        if i:
+            st.write("") # Row Break
+        for col, (label, value, subtext) in zip(st.columns(4), cards):
+            render_card(col, label, value, subtext)
+
+# --------------------
+# Scenario presets (the first two follow the explorer's selection)
+# --------------------
+SCENARIO_PRESETS = {
+    "Selected market gets local GPUs": lambda c: (f"{c} gets local GPUs", {c: {"ai_compute_availability": "GPU available", "primary_inference_route": "Local-Native"}}),
+    "Selected market gets a cloud region": lambda c: (f"{c} gets a cloud region", {c: {"cloud_maturity": "Region"}}),
+    "Power reliability improves everywhere": lambda c: ("Power reliability +1 everywhere", {ALL_ROWS: {"power_reliability": "+1"}}),
+    "Ops friction eases everywhere": lambda c: ("Ops friction +1 everywhere", {ALL_ROWS: {"ops_friction": "+1"}}),
+    "Strong AI policy everywhere": lambda c: ("Strong AI policy everywhere", {ALL_ROWS: {"ai_policy_signal": "Strong"}}),
+}
+SELECTION_PRESETS = {"Selected market gets local GPUs", "Selected market gets a cloud region"}
+# One "local GPUs" scenario per market, for small datasets only
+PER_MARKET_LIMIT = 50
+
+def lab_is_stale(selected):
+    """True when the lab shows a selection preset for a market other than the explorer's."""
+    return selected is not None and selected != st.session_state.selected_country and \
+        bool(SELECTION_PRESETS.intersection(st.session_state.get("scenario_presets", [])))
+
+# --------------------
+# Market explorer fragment (selector, map, legend, deep dive)
+# --------------------
+@st.fragment
+def market_explorer(df, country_index, dataset_version, view_mode):
+    # Fragment-only reruns (a new selection) get their own profiler run id
+    if PROFILING and not st.session_state.pop("full_rerun", False):
+        profiler.begin_run()
+    is_policy_mode = view_mode == "Policy Mode"
+
+    col_map, col_details = st.columns([2, 1])
+    with col_details, profile("selector"):
+        country_data = render_selector(df, country_index, is_policy_mode)
+    # A fragment rerun leaves the Scenario Lab alone: rerun the app when the
+    # lab shows a preset for the previously selected market
+    if lab_is_stale(st.session_state.get("lab_selection")):
+        st.rerun()
+    with col_map, profile("map_layers"):
+        render_map(df, country_index, country_data, dataset_version, view_mode)
+
+    st.markdown(legend_html, unsafe_allow_html=True)
+
+    st.markdown("### 🔍 Infrastructure Deep Dive")
+    with st.container(), profile("deep_dive"):
+        render_deep_dive(country_data, dataset_version, is_policy_mode)
+
+# Selection as of this full rerun; fragment reruns of the explorer compare against it
+st.session_state.lab_selection = st.session_state.selected_country
+market_explorer(df, country_index, dataset_version, view_mode)
+
+# --------------------
+# Scenario Lab (what-if comparisons, own fragment)
+# --------------------
+def override_values(df, column):
+    if column in FACTOR_LEVELS:
+        return ["+1", "-1"] + list(FACTOR_LEVELS[column])
+    return [str(c) for c in df[column].astype("category").cat.categories]
+
+@st.fragment
+def scenario_lab(df, country_index, dataset_version, selected):
+    custom = st.session_state.setdefault("custom_scenarios", {})
+
+    chosen = st.multiselect("Compare scenarios:", list(SCENARIO_PRESETS), key="scenario_presets")
+    # ``selected`` comes from the last full rerun; picking a selection preset
+    # after a fragment-only selection change needs a fresh one
+    if lab_is_stale(selected):
+        st.rerun()
+    per_market = len(country_index) <= PER_MARKET_LIMIT and st.checkbox(
+        "Local GPUs in each market (one scenario per market)", key="scenario_per_market"
+    )
+
+    # Custom single-override scenarios
+    s1, s2, s3, s4 = st.columns([2, 2, 2, 1])
+    country = s1.selectbox("Market", [ALL_ROWS] + country_index.countries, key="scenario_country")
+    column = s2.selectbox("Column", EDITABLE_COLUMNS, key="scenario_column")
+    value = s3.selectbox("New value", override_values(df, column), key="scenario_value")
+    if s4.button("Add", width="stretch"):
+        target = "All markets" if country == ALL_ROWS else country
+        custom[f"{target}: {column} → {value}"] = {country: {column: value}}
+    if custom and st.button("Clear custom scenarios"):
+        custom.clear()
+
+    scenarios = dict(SCENARIO_PRESETS[name](selected) for name in chosen)
+    if per_market:
+        for market in country_index.countries:
+            scenarios[f"{market} gets local GPUs"] = SCENARIO_PRESETS["Selected market gets local GPUs"](market)[1]
+    scenarios.update(custom)
+    if not scenarios:
+        st.caption("Pick a preset or add an override to compare scenarios against the current data.")
+        return
+
+    result = load_scenario_engine(dataset_version).evaluate(scenarios)
+    st.dataframe(result["summary"], width="stretch", hide_index=True)
+    tab_scores, tab_routes = st.tabs(["Readiness changes", "Route changes"])
+    with tab_scores:
+        scores = result["scores"]
+        st.dataframe(scores[scores["delta"].abs() > 1e-6], width="stretch", hide_index=True)
+    with tab_routes:
+        st.dataframe(result["routes"], width="stretch", hide_index=True)
+
+with st.expander("🧪 Scenario Lab — what-if comparisons"):
+    with profile("scenarios"):
+        scenario_lab(df, country_index, dataset_version, st.session_state.lab_selection)
 
 st.markdown("---")
 caption_text = "v2 Policy Mode: Signals are directional and based on public strategy documents." if is_policy_mode else "v1 Founder Mode: Focuses on deployment reality and infrastructure readiness."
-st.caption(caption_text)
\ No newline at end of file
+st.caption(caption_text)
+
+# --------------------
+# 9. Debug: Rerun Timings (opt-in)
+# --------------------
+if PROFILING:
+    with st.expander("⏱ Rerun timings (debug)"):
+        records = profiler.snapshot()
+        if records:
+            timings = pd.DataFrame(records)
+            st.caption(f"Last {len(timings)} section timings across all sessions (ring buffer).")
+            st.dataframe(
+                timings.groupby("section")["wall_ms"].describe(percentiles=[0.5, 0.95])[["count", "50%", "95%", "max"]],
+                width="stretch",
+            )
+            st.dataframe(timings.tail(25).iloc[::-1], width="stretch", hide_index=True)
+        st.caption("Dataset store")
+        st.json(get_dataset_store().stats())
+        d1, d2 = st.columns(2)
+        d1.download_button("Export JSON", profiler.to_json(), "rerun_timings.json", "application/json")
+        d2.download_button("Export Prometheus", profiler.to_prometheus(), "rerun_timings.prom", "text/plain")
+
+    # Optional node_exporter textfile for scraping
+    prom_file = os.environ.get("READINESS_PROFILE_PROM_FILE")
+    if prom_file:
+        profiler.write_textfile(prom_file)
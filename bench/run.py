@@ -0,0 +1,202 @@
+"""Headless pipeline benchmarks (no Streamlit server or browser needed).
+
+    python -m bench.run                          # 10, 1k, 100k, 1M rows
+    python -m bench.run --sizes 10 1000 --repeat 5 --output bench.json
+    python -m bench.run --stages load derive     # skip the (slow) render stage
+    python -m bench.run --compare baseline.json  # exit 1 on p50 regression
+    python -m bench.run --stages derive.route --gpu-share 0.05   # denser hub set
+
+Each stage is timed on its own; peak memory comes from one extra run
+under tracemalloc so it does not skew the timings.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+
+from bench.synthetic import DEFAULT_GPU_SHARE, write_synthetic_csv, write_synthetic_sources
+from readiness.aggregates import build_aggregates
+from readiness.dataset import CountryIndex, add_render_columns, load_dataset, parse_csv
+from readiness.hubs import hub_frame
+from readiness.ingest import ingest
+from readiness.latency import LatencyModel
+from readiness.layers import build_deck, publish_layer_data, view_state_for
+from readiness.lod import SiteGrid
+from readiness.routing import HubIndex, RoutingEngine
+from readiness.scoring import score
+
+DEFAULT_SIZES = [10, 1_000, 100_000, 1_000_000]
+
+
+# ---------------------------
+# STAGES
+# ---------------------------
+def stages(csv_path, cache_dir, sources):
+    """(name, setup, fn) per stage; setup runs untimed before every repeat."""
+    parsed = parse_csv(csv_path)
+    df = add_render_columns(parsed.copy())
+    index = CountryIndex(df)
+    hubs = hub_frame(df)
+    engine = RoutingEngine(hubs)
+    paths = engine.paths(df)
+    hub_index = HubIndex(hubs)
+    first = index.countries[0]
+
+    static_dir = os.path.join(cache_dir, "static")
+
+    def clear_sidecar():
+        for name in os.listdir(cache_dir):
+            if name != "static":
+                os.remove(os.path.join(cache_dir, name))
+
+    def clear_static():
+        shutil.rmtree(static_dir, ignore_errors=True)
+
+    def site_grid():
+        grid = SiteGrid(df, paths)
+        level, bins = grid.query(view_state_for(index.row(df, first)).zoom)
+        return bins, grid.route_bins(level)
+
+    def render():
+        deck = build_deck(df, paths, index.rows(df, first), view_state_for(index.row(df, first)))
+        return deck.to_json()
+
+    return [
+        ("load.csv_parse", None, lambda: parse_csv(csv_path)),
+        ("load.sidecar_cold", clear_sidecar, lambda: load_dataset(csv_path, cache_dir=cache_dir)),
+        ("load.sidecar_warm", None, lambda: load_dataset(csv_path, cache_dir=cache_dir)),
+        ("load.ingest_sources", None, lambda: ingest(sources[0], sources[1])),
+        ("derive.render_columns", None, lambda: add_render_columns(parsed.copy())),
+        ("derive.score", None, lambda: score(df)),
+        ("derive.country_index", None, lambda: CountryIndex(df)),
+        ("derive.aggregates", None, lambda: build_aggregates(df)),
+        ("derive.route_paths", None, lambda: RoutingEngine(hub_frame(df)).paths(df)),
+        ("derive.route_nearest_k3", None, lambda: hub_index.query(df["latitude"], df["longitude"], 3)),
+        ("derive.latency_model", None, lambda: LatencyModel(df, hub_frame(df, offshore=False))),
+        ("derive.site_grid", None, site_grid),
+        ("render.deck_json", None, render),
+        ("render.layer_files", clear_static, lambda: publish_layer_data(df, paths, "bench", static_dir=static_dir)),
+    ]
+
+
+def measure(fn, setup, repeat):
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    if setup:
+        setup()
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return np.asarray(timings), peak
+
+
+def run(sizes, repeat, workdir, prefixes=None, gpu_share=DEFAULT_GPU_SHARE):
+    results = []
+    for rows in sizes:
+        csv_path = write_synthetic_csv(rows, workdir, gpu_share=gpu_share)
+        cache_dir = os.path.join(workdir, f".cache_{rows}")
+        os.makedirs(cache_dir, exist_ok=True)
+        # Large sizes get fewer repeats so the full suite stays practical
+        reps = max(1, repeat if rows <= 100_000 else repeat // 3)
+        sources = write_synthetic_sources(rows, workdir)
+        for name, setup, fn in stages(csv_path, cache_dir, sources):
+            if prefixes and not name.startswith(tuple(prefixes)):
+                continue
+            timings, peak = measure(fn, setup, reps)
+            p50 = float(np.percentile(timings, 50))
+            result = {
+                "stage": name,
+                "rows": rows,
+                "repeat": reps,
+                "p50_ms": round(p50 * 1000, 3),
+                "p95_ms": round(float(np.percentile(timings, 95)) * 1000, 3),
+                "mean_ms": round(float(timings.mean()) * 1000, 3),
+                "rows_per_s": round(rows / p50, 1) if p50 > 0 else None,
+                "peak_mem_mb": round(peak / 2**20, 3),
+            }
+            results.append(result)
+            print(f"{rows:>9} {name:<24} p50 {result['p50_ms']:>10.2f} ms  "
+                  f"p95 {result['p95_ms']:>10.2f} ms  peak {result['peak_mem_mb']:>9.2f} MB",
+                  file=sys.stderr)
+    return results
+
+
+# ---------------------------
+# REGRESSION CHECK
+# ---------------------------
+def compare(results, baseline, max_ratio):
+    """Stages whose p50 grew by more than ``max_ratio`` against the baseline."""
+    before = {(r["stage"], r["rows"]): r for r in baseline["results"]}
+    regressions = []
+    for r in results:
+        old = before.get((r["stage"], r["rows"]))
+        if old and old["p50_ms"] > 0 and r["p50_ms"] / old["p50_ms"] > max_ratio:
+            regressions.append({
+                "stage": r["stage"],
+                "rows": r["rows"],
+                "baseline_p50_ms": old["p50_ms"],
+                "p50_ms": r["p50_ms"],
+                "ratio": round(r["p50_ms"] / old["p50_ms"], 3),
+            })
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stages", nargs="+", help="only run stages starting with these prefixes")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--workdir", help="keep synthetic CSVs here (default: temp dir)")
+    parser.add_argument("--gpu-share", type=float, default=DEFAULT_GPU_SHARE,
+                        help=f"share of sites that are GPU hubs (default {DEFAULT_GPU_SHARE})")
+    parser.add_argument("--compare", help="baseline JSON report to check against")
+    parser.add_argument("--max-regression", type=float, default=1.25,
+                        help="fail when p50 exceeds baseline by this factor (default 1.25)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = args.workdir or tmp
+        os.makedirs(workdir, exist_ok=True)
+        results = run(args.sizes, args.repeat, workdir, args.stages, args.gpu_share)
+
+    report = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "gpu_share": args.gpu_share,
+        "results": results,
+    }
+    status = 0
+    if args.compare:
+        with open(args.compare) as fh:
+            report["regressions"] = compare(results, json.load(fh), args.max_regression)
+        status = 1 if report["regressions"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as fh:
+            fh.write(text + "\n")
+    else:
+        print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Synthetic datasets with the same schema as the readiness CSV."""
+import os
+
+import numpy as np
+import pandas as pd
+
+from readiness.dataset import DATA_PATH
+
+# Rough bounding box of the African continent
+LAT_RANGE = (-35.0, 37.0)
+LON_RANGE = (-17.0, 51.0)
+
+# Share of sites that are GPU markets (routing hubs) by default: a few per
+# thousand, so the hub set grows with the row count. Pass gpu_share to
+# benchmark denser hub sets.
+DEFAULT_GPU_SHARE = 0.003
+
+
+def compute_labels(gpu_share):
+    """ai_compute_availability pool: a third of the GPU markets fully GPU-equipped."""
+    return ["GPU available", "Limited GPU", "CPU-focused"], [gpu_share / 3, gpu_share * 2 / 3, 1 - gpu_share]
+
+
+# Label pools and weights (ai_compute_availability is redrawn from gpu_share)
+LABELS = {
+    "ai_inference_readiness": (["Viable", "Emerging", "Emerging (Early)"], [0.15, 0.55, 0.30]),
+    "dc_pipeline": (["Planned", "Under construction"], [0.6, 0.4]),
+    "ai_compute_availability": compute_labels(DEFAULT_GPU_SHARE),
+    "cloud_maturity": (["Region", "Local Zone", "PoP"], [0.1, 0.3, 0.6]),
+    "connectivity_role": (["Continental hub", "Regional hub", "Subsea gateway", "Europe-adjacent", "Regional"], [0.05, 0.15, 0.1, 0.1, 0.6]),
+    "power_reliability": (["Low", "Low-Medium", "Medium", "Medium (High Cost)", "Medium-High"], [0.2, 0.25, 0.3, 0.1, 0.15]),
+    "ops_friction": (["Low", "Medium", "High"], [0.2, 0.6, 0.2]),
+    "data_residency_constraint": (["Yes", "Unclear", "No / Sector-specific"], [0.3, 0.5, 0.2]),
+    "primary_inference_route": (["Local-Native", "Regional-Tethered", "Hybrid-Edge"], [0.15, 0.45, 0.40]),
+    "ai_policy_signal": (["Strong", "Emerging", "Unclear"], [0.15, 0.6, 0.25]),
+    "ai_data_governance_posture": (["Flexible", "Restricted", "Unclear"], [0.35, 0.35, 0.3]),
+    "ai_compute_policy_commitment": (["Explicit", "Implied", "Absent"], [0.15, 0.5, 0.35]),
+    "cross_border_ai_alignment": (["Supported", "Conditional", "Unclear"], [0.4, 0.4, 0.2]),
+}
+
+INSIGHTS = [
+    "Stable operating environment but limited AI compute depth.",
+    "Inference typically routed to regional hubs due to GPU scarcity.",
+    "Low latency to Europe makes offshore inference the default choice.",
+    "Reliable local inference despite high power OPEX.",
+]
+
+
+def region_for(lat, lon):
+    return np.where(lat < -10, "Southern Africa",
+           np.where(lat > 18, "North Africa",
+           np.where(lon < 15, "West Africa", "East Africa")))
+
+
+def synthetic_frame(rows, seed=0, gpu_share=DEFAULT_GPU_SHARE):
+    """Frame with the CSV's columns (raw strings, as read from disk)."""
+    rng = np.random.default_rng(seed)
+    lat = rng.uniform(*LAT_RANGE, rows).round(4)
+    lon = rng.uniform(*LON_RANGE, rows).round(4)
+    low = rng.integers(0, 20, rows)
+    data = {
+        "country": [f"Site {i:07d}" for i in range(rows)],
+        "region": region_for(lat, lon),
+        "latitude": lat,
+        "longitude": lon,
+        "active_data_centers": [f"{a}-{a + b}" for a, b in zip(low, rng.integers(1, 10, rows))],
+        "est_rtt_to_europe_ms": np.char.add("~", rng.integers(30, 200, rows).astype(str)),
+        "founder_insight": rng.choice(INSIGHTS, rows),
+    }
+    for col, (labels, weights) in {**LABELS, "ai_compute_availability": compute_labels(gpu_share)}.items():
+        data[col] = rng.choice(labels, rows, p=weights)
+
+    # Same column order as the real CSV
+    columns = pd.read_csv(DATA_PATH, nrows=0).columns.str.strip()
+    return pd.DataFrame(data)[list(columns)]
+
+
+def write_synthetic_csv(rows, directory, seed=0, gpu_share=DEFAULT_GPU_SHARE):
+    suffix = "" if gpu_share == DEFAULT_GPU_SHARE else f"_gpu{gpu_share:g}"
+    path = os.path.join(directory, f"synthetic_{rows}{suffix}.csv")
+    if not os.path.exists(path):
+        synthetic_frame(rows, seed, gpu_share).to_csv(path, index=False)
+    return path
+
+
+# Column groups for the multi-source ingestion benchmark
+SOURCE_GROUPS = {
+    "founder": ["dc_pipeline", "ai_compute_availability", "cloud_maturity", "power_reliability",
+                "ops_friction", "primary_inference_route", "founder_insight"],
+    "policy": ["ai_policy_signal", "ai_data_governance_posture",
+               "ai_compute_policy_commitment", "cross_border_ai_alignment"],
+}
+
+
+def write_synthetic_sources(rows, directory, seed=0):
+    """Main CSV without the grouped columns, plus one source CSV per group."""
+    source_dir = os.path.join(directory, f"sources_{rows}")
+    main_path = os.path.join(source_dir, "main.csv")
+    if not os.path.exists(main_path):
+        os.makedirs(source_dir, exist_ok=True)
+        frame = synthetic_frame(rows, seed)
+        grouped = [c for cols in SOURCE_GROUPS.values() for c in cols]
+        for name, cols in SOURCE_GROUPS.items():
+            frame[["country", *cols]].to_csv(os.path.join(source_dir, f"{name}.csv"), index=False)
+        frame.drop(columns=grouped).to_csv(main_path, index=False)
+    sources = [os.path.join(source_dir, f"{name}.csv") for name in SOURCE_GROUPS]
+    return main_path, sources
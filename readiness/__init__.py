@@ -0,0 +1 @@
+"""Headless core of the AI Inference Readiness Map (no Streamlit imports)."""
@@ -0,0 +1,87 @@
+"""Summary metrics for both view modes, computed once per dataset version."""
+import numpy as np
+import pandas as pd
+
+from readiness.encoding import category_flags
+
+# ---------------------------
+# SUMMARY CARD DEFINITIONS
+# ---------------------------
+# (metric key, card label, subtext) in display order
+SUMMARY_CARDS = {
+    "Founder Mode": [
+        ("tracked_markets", "Tracked Markets", "Total African markets analyzed"),
+        ("viable_markets", "Viable Inference Hubs", "Ready for immediate deployment"),
+        ("gpu_markets", "Markets w/ Local GPU", "Confirmed H100/A100 availability"),
+    ],
+    "Policy Mode": [
+        ("strong_policy", "Markets w/ AI Strategy", "Official strategy + execution signals"),
+        ("flexible_governance", "Flexible Data Governance", "Supportive of AI data flows"),
+        ("explicit_compute", "Compute Commitment", "Explicit state-backed infrastructure"),
+    ],
+}
+
+
+def metric_flags(df):
+    """One boolean column per summary metric."""
+    return pd.DataFrame({
+        # Founder Mode
+        "tracked_markets": np.ones(len(df), dtype=bool),
+        "viable_markets": category_flags(df["ai_inference_readiness"], lambda c: c == "Viable"),
+        "gpu_markets": category_flags(df["ai_compute_availability"], lambda c: "gpu" in str(c).lower()),
+        # Policy Mode
+        "strong_policy": category_flags(df["ai_policy_signal"], lambda c: c == "Strong"),
+        "flexible_governance": category_flags(df["ai_data_governance_posture"], lambda c: c == "Flexible"),
+        "explicit_compute": category_flags(df["ai_compute_policy_commitment"], lambda c: c == "Explicit"),
+    }, index=df.index)
+
+
+def build_aggregates(df, group_by="region"):
+    """Counts for every metric, overall and per ``group_by`` value.
+
+    A single groupby pass produces the per-group table; the overall counts
+    are its column sums, so no extra scan over the rows is needed.
+    """
+    flags = metric_flags(df)
+    keys = df[group_by].astype(object).fillna("Unknown")
+    grouped = flags.groupby(keys.to_numpy(), sort=True).sum().astype(int)
+    return {
+        "all": {k: int(v) for k, v in grouped.sum().items()},
+        "by_" + group_by: {
+            str(group): {k: int(v) for k, v in row.items()}
+            for group, row in grouped.iterrows()
+        },
+    }
+
+
+def update_aggregates(aggregates, removed, added, group_by="region"):
+    """Apply a row delta without rescanning the unchanged rows.
+
+    ``removed`` holds the old versions of deleted/edited rows and ``added``
+    the new versions of inserted/edited rows; cost is O(changed rows).
+    """
+    key = "by_" + group_by
+    minus = build_aggregates(removed, group_by)
+    plus = build_aggregates(added, group_by)
+
+    totals = {
+        k: v - minus["all"].get(k, 0) + plus["all"].get(k, 0)
+        for k, v in aggregates["all"].items()
+    }
+    groups = {}
+    for group in sorted(set(aggregates[key]) | set(plus[key])):
+        before = aggregates[key].get(group, {})
+        counts = {
+            k: before.get(k, 0) - minus[key].get(group, {}).get(k, 0) + plus[key].get(group, {}).get(k, 0)
+            for k in totals
+        }
+        # Groups with no rows left disappear, as in a full rebuild
+        if counts["tracked_markets"] > 0:
+            groups[group] = counts
+    return {"all": totals, key: groups}
+
+
+def summary_cards(aggregates, mode, group_by="region", group=None):
+    """[(label, value, subtext), ...] for a view mode, optionally one group."""
+    counts = aggregates["all"] if group is None else aggregates["by_" + group_by].get(group, {})
+    return [(label, counts.get(key, 0), subtext) for key, label, subtext in SUMMARY_CARDS[mode]]
@@ -0,0 +1,163 @@
+"""Command line and local HTTP JSON endpoint for readiness queries.
+
+    python -m readiness.api query '{"op": "rank", "limit": 5}'
+    python -m readiness.api query --file queries.json      # object or array (batch)
+    echo '[{"op": "summary"}, ...]' | python -m readiness.api query -
+    python -m readiness.api serve --port 8765
+
+Endpoints (stdlib ThreadingHTTPServer, meant for localhost):
+
+    GET  /health                  -> {"version": ...}
+    GET  /query?q=<json>          -> one response
+    POST /query   <object>        -> one response
+    POST /query   [<object>, ...] -> list of responses (batch)
+
+Responses carry an ETag of (dataset version, body); repeat GETs with
+If-None-Match get a 304 without a body.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from readiness.dataset import DATA_PATH
+from readiness.ingest import SOURCES_DIR
+from readiness.query import QueryError, QueryService
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY_BYTES = 8 * 1024 * 1024
+
+
+def execute(service, payload):
+    """Dispatch a decoded JSON payload: object -> run, array -> run_batch."""
+    if isinstance(payload, list):
+        return service.run_batch(payload)
+    return service.run(payload)
+
+
+# ---------------------------
+# HTTP
+# ---------------------------
+def make_handler(service):
+    class QueryHandler(BaseHTTPRequestHandler):
+        server_version = "ReadinessQuery/1"
+
+        def _send(self, status, body, etag=None):
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            if etag:
+                self.send_header("ETag", etag)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def _answer(self, payload):
+            try:
+                body = execute(service, payload)
+            except QueryError as exc:
+                return self._send(400, {"error": str(exc)})
+            except FileNotFoundError as exc:
+                return self._send(503, {"error": str(exc)})
+            except Exception as exc:
+                # A bug, not a bad query: still answer instead of dropping the connection
+                self.log_error("query failed: %r", exc)
+                return self._send(500, {"error": "Internal error"})
+            digest = hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest()[:16]
+            etag = f'"{digest}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            self._send(200, body, etag)
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path == "/health":
+                return self._send(200, {"version": service.version_fn()})
+            if url.path != "/query":
+                return self._send(404, {"error": f"Unknown path: {url.path}"})
+            raw = parse_qs(url.query).get("q", ["{}"])[0]
+            try:
+                payload = json.loads(raw)
+            except json.JSONDecodeError as exc:
+                return self._send(400, {"error": f"Invalid JSON: {exc}"})
+            self._answer(payload)
+
+        def do_POST(self):
+            if urlparse(self.path).path != "/query":
+                return self._send(404, {"error": f"Unknown path: {self.path}"})
+            length = int(self.headers.get("Content-Length", 0))
+            if length > MAX_BODY_BYTES:
+                return self._send(413, {"error": "Request body too large"})
+            try:
+                payload = json.loads(self.rfile.read(length) or b"{}")
+            except json.JSONDecodeError as exc:
+                return self._send(400, {"error": f"Invalid JSON: {exc}"})
+            self._answer(payload)
+
+        def log_message(self, format, *args):
+            # Keep stdout for query output; access logs go to stderr as usual
+            sys.stderr.write("%s - %s\n" % (self.address_string(), format % args))
+
+    return QueryHandler
+
+
+def serve(service, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    httpd = ThreadingHTTPServer((host, port), make_handler(service))
+    print(f"Serving readiness queries on http://{host}:{httpd.server_address[1]}", file=sys.stderr)
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        httpd.server_close()
+
+
+# ---------------------------
+# CLI
+# ---------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m readiness.api", description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH, help="dataset CSV")
+    parser.add_argument("--sources", default=SOURCES_DIR, help="directory of extra source CSVs")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("query", help="run one query (object) or a batch (array)")
+    query.add_argument("spec", nargs="?", default="-", help="JSON query; '-' reads stdin")
+    query.add_argument("--file", help="read the JSON query from a file")
+
+    server = commands.add_parser("serve", help="serve queries over HTTP")
+    server.add_argument("--host", default=DEFAULT_HOST)
+    server.add_argument("--port", type=int, default=DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        # The watcher keeps long-running servers on the latest CSV
+        serve(QueryService.from_path(args.data, watch=True, sources_dir=args.sources), args.host, args.port)
+        return 0
+
+    if args.file:
+        with open(args.file) as f:
+            raw = f.read()
+    else:
+        raw = sys.stdin.read() if args.spec == "-" else args.spec
+    try:
+        result = execute(QueryService.from_path(args.data, sources_dir=args.sources), json.loads(raw))
+    except (QueryError, json.JSONDecodeError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    json.dump(result, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+"""Detail panel and deep-dive card content, shared by the app and the exporter."""
+import pandas as pd
+
+# ---------------------------
+# GLOSSARY
+# ---------------------------
+# Card label -> tooltip text
+DEFINITIONS = {
+    # Founder Mode
+    "Inference Route": "Where the AI model actually runs. 'Local' means it runs in-country. 'Hybrid' routes to a regional hub.",
+    "Latency to Europe": "Round-trip time (RTT) to major EU cloud hubs. Critical for real-time voice/video AI.",
+    "Compute Availability": "Local availability of GPU capacity (H100/A100s) versus CPU-only infrastructure.",
+    "Readiness Status": "Overall score combining power, compute, and policy for deployment feasibility.",
+    "Active Data Centers": "Number of operational, enterprise-grade facilities (Tier III equivalent).",
+    "Power Reliability": "Grid stability. Frequent outages force reliance on diesel, increasing inference costs.",
+    "Cloud Maturity": "Presence of Hyperscalers (AWS/Azure) or strong local cloud providers.",
+    "Ops Friction": "Difficulty of doing business: payments, cross-border data laws, or support.",
+    # Policy Mode
+    "AI Policy Signal": "Directional strength of national AI strategy. Strong = Clear framework; Unclear = No visible posture.",
+    "Data Governance": "Legal treatment of AI data. Flexible = Innovation friendly; Restricted = Sovereignty focused.",
+    "Compute Commitment": "Whether the state treats AI compute as strategic national infrastructure.",
+    "Cross-Border Alignment": "Openness to cross-border data flows essential for regional inference."
+}
+
+NO_DEFINITION = "No definition available."
+
+
+def definition(label):
+    return DEFINITIONS.get(label, NO_DEFINITION)
+
+
+def safe(val, fallback="Unclear"):
+    return val if pd.notna(val) and str(val).strip() != "" else fallback
+
+
+# ---------------------------
+# DETAIL PANEL
+# ---------------------------
+def detail_panel(row, is_policy_mode=False):
+    """(status label, status value, badge class, insight label, insight text) for one market."""
+    if is_policy_mode:
+        status_value = row['ai_policy_signal']
+        badge_style = "badge-strong" if status_value == "Strong" else ("badge-unclear" if status_value == "Unclear" else "badge-emerging")
+        # Dynamic insight text based on data points since separate column missing
+        insight_text = f"National policy signal is {status_value} with {row['ai_data_governance_posture'].lower()} data governance frameworks."
+        return "Policy Signal", status_value, badge_style, "Policy Insight", insight_text
+
+    status_value = safe(row.get('ai_inference_readiness'))
+    badge_style = "badge-viable" if "Viable" in status_value else ("badge-early" if "Early" in status_value else "badge-emerging")
+    insight_text = safe(row.get('founder_insight'), "Founder insight not yet documented.")
+    return "Readiness Status", status_value, badge_style, "Founder Insight", insight_text
+
+
+# ---------------------------
+# DEEP DIVE GRID
+# ---------------------------
+def deep_dive_cards(row, is_policy_mode=False, nearest_hub=None):
+    """Two rows of four (label, value, subtext) cards.
+
+    ``nearest_hub`` is the (hub, RTT ms, band) triple from
+    ``LatencyModel.nearest_hub``; only Founder Mode shows it.
+    """
+    if is_policy_mode:
+        return [
+            [
+                ("AI Policy Signal", row['ai_policy_signal'], None),
+                ("Data Governance", row['ai_data_governance_posture'], None),
+                ("Compute Commitment", row['ai_compute_policy_commitment'], None),
+                ("Cross-Border Alignment", row['cross_border_ai_alignment'], None),
+            ],
+            # Just 4 cards for Policy Mode v2 for now, or repeat relevant ones
+            [
+                ("Active Data Centers", row['active_data_centers'], "(Context)"),
+                ("Power Reliability", safe(row.get('power_reliability')), "(Context)"),
+                ("Cloud Maturity", safe(row.get('cloud_maturity')), "(Context)"),
+                ("Ops Friction", safe(row.get('ops_friction')), "(Context)"),
+            ],
+        ]
+
+    hub, hub_ms, band = nearest_hub if nearest_hub is not None else (None, float("nan"), None)
+    hub_text = f"Nearest GPU hub: {hub} (~{hub_ms:.0f} ms est.) · {band}" if hub else "No other GPU hub in the dataset"
+    return [
+        [
+            ("Inference Route", safe(row.get('primary_inference_route')), None),
+            ("Latency to Europe (RTT)", f"{safe(row.get('est_rtt_to_europe_ms'), 'N/A')} ms", hub_text),
+            ("Compute Availability", safe(row.get('ai_compute_availability')), None),
+            ("Readiness Status", safe(row.get('ai_inference_readiness')), f"Model score: {row['readiness_score']:.0f}/100"),
+        ],
+        [
+            ("Active Data Centers", row['active_data_centers'], f"Pipeline: {row['dc_pipeline']}"),
+            ("Power Reliability", safe(row.get('power_reliability')), None),
+            ("Cloud Maturity", safe(row.get('cloud_maturity')), None),
+            ("Ops Friction", safe(row.get('ops_friction')), None),
+        ],
+    ]
@@ -0,0 +1,262 @@
+"""Typed dataset loader with a binary sidecar cache."""
+import hashlib
+import os
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from readiness.encoding import lookup_by_code
+from readiness.schema import DATASET_SCHEMA, summarize
+from readiness.scoring import score
+
+DATA_PATH = "data/ai_inference_readiness_africa_v0.csv"
+CACHE_DIR = os.path.join("data", ".cache")
+
+# Bump when the processed schema changes so stale sidecars are rebuilt
+SCHEMA_VERSION = "4"
+
+# ---------------------------
+# COLOR MAPPING LOGIC
+# ---------------------------
+# 1. Founder Mode Colors (Readiness)
+FOUNDER_COLORS = {
+    "Viable": [26, 150, 65],      # Green
+    "Emerging": [253, 174, 97],   # Orange
+    "Emerging (Early)": [215, 25, 28], # Red
+}
+# 2. Policy Mode Colors (Signal) - DIFFERENT PALETTE (Blues/Purples)
+POLICY_COLORS = {
+    "Strong": [30, 64, 175],      # Strong Blue
+    "Emerging": [96, 165, 250],   # Light Blue
+    "Unclear": [156, 163, 175],   # Gray
+}
+# 3. Opacity
+FOUNDER_OPACITY = {"Viable": 230, "Emerging": 190, "Emerging (Early)": 150}
+# Policy mode: Make strong signals more opaque
+POLICY_OPACITY = {"Strong": 240, "Emerging": 180}
+# 4. Radius Mapping
+RADIUS_MAP = {"Viable": 220000, "Emerging": 170000, "Emerging (Early)": 130000}
+
+FALLBACK_RGB = [128, 128, 128]
+
+
+def founder_rgba(df):
+    """Packed uint8 (N, 4) readiness colors."""
+    readiness = df["ai_inference_readiness"]
+    rgb = lookup_by_code(readiness, FOUNDER_COLORS, FALLBACK_RGB, np.uint8)
+    alpha = lookup_by_code(readiness, FOUNDER_OPACITY, 150, np.uint8)
+    return np.column_stack([rgb, alpha])
+
+
+def policy_rgba(df):
+    """Packed uint8 (N, 4) policy-signal colors."""
+    signal = df["ai_policy_signal"]
+    rgb = lookup_by_code(signal, POLICY_COLORS, FALLBACK_RGB, np.uint8)
+    alpha = lookup_by_code(signal, POLICY_OPACITY, 100, np.uint8)
+    return np.column_stack([rgb, alpha])
+
+
+def readiness_radius(df):
+    return lookup_by_code(df["ai_inference_readiness"], RADIUS_MAP, 120000, np.float32)
+
+
+# ---------------------------
+# CSV -> TYPED FRAME
+# ---------------------------
+def parse_csv(path=DATA_PATH):
+    df = pd.read_csv(path)
+    # Clean column names to avoid KeyErrors from trailing spaces
+    df.columns = df.columns.str.strip()
+    return normalize_frame(df, source=path)
+
+
+def normalize_frame(df, source=None):
+    """Raw source columns -> typed frame (see readiness/schema.py).
+
+    Rows the schema rejects (missing key, bad coordinates) are left out
+    with a warning naming the source; ``validate_frame`` returns them.
+    """
+    typed, issues = validate_frame(df)
+    rejected = issues[issues["rejected"].astype(bool)]
+    if len(rejected):
+        counts = summarize(rejected)
+        detail = ", ".join(f"{r.column}: {r.problem} ({r.rows})" for r in counts.itertuples())
+        warnings.warn(
+            f"{source or 'dataset'}: {rejected['row'].nunique()} rows rejected ({detail}); "
+            f"see python -m readiness.schema",
+            stacklevel=2,
+        )
+    return typed
+
+
+def validate_frame(df):
+    """(typed frame, issues frame) in one schema pass."""
+    return DATASET_SCHEMA.apply(df)
+
+
+# Columns computed from the source columns (never read from the CSV)
+# (colors are not stored: layers.py packs them per layer with founder_rgba / policy_rgba)
+DERIVED_COLUMNS = ["radius", "readiness_score"]
+
+
+def add_render_columns(df, rows=None):
+    """Attach radius and default readiness score.
+
+    With ``rows`` (positions), only those rows are recomputed and the
+    existing derived columns are kept for everything else.
+    """
+    if rows is None:
+        df["radius"] = readiness_radius(df)
+        df["readiness_score"] = score(df).to_numpy()
+        return df
+
+    rows = np.asarray(rows, dtype=np.intp)
+    if not len(rows):
+        return df
+    subset = df.iloc[rows]
+    patches = {
+        "radius": readiness_radius(subset),
+        "readiness_score": score(subset).to_numpy(),
+    }
+    for col, values in patches.items():
+        column = df[col].to_numpy(copy=True)
+        column[rows] = values
+        df[col] = column
+    return df
+
+
+# ---------------------------
+# BINARY SIDECAR CACHE
+# ---------------------------
+def dataset_version(path=DATA_PATH):
+    """Cheap cache key: changes whenever the CSV is rewritten."""
+    try:
+        stat = os.stat(path)
+        return f"{stat.st_mtime_ns}-{stat.st_size}"
+    except FileNotFoundError:
+        return None
+
+
+def file_hash(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def sidecar_path(path=DATA_PATH, cache_dir=CACHE_DIR):
+    stem = os.path.splitext(os.path.basename(path))[0]
+    return os.path.join(cache_dir, f"{stem}.parquet")
+
+
+def _read_sidecar(sidecar):
+    import pyarrow.parquet as pq
+
+    table = pq.read_table(sidecar)
+    meta = {k.decode(): v.decode() for k, v in (table.schema.metadata or {}).items()
+            if k.startswith(b"readiness.")}
+    return table, meta
+
+
+def _write_sidecar(df, sidecar, meta):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema_meta = dict(table.schema.metadata or {})
+    schema_meta.update({k.encode(): v.encode() for k, v in meta.items()})
+    table = table.replace_schema_metadata(schema_meta)
+
+    os.makedirs(os.path.dirname(sidecar), exist_ok=True)
+    tmp = f"{sidecar}.tmp"
+    pq.write_table(table, tmp)
+    os.replace(tmp, sidecar)
+
+
+def load_dataset(path=DATA_PATH, cache_dir=CACHE_DIR, use_cache=True):
+    """Load the typed frame, reusing the Parquet sidecar when it is fresh.
+
+    The sidecar is trusted when the CSV mtime matches; otherwise the CSV is
+    hashed and the sidecar is only reused if the content is unchanged.
+    Raises FileNotFoundError if the CSV is missing.
+    """
+    stat = os.stat(path)
+    mtime = str(stat.st_mtime_ns)
+    sidecar = sidecar_path(path, cache_dir)
+
+    df = None
+    digest = None
+    if use_cache:
+        try:
+            table, meta = _read_sidecar(sidecar)
+            if meta.get("readiness.schema") == SCHEMA_VERSION:
+                if meta.get("readiness.mtime") == mtime:
+                    df = table.to_pandas()
+                else:
+                    digest = file_hash(path)
+                    if meta.get("readiness.sha256") == digest:
+                        df = table.to_pandas()
+                        # Same content, new mtime (e.g. fresh checkout)
+                        _write_sidecar(df, sidecar, {**meta, "readiness.mtime": mtime})
+        except (ImportError, OSError, ValueError):
+            # No pyarrow, missing or corrupt sidecar: fall back to the CSV
+            df = None
+
+    if df is None:
+        df = parse_csv(path)
+        if use_cache:
+            try:
+                _write_sidecar(df, sidecar, {
+                    "readiness.schema": SCHEMA_VERSION,
+                    "readiness.mtime": mtime,
+                    "readiness.sha256": digest or file_hash(path),
+                })
+            except (ImportError, OSError):
+                pass
+
+    return add_render_columns(df)
+
+
+# ---------------------------
+# COUNTRY INDEX
+# ---------------------------
+class CountryIndex:
+    """country -> row position lookups, built once per dataset version.
+
+    Duplicated country names resolve to their first row, matching the
+    previous ``df[df["country"] == name].iloc[0]`` behavior.
+    """
+
+    def __init__(self, df):
+        self.names = df["country"].to_numpy(dtype=object)
+        unique, first = np.unique(self.names, return_index=True)
+        # Presorted list for the selector + its position lookup
+        self.countries = unique.tolist()
+        self.positions = dict(zip(self.countries, first.tolist()))
+        self.ordinals = {name: i for i, name in enumerate(self.countries)}
+
+    def __contains__(self, country):
+        return country in self.positions
+
+    def __len__(self):
+        return len(self.countries)
+
+    def position(self, country):
+        return self.positions[country]
+
+    def ordinal(self, country):
+        """Position of ``country`` in the sorted selector list."""
+        return self.ordinals[country]
+
+    def country_at(self, position):
+        return self.names[position]
+
+    def row(self, df, country):
+        return df.iloc[self.positions[country]]
+
+    def rows(self, df, country):
+        """Single-row frame (for layers that need a DataFrame)."""
+        pos = self.positions[country]
+        return df.iloc[pos:pos + 1]
@@ -0,0 +1,29 @@
+"""Categorical helpers shared by the loader, scoring and aggregates."""
+import numpy as np
+import pandas as pd
+
+
+def as_category(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype("category")
+
+
+def lookup_by_code(cat_series, table, fallback, dtype):
+    """Vectorized label -> value lookup through the category codes.
+
+    One row per category is built, plus a trailing fallback row that the
+    -1 code (missing label) indexes into.
+    """
+    cat_series = as_category(cat_series)
+    rows = [table.get(c, fallback) for c in cat_series.cat.categories]
+    rows.append(fallback)
+    return np.asarray(rows, dtype=dtype)[cat_series.cat.codes.to_numpy()]
+
+
+def category_flags(series, predicate):
+    """Evaluate ``predicate`` once per category and gather through the codes."""
+    series = as_category(series)
+    per_category = [bool(predicate(c)) for c in series.cat.categories]
+    per_category.append(False)  # code -1 (missing)
+    return np.asarray(per_category)[series.cat.codes.to_numpy()]
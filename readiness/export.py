@@ -0,0 +1,354 @@
+"""Offline export: per-country HTML briefs and deck JSON snapshots.
+
+    python -m readiness.export                                # every country -> exports/
+    python -m readiness.export --countries Kenya Ghana --out briefs
+    python -m readiness.export --workers 4 --base-url https://example.org/briefs/
+
+Output directory:
+
+    index.html                    summary cards and a table linking every report
+    reports/<slug>.html           detail panel + deep-dive cards, both modes
+    decks/<slug>.<mode>.json      pydeck / deck.gl JSON for the market's map view
+    layers/<version>/*.csv        base layers, written once and shared by every snapshot
+    manifest.jsonl                one line per country, appended as chunks finish
+
+Countries are split into chunks of ``READINESS_EXPORT_CHUNK`` and rendered on
+a process pool (``READINESS_EXPORT_WORKERS``). Each worker loads the dataset
+once from the Parquet sidecar the parent leaves behind, then writes every
+file itself (atomically), so an interrupted run keeps the reports it
+finished. Reports are self-contained HTML with print styles; print them
+from a browser for a PDF. Card contents and the glossary come from
+readiness/cards.py, the same as the app's deep-dive grid.
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+from readiness.aggregates import SUMMARY_CARDS, build_aggregates, summary_cards
+from readiness.cards import deep_dive_cards, definition, detail_panel
+from readiness.dataset import DATA_PATH, CountryIndex
+from readiness.hubs import hub_frame
+from readiness.ingest import SOURCES_DIR, load_merged, merged_version
+from readiness.latency import LatencyModel
+from readiness.routing import RoutingEngine
+
+OUT_DIR = os.environ.get("READINESS_EXPORT_DIR", "exports")
+MAX_WORKERS = int(os.environ.get("READINESS_EXPORT_WORKERS", str(os.cpu_count() or 1)))
+CHUNK_SIZE = int(os.environ.get("READINESS_EXPORT_CHUNK", "64"))
+
+# File suffix -> view mode
+MODES = {"founder": "Founder Mode", "policy": "Policy Mode"}
+
+STYLE = """
+body {font-family: -apple-system, "Segoe UI", Roboto, sans-serif; color: #111827; max-width: 960px; margin: 2rem auto; padding: 0 1rem;}
+h1 {margin-bottom: 0.25rem;} .caption {color: #6b7280; font-size: 0.875rem;}
+.grid {display: grid; grid-template-columns: repeat(4, 1fr); gap: 12px; margin: 12px 0;}
+.grid.summary {grid-template-columns: repeat(3, 1fr);}
+.metric-card {background: #fff; border: 1px solid #e5e7eb; border-radius: 0.75rem; padding: 1rem; break-inside: avoid;}
+.metric-label {font-size: 0.875rem; color: #6b7280; font-weight: 500;}
+.metric-value {font-size: 1.1rem; font-weight: 700; margin-top: 0.25rem;}
+.subtext {font-size: 0.75rem; color: #9ca3af; margin-top: 4px;}
+.info-icon {color: #9ca3af; cursor: help;}
+.panel {margin: 20px 0; padding: 20px; border: 1px solid #e2e8f0; border-radius: 12px;}
+.panel-head {display: flex; justify-content: space-between; align-items: center;}
+.insight-box {background: #f8fafc; border-left: 4px solid #3b82f6; padding: 1rem; color: #334155; font-style: italic;}
+.badge {padding: 4px 10px; border-radius: 9999px; font-weight: 600; font-size: 0.75rem;}
+.badge-viable {background: #dcfce7; color: #166534;}
+.badge-emerging {background: #fef3c7; color: #92400e;}
+.badge-early {background: #fee2e2; color: #991b1b;}
+.badge-strong {background: #1e40af; color: #eff6ff;}
+.badge-unclear {background: #9ca3af; color: #f3f4f6;}
+table {border-collapse: collapse; width: 100%; font-size: 0.875rem;}
+th, td {text-align: left; padding: 6px 8px; border-bottom: 1px solid #e5e7eb;}
+dt {font-weight: 600; margin-top: 8px;} dd {margin-left: 0; color: #374151; font-size: 0.875rem;}
+@media print {body {margin: 0;} .no-print {display: none;} section {break-inside: avoid;}}
+"""
+
+PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title><style>{style}</style></head>
+<body>
+{body}
+<p class="caption">Dataset version {version} · generated {generated}</p>
+</body></html>
+"""
+
+
+def slugify(name):
+    return re.sub(r"[^a-z0-9]+", "-", str(name).lower()).strip("-") or "market"
+
+
+def assign_slugs(countries):
+    """country -> unique file stem."""
+    slugs, seen = {}, {}
+    for country in countries:
+        base = slugify(country)
+        seen[base] = seen.get(base, 0) + 1
+        slugs[country] = base if seen[base] == 1 else f"{base}-{seen[base]}"
+    return slugs
+
+
+def write_atomic(path, text):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.replace(tmp, path)
+
+
+def esc(value):
+    return html.escape(str(value))
+
+
+# ---------------------------
+# HTML
+# ---------------------------
+def card_html(label, value, subtext=None):
+    return (
+        f'<div class="metric-card"><div class="metric-label">{esc(label)} '
+        f'<span class="info-icon" title="{esc(definition(label))}">ⓘ</span></div>'
+        f'<div class="metric-value">{esc(value)}</div>'
+        + (f'<div class="subtext">{esc(subtext)}</div>' if subtext else "")
+        + "</div>"
+    )
+
+
+def mode_section(country, row, mode, cards, deck_href):
+    status_label, status_value, badge_style, insight_label, insight_text = detail_panel(row, mode == "Policy Mode")
+    grids = "".join(
+        '<div class="grid">' + "".join(card_html(*card) for card in row_cards) + "</div>"
+        for row_cards in cards
+    )
+    return (
+        f"<section><h2>{esc(mode)}</h2>"
+        f'<div class="panel"><div class="metric-label">{esc(status_label)}</div>'
+        f'<div class="panel-head"><h3>{esc(country)}</h3>'
+        f'<span class="badge {badge_style}">{esc(status_value)}</span></div>'
+        f'<div class="metric-label">{esc(insight_label)}</div>'
+        f'<div class="insight-box">"{esc(insight_text)}"</div></div>'
+        f"{grids}"
+        f'<p class="no-print"><a href="{esc(deck_href)}">Map snapshot (deck JSON)</a></p></section>'
+    )
+
+
+def report_html(country, row, nearest_hub, slug, version, generated):
+    sections, labels = [], []
+    for suffix, mode in MODES.items():
+        cards = deep_dive_cards(row, mode == "Policy Mode", nearest_hub)
+        sections.append(mode_section(country, row, mode, cards, f"../decks/{slug}.{suffix}.json"))
+        labels += [card[0] for row_cards in cards for card in row_cards]
+    glossary = "".join(
+        f"<dt>{esc(label)}</dt><dd>{esc(definition(label))}</dd>" for label in dict.fromkeys(labels)
+    )
+    body = (
+        f'<p class="no-print"><a href="../index.html">← All markets</a></p>'
+        f"<h1>{esc(country)}</h1>"
+        f'<p class="caption">{esc(row.get("region", ""))} · AI inference readiness brief</p>'
+        f"{''.join(sections)}<section><h2>Definitions</h2><dl>{glossary}</dl></section>"
+    )
+    return PAGE.format(title=esc(f"{country} — AI inference readiness"), style=STYLE, body=body,
+                       version=esc(version), generated=esc(generated))
+
+
+def index_html(df, index, slugs, version, generated):
+    aggregates = build_aggregates(df)
+    summaries = "".join(
+        f"<h2>{esc(mode)}</h2><div class=\"grid summary\">"
+        + "".join(card_html(label, value, subtext) for label, value, subtext in summary_cards(aggregates, mode))
+        + "</div>"
+        for mode in SUMMARY_CARDS
+    )
+    columns = ["region", "ai_inference_readiness", "readiness_score", "ai_policy_signal"]
+    records = df[columns].iloc[[index.position(c) for c in slugs]].to_dict("records")
+    rows = []
+    for (country, slug), row in zip(slugs.items(), records):
+        rows.append(
+            f'<tr><td><a href="reports/{slug}.html">{esc(country)}</a></td><td>{esc(row["region"])}</td>'
+            f'<td>{esc(row["ai_inference_readiness"])}</td><td>{row["readiness_score"]:.0f}</td>'
+            f'<td>{esc(row["ai_policy_signal"])}</td></tr>'
+        )
+    body = (
+        "<h1>AI Inference Readiness — Africa</h1>"
+        f'<p class="caption">{len(slugs)} market briefs</p>{summaries}'
+        "<h2>Markets</h2><table><tr><th>Market</th><th>Region</th><th>Readiness</th>"
+        f"<th>Score</th><th>Policy signal</th></tr>{''.join(rows)}</table>"
+    )
+    return PAGE.format(title="AI inference readiness briefs", style=STYLE, body=body,
+                       version=esc(version), generated=esc(generated))
+
+
+# ---------------------------
+# WORKERS
+# ---------------------------
+class Exporter:
+    """Renders and writes one country's report and deck snapshots."""
+
+    def __init__(self, df, out_dir, layer_urls, version, generated):
+        self.df = df
+        self.index = CountryIndex(df)
+        self.latency = LatencyModel(df, hub_frame(df, offshore=False))
+        self.out_dir = out_dir
+        self.version = version
+        self.generated = generated
+        self.templates = self.deck_templates(layer_urls)
+
+    def deck_templates(self, layer_urls):
+        """mode -> deck JSON dict; snapshots only differ in halo row and view state.
+
+        Building a pydeck Deck per snapshot costs ~20 ms (mostly the halo's
+        scatter frame and pydeck's own setup), so each mode's deck is built
+        once and the two per-country fields are filled in as plain dicts.
+        """
+        # pydeck is only needed here, not for the reports
+        from readiness.layers import build_deck, scatter_frame, view_state_for
+
+        first = self.index.countries[0]
+        halo = scatter_frame(self.df)
+        self.halo = {col: halo[col].to_numpy() for col in ("x", "y", "r")}
+        templates = {}
+        for mode in MODES.values():
+            deck = build_deck(
+                layer_urls["scatter"], layer_urls["paths"],
+                self.index.rows(self.df, first), view_state_for(self.index.row(self.df, first)),
+                is_policy_mode=mode == "Policy Mode",
+            )
+            templates[mode] = json.loads(deck.to_json())
+        return templates
+
+    def deck_json(self, row, pos, mode):
+        deck = dict(self.templates[mode])
+        deck["initialViewState"] = {
+            **deck["initialViewState"],
+            "latitude": float(row["latitude"]),
+            "longitude": float(row["longitude"]),
+        }
+        halo = {"x": float(self.halo["x"][pos]), "y": float(self.halo["y"][pos]), "r": int(self.halo["r"][pos])}
+        deck["layers"] = [
+            {**layer, "data": [halo]}
+            if layer.get("id") == "highlight-halo" else layer
+            for layer in deck["layers"]
+        ]
+        return json.dumps(deck, sort_keys=True)
+
+    def export(self, country, slug, row, pos):
+        nearest_hub = self.latency.nearest_hub(country)
+        report = os.path.join(self.out_dir, "reports", f"{slug}.html")
+        write_atomic(report, report_html(country, row, nearest_hub, slug, self.version, self.generated))
+        decks = {}
+        for suffix, mode in MODES.items():
+            decks[suffix] = os.path.join(self.out_dir, "decks", f"{slug}.{suffix}.json")
+            write_atomic(decks[suffix], self.deck_json(row, pos, mode))
+        return {"country": country, "report": report, "decks": decks}
+
+    def export_chunk(self, items):
+        # One bulk row extraction per chunk instead of a Series per country
+        positions = [self.index.position(country) for country, _ in items]
+        rows = self.df.iloc[positions].to_dict("records")
+        return [self.export(country, slug, row, pos) for (country, slug), row, pos in zip(items, rows, positions)]
+
+
+_exporter = None
+
+
+def _init_worker(path, sources_dir, out_dir, layer_urls, version, generated):
+    global _exporter
+    df = load_merged(path, sources_dir)
+    if merged_version(path, sources_dir) != version:
+        raise RuntimeError("Dataset changed during export; run it again")
+    _exporter = Exporter(df, out_dir, layer_urls, version, generated)
+
+
+def _export_chunk(items):
+    return _exporter.export_chunk(items)
+
+
+# ---------------------------
+# PIPELINE
+# ---------------------------
+def export(path=DATA_PATH, sources_dir=SOURCES_DIR, out_dir=OUT_DIR, countries=None,
+           workers=MAX_WORKERS, chunk_size=CHUNK_SIZE, base_url=""):
+    """Write reports, snapshots, shared layers, manifest and index; returns a run summary.
+
+    Layer URLs inside the deck JSON are ``base_url`` + ``layers/...``, i.e.
+    relative to the export directory unless it is served from elsewhere.
+    """
+    from readiness.layers import prune_layer_data, publish_layer_data
+
+    start = time.perf_counter()
+    version = merged_version(path, sources_dir)
+    # Also leaves the Parquet sidecar the workers load from
+    df = load_merged(path, sources_dir)
+    index = CountryIndex(df)
+    if countries is None:
+        countries = index.countries
+    unknown = [c for c in countries if c not in index]
+    if unknown:
+        raise ValueError(f"Unknown country: {unknown[0]!r}")
+    slugs = assign_slugs(countries)
+    generated = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M UTC")
+
+    for sub in ("reports", "decks"):
+        os.makedirs(os.path.join(out_dir, sub), exist_ok=True)
+    paths = RoutingEngine(hub_frame(df)).paths(df)
+    publish_layer_data(df, paths, version, static_dir=out_dir)
+    prune_layer_data([version], static_dir=out_dir)
+    layer_urls = {name: f"{base_url}layers/{version}/{name}.csv" for name in ("scatter", "paths")}
+
+    items = list(slugs.items())
+    chunk_size = max(chunk_size, 1)
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    exported = 0
+    with open(os.path.join(out_dir, "manifest.jsonl"), "w", encoding="utf-8") as manifest:
+        def record(entries):
+            nonlocal exported
+            for entry in entries:
+                manifest.write(json.dumps(entry) + "\n")
+            manifest.flush()
+            exported += len(entries)
+
+        if workers <= 1 or len(chunks) <= 1:
+            exporter = Exporter(df, out_dir, layer_urls, version, generated)
+            for chunk in chunks:
+                record(exporter.export_chunk(chunk))
+        else:
+            initargs = (path, sources_dir, out_dir, layer_urls, version, generated)
+            with ProcessPoolExecutor(min(workers, len(chunks)), initializer=_init_worker, initargs=initargs) as pool:
+                for future in as_completed([pool.submit(_export_chunk, chunk) for chunk in chunks]):
+                    record(future.result())
+
+    write_atomic(os.path.join(out_dir, "index.html"), index_html(df, index, slugs, version, generated))
+    return {
+        "version": version, "countries": exported, "out_dir": out_dir,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m readiness.export", description=__doc__.splitlines()[0])
+    parser.add_argument("--data", default=DATA_PATH, help="dataset CSV")
+    parser.add_argument("--sources", default=SOURCES_DIR, help="directory of extra source CSVs")
+    parser.add_argument("--out", default=OUT_DIR, help="output directory")
+    parser.add_argument("--countries", nargs="+", help="only these markets (default: all)")
+    parser.add_argument("--workers", type=int, default=MAX_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--base-url", default="", help="prefix for layer URLs in the deck JSON")
+    args = parser.parse_args(argv)
+    try:
+        summary = export(args.data, args.sources, args.out, args.countries,
+                         args.workers, args.chunk_size, args.base_url)
+    except ValueError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    print(f"{summary['countries']} markets exported to {summary['out_dir']} in {summary['seconds']}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,396 @@
+"""Append-only, time-versioned snapshots of the dataset.
+
+    python -m readiness.history record --as-of 2025-06-01 --label "June refresh"
+    python -m readiness.history log
+    python -m readiness.history show --as-of 2025-03-15 --columns dc_pipeline ai_policy_signal
+    python -m readiness.history diff 2025-01-01 2025-06-01
+
+Every recorded snapshot is the raw merged dataset (main CSV + sources,
+before schema normalization, so later schema changes still apply to old
+snapshots). Rows are content-addressed: each distinct row is stored once,
+and a snapshot only writes the rows that are new since the previous one.
+Layout under ``data/history/`` (or ``READINESS_HISTORY_DIR``):
+
+    log.jsonl                  one line per snapshot: as-of date, label, and
+                               the delta (country -> row id upserts, deletes)
+    segments/<seq>.parquet     row contents first seen in snapshot <seq>
+    checkpoints/<seq>.parquet  every live row, every READINESS_HISTORY_CHECKPOINT
+                               snapshots (bounds the files one load reads)
+
+Storage and the log grow with changed rows, not with snapshots x rows.
+"As of" lookups replay at most a checkpoint interval of deltas in memory.
+Diffs only visit the countries the deltas between two snapshots touched.
+"""
+import argparse
+import bisect
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from datetime import date, datetime, timezone
+
+import numpy as np
+import pandas as pd
+
+from readiness.dataset import DATA_PATH, add_render_columns, normalize_frame
+from readiness.ingest import KEY, SOURCES_DIR, merge_sources, read_sources, source_paths
+
+HISTORY_DIR = os.environ.get("READINESS_HISTORY_DIR", os.path.join("data", "history"))
+CHECKPOINT_EVERY = int(os.environ.get("READINESS_HISTORY_CHECKPOINT", "32"))
+# Recent {country: row id} states kept for as-of lookups
+STATE_CACHE = int(os.environ.get("READINESS_HISTORY_STATE_CACHE", "16"))
+# Segment / checkpoint files kept in memory after a read
+FILE_CACHE = int(os.environ.get("READINESS_HISTORY_FILE_CACHE", "64"))
+
+# Dataset versions of historical snapshots (see readiness/runtime.py)
+VERSION_PREFIX = "history-"
+ROW_ID = "_row"
+
+
+def snapshot_version(seq):
+    return f"{VERSION_PREFIX}{seq}"
+
+
+def parse_version(version):
+    """Snapshot seq for a history version string, else None."""
+    if isinstance(version, str) and version.startswith(VERSION_PREFIX):
+        return int(version[len(VERSION_PREFIX):])
+    return None
+
+
+def row_ids(raw):
+    """Content hash per row (hex), stable across column order."""
+    columns = sorted(raw.columns)
+    salt = np.bitwise_xor.reduce(pd.util.hash_array(np.asarray(columns, dtype=object)))
+    hashes = pd.util.hash_pandas_object(raw[columns], index=False).to_numpy() ^ salt
+    return [f"{h:016x}" for h in hashes.tolist()]
+
+
+def read_raw(path=DATA_PATH, sources_dir=SOURCES_DIR):
+    """Raw merged rows (one per country) as strings, the form snapshots are stored in."""
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    frames = [frame for frame, _ in read_sources([path, *source_paths(sources_dir)])]
+    raw = merge_sources(frames)
+    # "string" keeps missing cells missing ("str" wrote them as "None" on pandas 2)
+    return raw.astype("string")
+
+
+class History:
+    """Snapshot log, row segments and materialized snapshots for one directory."""
+
+    def __init__(self, root=HISTORY_DIR, checkpoint_every=CHECKPOINT_EVERY):
+        self.root = root
+        self.checkpoint_every = checkpoint_every
+        self.log_path = os.path.join(root, "log.jsonl")
+        self.entries = []
+        self._dates = []
+        # row id -> file holding its contents
+        self._location = {}
+        # seq -> {country: row id} kept every checkpoint_every entries
+        self._checkpoints = {}
+        self._states = OrderedDict()
+        # Recently read segment / checkpoint frames (LRU, FILE_CACHE files)
+        self._files = OrderedDict()
+        # State after the last entry (updated in place by _replay)
+        self._head = {}
+        self._log_stat = None
+        self._lock = threading.RLock()
+        self.refresh()
+
+    # ---------------------------
+    # LOG
+    # ---------------------------
+    def refresh(self):
+        """Re-read the log if another process appended to it."""
+        try:
+            stat = os.stat(self.log_path)
+        except FileNotFoundError:
+            return self
+        key = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if key == self._log_stat:
+                return self
+            self.entries, self._dates, self._location, self._checkpoints = [], [], {}, {}
+            self._states.clear()
+            state = {}
+            with open(self.log_path, encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        state = self._replay(json.loads(line), state)
+            self._head = state
+            self._log_stat = key
+        return self
+
+    def _replay(self, entry, state):
+        """Index one log entry, updating ``state`` in place."""
+        for country in entry["deletes"]:
+            state.pop(country, None)
+        for country, row in entry["upserts"].items():
+            state[country] = row
+            self._location.setdefault(row, entry["segment"])
+        if entry.get("checkpoint"):
+            # Rows of a checkpointed snapshot are read from the checkpoint file
+            for row in state.values():
+                self._location[row] = entry["checkpoint"]
+        seq = entry["seq"]
+        if seq == 0 or (self.checkpoint_every and seq % self.checkpoint_every == 0):
+            self._checkpoints[seq] = dict(state)
+        self.entries.append(entry)
+        self._dates.append(entry["as_of"])
+        return state
+
+    def __len__(self):
+        return len(self.entries)
+
+    def resolve(self, ref):
+        """Snapshot seq for a seq, "latest", a history version or an ISO date (last snapshot on or before it)."""
+        if not self.entries:
+            raise LookupError("No snapshots recorded")
+        if ref is None or ref == "latest":
+            return len(self.entries) - 1
+        seq = parse_version(ref)
+        if seq is None and isinstance(ref, int):
+            seq = ref
+        if seq is None and isinstance(ref, str) and ref.lstrip("-").isdigit():
+            seq = int(ref)
+        if seq is not None:
+            if not 0 <= seq < len(self.entries):
+                raise LookupError(f"No snapshot {seq}")
+            return seq
+        try:
+            as_of = date.fromisoformat(str(ref)).isoformat()
+        except ValueError:
+            raise LookupError(f"Not a date or snapshot number: {ref!r}") from None
+        i = bisect.bisect_right(self._dates, as_of)
+        if i == 0:
+            raise LookupError(f"No snapshot on or before {as_of}")
+        return i - 1
+
+    # ---------------------------
+    # RECORDING
+    # ---------------------------
+    def record(self, raw, as_of=None, label=None):
+        """Append ``raw`` as a snapshot; returns its log entry.
+
+        Only rows whose content is new are written. An unchanged dataset
+        records nothing and returns the latest entry.
+        """
+        with self._lock:
+            self.refresh()
+            as_of = date.fromisoformat(as_of).isoformat() if as_of else date.today().isoformat()
+            if self._dates and as_of < self._dates[-1]:
+                raise ValueError(f"as_of {as_of} is before the latest snapshot ({self._dates[-1]})")
+            raw = raw.reset_index(drop=True)
+            ids = row_ids(raw)
+            keys = raw[KEY].tolist()
+            if len(set(keys)) != len(keys):
+                raise ValueError(f"Duplicate '{KEY}' values in snapshot")
+
+            previous = self._head
+            upserts = {k: r for k, r in zip(keys, ids) if previous.get(k) != r}
+            current = set(keys)
+            deletes = [k for k in previous if k not in current]
+            if self.entries and not upserts and not deletes:
+                return self.entries[-1]
+
+            seq = len(self.entries)
+            entry = {
+                "seq": seq,
+                "as_of": as_of,
+                "label": label,
+                "recorded": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "rows": len(raw),
+                "upserts": upserts,
+                "deletes": deletes,
+                "segment": None,
+                "checkpoint": None,
+            }
+            stored = pd.Series(ids)
+            fresh = {row for row in upserts.values() if row not in self._location}
+            if fresh:
+                new = np.fromiter((row in fresh for row in ids), dtype=bool, count=len(ids))
+                entry["segment"] = self._write(f"segments/{seq:06d}.parquet", raw[new], stored[new])
+            if self.checkpoint_every and seq and seq % self.checkpoint_every == 0:
+                entry["checkpoint"] = self._write(f"checkpoints/{seq:06d}.parquet", raw, stored)
+
+            os.makedirs(self.root, exist_ok=True)
+            with open(self.log_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+            # Index the new entry in place rather than re-reading the whole log
+            # (one writer at a time; readers pick it up through refresh)
+            self._head = self._replay(entry, self._head)
+            stat = os.stat(self.log_path)
+            self._log_stat = (stat.st_mtime_ns, stat.st_size)
+            return entry
+
+    def record_path(self, path=DATA_PATH, sources_dir=SOURCES_DIR, as_of=None, label=None):
+        return self.record(read_raw(path, sources_dir), as_of, label)
+
+    def _write(self, name, rows, ids):
+        target = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        frame = rows.assign(**{ROW_ID: ids.to_numpy()}).drop_duplicates(ROW_ID)
+        tmp = f"{target}.tmp"
+        frame.to_parquet(tmp, index=False)
+        os.replace(tmp, target)
+        return name
+
+    # ---------------------------
+    # AS-OF LOOKUPS
+    # ---------------------------
+    def state(self, seq):
+        """{country: row id} at snapshot ``seq`` (in dataset row order)."""
+        with self._lock:
+            self.refresh()
+            if seq in self._states:
+                self._states.move_to_end(seq)
+                return self._states[seq]
+            base = max(s for s in self._checkpoints if s <= seq)
+            state = self._checkpoints[base]
+            if base != seq:
+                state = dict(state)
+                for entry in self.entries[base + 1:seq + 1]:
+                    for country in entry["deletes"]:
+                        state.pop(country, None)
+                    state.update(entry["upserts"])
+            self._states[seq] = state
+            while len(self._states) > STATE_CACHE:
+                self._states.popitem(last=False)
+            return state
+
+    def _rows(self, ids):
+        """Raw rows for ``ids`` (in order), read from as few files as possible."""
+        with self._lock:
+            if not ids:
+                return pd.DataFrame({KEY: pd.Series(dtype="str")})
+            wanted = pd.Series(ids)
+            files = wanted.map(self._location)
+            parts = []
+            for name in files.unique():
+                frame = self._files.get(name)
+                if frame is None:
+                    frame = pd.read_parquet(os.path.join(self.root, name)).set_index(ROW_ID)
+                    self._files[name] = frame
+                    while len(self._files) > FILE_CACHE:
+                        self._files.popitem(last=False)
+                else:
+                    self._files.move_to_end(name)
+                parts.append(frame.loc[wanted[files == name].to_numpy()])
+            rows = pd.concat(parts) if len(parts) != 1 else parts[0]
+            return rows.loc[wanted.to_numpy()].reset_index(drop=True)
+
+    def raw_frame(self, ref):
+        state = self.state(self.resolve(ref))
+        return self._rows(list(state.values()))
+
+    def frame(self, ref):
+        """Typed frame (as the app loads it) for a snapshot."""
+        seq = self.resolve(ref)
+        return add_render_columns(normalize_frame(self.raw_frame(seq), source=f"snapshot {seq}"))
+
+    # ---------------------------
+    # DIFFS
+    # ---------------------------
+    def diff(self, old_ref, new_ref):
+        """Added / removed countries and per-column changes between two snapshots.
+
+        Only countries touched by the deltas in between are compared.
+        """
+        old_seq, new_seq = self.resolve(old_ref), self.resolve(new_ref)
+        low, high = sorted((old_seq, new_seq))
+        touched = OrderedDict()
+        for entry in self.entries[low + 1:high + 1]:
+            touched.update(dict.fromkeys(entry["deletes"]))
+            touched.update(dict.fromkeys(entry["upserts"]))
+        old, new = self.state(old_seq), self.state(new_seq)
+        added = [c for c in touched if c in new and c not in old]
+        removed = [c for c in touched if c in old and c not in new]
+        changed = [c for c in touched if c in old and c in new and old[c] != new[c]]
+
+        columns = {}
+        if changed:
+            before = self._rows([old[c] for c in changed])
+            after = self._rows([new[c] for c in changed])
+            for col in sorted(set(before.columns) | set(after.columns)):
+                a = before[col] if col in before else pd.Series([None] * len(changed), dtype="str")
+                b = after[col] if col in after else pd.Series([None] * len(changed), dtype="str")
+                differs = ~((a == b).fillna(False) | (a.isna() & b.isna()))
+                for i in differs.to_numpy().nonzero()[0]:
+                    columns.setdefault(changed[i], {})[col] = [_value(a.iat[i]), _value(b.iat[i])]
+        return {
+            "from": self.entries[old_seq]["as_of"], "to": self.entries[new_seq]["as_of"],
+            "added": added, "removed": removed,
+            "changed": [{KEY: c, "columns": columns.get(c, {})} for c in changed],
+        }
+
+    def log(self):
+        """Entries without their deltas (seq, as_of, label, rows, change counts)."""
+        self.refresh()
+        return [
+            {
+                "seq": e["seq"], "as_of": e["as_of"], "label": e["label"], "rows": e["rows"],
+                "upserts": len(e["upserts"]), "deletes": len(e["deletes"]),
+            }
+            for e in self.entries
+        ]
+
+
+def _value(value):
+    return None if pd.isna(value) else value
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m readiness.history", description=__doc__.splitlines()[0])
+    parser.add_argument("--dir", default=HISTORY_DIR, help="history directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record = commands.add_parser("record", help="append the current dataset as a snapshot")
+    record.add_argument("--data", default=DATA_PATH)
+    record.add_argument("--sources", default=SOURCES_DIR)
+    record.add_argument("--as-of", help="snapshot date (YYYY-MM-DD, default today)")
+    record.add_argument("--label")
+
+    commands.add_parser("log", help="list snapshots")
+
+    show = commands.add_parser("show", help="print a snapshot")
+    show.add_argument("--as-of", default="latest", help="date, snapshot number or 'latest'")
+    show.add_argument("--columns", nargs="+", default=[])
+
+    diff = commands.add_parser("diff", help="changes between two snapshots")
+    diff.add_argument("old")
+    diff.add_argument("new", nargs="?", default="latest")
+    args = parser.parse_args(argv)
+
+    history = History(args.dir)
+    try:
+        if args.command == "record":
+            before = len(history)
+            entry = history.record_path(args.data, args.sources, args.as_of, args.label)
+            if len(history) == before:
+                print(f"unchanged since snapshot {entry['seq']} ({entry['as_of']})")
+            else:
+                print(f"snapshot {entry['seq']} ({entry['as_of']}): "
+                      f"{len(entry['upserts'])} upserts, {len(entry['deletes'])} deletes")
+        elif args.command == "log":
+            for e in history.log():
+                print(f"{e['seq']:>4}  {e['as_of']}  {e['rows']:>7} rows  "
+                      f"+{e['upserts']} -{e['deletes']}  {e['label'] or ''}")
+        elif args.command == "show":
+            frame = history.raw_frame(args.as_of)
+            print(frame[[KEY, *args.columns]].to_string(index=False))
+        else:
+            json.dump(history.diff(args.old, args.new), sys.stdout, indent=2)
+            sys.stdout.write("\n")
+    except (LookupError, ValueError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    except FileNotFoundError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+"""Inference hubs: offshore anchors plus in-dataset GPU markets."""
+import numpy as np
+import pandas as pd
+
+from readiness.encoding import category_flags
+
+# Offshore anchor for Hybrid-Edge routes
+EU_HUB = {"lat": 43.0, "lon": 3.0}
+
+OFFSHORE_HUBS = {"EU": EU_HUB}
+
+
+def gpu_mask(df):
+    """Rows whose ai_compute_availability mentions GPU."""
+    return category_flags(df["ai_compute_availability"], lambda c: "gpu" in str(c).lower())
+
+
+def hub_frame(df, offshore=True, mask=None):
+    """Hub table (name, kind, lat, lon): GPU markets first, then offshore hubs.
+
+    ``mask`` overrides which rows count as GPU markets (default: gpu_mask).
+    """
+    mask = gpu_mask(df) if mask is None else mask
+    gpu = df.loc[mask, ["country", "latitude", "longitude"]]
+    frames = [pd.DataFrame({
+        "name": gpu["country"].to_numpy(dtype=object),
+        "kind": "gpu-market",
+        "lat": gpu["latitude"].to_numpy(dtype=np.float64),
+        "lon": gpu["longitude"].to_numpy(dtype=np.float64),
+    })]
+    if offshore:
+        frames.append(pd.DataFrame({
+            "name": list(OFFSHORE_HUBS),
+            "kind": "offshore",
+            "lat": [h["lat"] for h in OFFSHORE_HUBS.values()],
+            "lon": [h["lon"] for h in OFFSHORE_HUBS.values()],
+        }))
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,246 @@
+"""Concurrent multi-source ingestion into the canonical site frame.
+
+Besides the main CSV, any ``*.csv`` under ``data/sources/`` (or
+``READINESS_SOURCES_DIR``) is merged in by ``country``: data-center
+inventories, outage stats, latency probes, policy trackers, ... Sources
+only need a ``country`` column plus whatever columns they contribute;
+they are applied in file-name order and a later source's non-empty
+values win. New countries are added when they come with coordinates.
+
+    df, report = ingest(DATA_PATH, source_paths())
+    python -m readiness.ingest            # print the validation report
+
+Files are read on a thread pool (the C parser releases the GIL), so wall
+time follows the largest source rather than the sum. Each file is
+streamed in ``READINESS_INGEST_CHUNK_ROWS`` chunks and folded into one
+row per country as it goes, so peak memory is one chunk plus the
+distinct countries seen so far; as with a single CSV, the last row per
+country wins, and the dropped rows are counted in the report. Coordinate
+checks, fallbacks, encodings and RTT parsing run once on the merged frame
+(see readiness/schema.py).
+"""
+import glob
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from readiness.dataset import (
+    CACHE_DIR,
+    DATA_PATH,
+    SCHEMA_VERSION,
+    _read_sidecar,
+    _write_sidecar,
+    add_render_columns,
+    dataset_version,
+    load_dataset,
+    parse_csv,
+    validate_frame,
+)
+from readiness.schema import SCHEMA, summarize
+
+SOURCES_DIR = os.environ.get("READINESS_SOURCES_DIR", os.path.join("data", "sources"))
+CHUNK_ROWS = int(os.environ.get("READINESS_INGEST_CHUNK_ROWS", "50000"))
+MAX_WORKERS = int(os.environ.get("READINESS_INGEST_WORKERS", str(min(8, os.cpu_count() or 1))))
+
+KEY = "country"
+
+
+# ---------------------------
+# DISCOVERY / VERSIONING
+# ---------------------------
+def source_paths(sources_dir=SOURCES_DIR):
+    """Extra source CSVs in merge order (sorted by file name)."""
+    if not sources_dir or not os.path.isdir(sources_dir):
+        return []
+    return sorted(glob.glob(os.path.join(sources_dir, "*.csv")))
+
+
+def merged_version(path=DATA_PATH, sources_dir=SOURCES_DIR):
+    """Like ``dataset_version`` but also changes when any source is added, edited or removed."""
+    base = dataset_version(path)
+    sources = source_paths(sources_dir)
+    if base is None or not sources:
+        return base
+    digest = hashlib.sha1()
+    for source in sources:
+        try:
+            stat = os.stat(source)
+        except FileNotFoundError:
+            continue
+        digest.update(f"{os.path.basename(source)}:{stat.st_mtime_ns}-{stat.st_size};".encode())
+    return f"{base}+{digest.hexdigest()[:12]}"
+
+
+# ---------------------------
+# CHUNKED, VALIDATED READS
+# ---------------------------
+def validate_chunk(chunk, report):
+    """Cleaned copy of one chunk; problems are tallied into ``report``."""
+    chunk.columns = chunk.columns.str.strip()
+    if KEY not in chunk.columns:
+        raise ValueError(f"{report['path']}: missing '{KEY}' column")
+
+    key = chunk[KEY].astype("str").str.strip()
+    missing_key = chunk[KEY].isna().to_numpy() | (key == "").to_numpy()
+    report["missing_key"] += int(missing_key.sum())
+    chunk = chunk.loc[~missing_key].copy()
+    chunk[KEY] = key[~missing_key]
+    # Coordinates stay raw: the schema parses and rejects them on the merged frame
+    return chunk
+
+
+def read_source(path, chunk_rows=CHUNK_ROWS):
+    """(one row per country, report) for a CSV streamed in chunks; last row per country wins."""
+    report = {
+        "path": path, "rows": 0, "chunks": 0, "countries": 0,
+        "missing_key": 0, "duplicate_keys": 0, "extra_columns": [],
+    }
+    folded = None
+    kept = 0
+    for chunk in pd.read_csv(path, chunksize=chunk_rows):
+        report["rows"] += len(chunk)
+        report["chunks"] += 1
+        chunk = validate_chunk(chunk, report)
+        kept += len(chunk)
+        folded = chunk if folded is None else pd.concat([folded, chunk], ignore_index=True)
+        # Fold as we go so memory tracks distinct countries, not file size
+        folded = folded.drop_duplicates(KEY, keep="last")
+
+    if folded is None:
+        folded = pd.DataFrame({KEY: pd.Series(dtype="str")})
+    folded = folded.reset_index(drop=True)
+    report["countries"] = len(folded)
+    report["duplicate_keys"] = kept - len(folded)
+    report["extra_columns"] = [c for c in folded.columns if c not in SCHEMA]
+    return folded, report
+
+
+def read_sources(paths, chunk_rows=CHUNK_ROWS, max_workers=MAX_WORKERS):
+    """read_source for every path on a thread pool; results keep the order of ``paths``."""
+    if len(paths) <= 1 or max_workers <= 1:
+        return [read_source(p, chunk_rows) for p in paths]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(paths)), thread_name_prefix="ingest") as pool:
+        return list(pool.map(lambda p: read_source(p, chunk_rows), paths))
+
+
+# ---------------------------
+# MERGE
+# ---------------------------
+def merge_sources(frames):
+    """Union by country: later frames' non-empty values override earlier ones.
+
+    Row order is the first frame's, followed by new countries in the order
+    they first appear. Each frame is already one row per country, so every
+    later frame is a positional overlay: one indexer lookup, then one masked
+    assignment per column.
+    """
+    merged = frames[0]
+    if len(frames) == 1:
+        return merged
+    keys = pd.Index(merged[KEY])
+    columns = {col: merged[col].to_numpy(dtype=object, copy=True) for col in merged.columns}
+    for frame in frames[1:]:
+        rows = keys.get_indexer(frame[KEY])
+        new = rows < 0
+        if new.any():
+            # Append new countries, then point their rows at the new slots
+            start = len(keys)
+            keys = keys.append(pd.Index(frame[KEY].to_numpy()[new]))
+            rows[new] = np.arange(start, len(keys))
+            for col, values in columns.items():
+                columns[col] = np.concatenate([values, np.full(new.sum(), None, dtype=object)])
+        for col in frame.columns:
+            if col not in columns:
+                columns[col] = np.full(len(keys), None, dtype=object)
+            present = frame[col].notna().to_numpy()
+            columns[col][rows[present]] = frame[col].to_numpy(dtype=object)[present]
+    # infer_objects restores numeric / string dtypes after the object overlay
+    return pd.DataFrame(columns).infer_objects()
+
+
+def ingest(path=DATA_PATH, sources=(), chunk_rows=CHUNK_ROWS, max_workers=MAX_WORKERS):
+    """(typed frame, report) for the main CSV merged with ``sources``.
+
+    Raises FileNotFoundError if the main CSV is missing.
+    """
+    if not os.path.exists(path):
+        raise FileNotFoundError(path)
+    results = read_sources([path, *sources], chunk_rows, max_workers)
+    frames = [frame for frame, _ in results]
+    merged = merge_sources(frames)
+
+    # Schema defaults also fill the gaps partial sources leave in merged columns
+    df, issues = validate_frame(merged)
+    report = {
+        "sources": [r for _, r in results],
+        "merged_rows": len(merged),
+        "rows": len(df),
+        # Rows are positions in the merged frame (e.g. new countries without coordinates)
+        "issues": summarize(issues).to_dict(orient="records"),
+        "rejected": int(issues.loc[issues["rejected"].astype(bool), "row"].nunique()),
+    }
+    return df, report
+
+
+# ---------------------------
+# LOADING (with sidecar cache)
+# ---------------------------
+def parse_merged(path=DATA_PATH, sources_dir=SOURCES_DIR):
+    """Untyped-to-typed frame like ``parse_csv``, merging sources when there are any."""
+    sources = source_paths(sources_dir)
+    if not sources:
+        return parse_csv(path)
+    return ingest(path, sources)[0]
+
+
+def load_merged(path=DATA_PATH, sources_dir=SOURCES_DIR, cache_dir=CACHE_DIR, use_cache=True):
+    """``load_dataset`` plus sources; the merged sidecar is keyed by ``merged_version``."""
+    sources = source_paths(sources_dir)
+    if not sources:
+        return load_dataset(path, cache_dir, use_cache)
+
+    version = merged_version(path, sources_dir)
+    if version is None:
+        raise FileNotFoundError(path)
+    stem = os.path.splitext(os.path.basename(path))[0]
+    sidecar = os.path.join(cache_dir, f"{stem}.merged.parquet")
+
+    df = None
+    if use_cache:
+        try:
+            table, meta = _read_sidecar(sidecar)
+            if meta.get("readiness.schema") == SCHEMA_VERSION and meta.get("readiness.sources") == version:
+                df = table.to_pandas()
+        except (ImportError, OSError, ValueError):
+            df = None
+
+    if df is None:
+        df = ingest(path, sources)[0]
+        if use_cache:
+            try:
+                _write_sidecar(df, sidecar, {"readiness.schema": SCHEMA_VERSION, "readiness.sources": version})
+            except (ImportError, OSError):
+                pass
+    return add_render_columns(df)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m readiness.ingest", description="Validate and merge dataset sources.")
+    parser.add_argument("--data", default=DATA_PATH)
+    parser.add_argument("--sources", default=SOURCES_DIR, help="directory of extra source CSVs")
+    args = parser.parse_args(argv)
+    _, report = ingest(args.data, source_paths(args.sources))
+    json.dump(report, sys.stdout, indent=2, default=lambda v: v.item() if isinstance(v, np.generic) else str(v))
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
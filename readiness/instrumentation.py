@@ -0,0 +1,139 @@
+"""Opt-in per-rerun section timings kept in a ring buffer.
+
+    profiler = Profiler()
+    profiler.begin_run()
+    with profiler.section("summary_metrics"):
+        ...
+    profiler.to_json(); profiler.to_prometheus()
+
+Allocation tracking (off by default) uses tracemalloc, which slows the
+whole process down while it is on and attributes allocations from
+concurrent sessions to whichever section is running; use it to find
+regressions, not for absolute numbers. Tracing only runs while a profiled
+section does.
+"""
+import json
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+DEFAULT_CAPACITY = int(os.environ.get("READINESS_PROFILE_CAPACITY", "500"))
+
+
+class Profiler:
+    """Thread-safe ring buffer of section timings plus cumulative totals."""
+
+    def __init__(self, capacity=DEFAULT_CAPACITY, track_allocations=False):
+        self.records = deque(maxlen=capacity)
+        self.track_allocations = track_allocations
+        # Sections currently tracing, and whether we (not the host) started tracemalloc
+        self._tracing = 0
+        self._started_tracing = False
+        # section -> [count, total seconds, max alloc bytes] (never truncated)
+        self.totals = {}
+        self.run_id = 0
+        self._lock = threading.Lock()
+
+    def begin_run(self):
+        with self._lock:
+            self.run_id += 1
+            return self.run_id
+
+    @contextmanager
+    def section(self, name):
+        run_id = self.run_id
+        tracing = self.track_allocations
+        if tracing:
+            self._start_tracing()
+            tracemalloc.reset_peak()
+            start_mem = tracemalloc.get_traced_memory()[0]
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - start
+            alloc = None
+            if tracing:
+                alloc = tracemalloc.get_traced_memory()[1] - start_mem
+                self._stop_tracing()
+            self.record(name, wall, alloc, run_id)
+
+    def _start_tracing(self):
+        with self._lock:
+            if not self._tracing and not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._started_tracing = True
+            self._tracing += 1
+
+    def _stop_tracing(self):
+        # Tracing slows every thread down, so it stops with the last open section
+        with self._lock:
+            self._tracing -= 1
+            if not self._tracing and self._started_tracing:
+                tracemalloc.stop()
+                self._started_tracing = False
+
+    def timed(self, name=None):
+        """Decorator form of ``section``."""
+        def decorate(fn):
+            label = name or fn.__name__
+
+            def wrapper(*args, **kwargs):
+                with self.section(label):
+                    return fn(*args, **kwargs)
+            wrapper.__name__ = fn.__name__
+            wrapper.__doc__ = fn.__doc__
+            return wrapper
+        return decorate
+
+    def record(self, name, wall, alloc=None, run_id=None):
+        with self._lock:
+            self.records.append({
+                "run": self.run_id if run_id is None else run_id,
+                "section": name,
+                "wall_ms": round(wall * 1000, 3),
+                "alloc_kb": None if alloc is None else round(alloc / 1024, 1),
+                "ts": time.time(),
+            })
+            count, total, max_alloc = self.totals.get(name, (0, 0.0, 0))
+            self.totals[name] = (count + 1, total + wall, max(max_alloc, alloc or 0))
+
+    # ---------------------------
+    # EXPORT
+    # ---------------------------
+    def snapshot(self):
+        with self._lock:
+            return list(self.records)
+
+    def to_json(self):
+        return json.dumps({"records": self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        """Prometheus text exposition of the cumulative per-section totals."""
+        with self._lock:
+            totals = dict(self.totals)
+        lines = [
+            "# HELP readiness_section_seconds Wall time spent in app sections.",
+            "# TYPE readiness_section_seconds summary",
+        ]
+        for name, (count, total, _) in sorted(totals.items()):
+            lines.append(f'readiness_section_seconds_sum{{section="{name}"}} {total:.6f}')
+            lines.append(f'readiness_section_seconds_count{{section="{name}"}} {count}')
+        if self.track_allocations:
+            lines += [
+                "# HELP readiness_section_alloc_peak_bytes Largest traced allocation peak per section.",
+                "# TYPE readiness_section_alloc_peak_bytes gauge",
+            ]
+            for name, (_, _, max_alloc) in sorted(totals.items()):
+                lines.append(f'readiness_section_alloc_peak_bytes{{section="{name}"}} {max_alloc}')
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomic write for node_exporter's textfile collector."""
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as fh:
+            fh.write(self.to_prometheus())
+        os.replace(tmp, path)
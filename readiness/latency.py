@@ -0,0 +1,143 @@
+"""Latency bands and great-circle RTT estimates.
+
+Estimated RTT = 2 * great-circle km * FIBER_PATH_FACTOR / FIBER_KM_PER_MS
++ BASE_OVERHEAD_MS. The defaults are directional: they track the
+hand-entered est_rtt_to_europe_ms values for long-haul routes, but cannot
+see subsea cable topology (e.g. Egypt's Mediterranean shortcut).
+"""
+import numpy as np
+
+EARTH_RADIUS_KM = 6371.0
+# Light in fiber covers ~200 km per ms one way
+FIBER_KM_PER_MS = 200.0
+# Real cable routes are longer than the great circle (landing stations, detours)
+FIBER_PATH_FACTOR = 2.0
+# Switching / last-mile overhead added to every estimate
+BASE_OVERHEAD_MS = 5.0
+
+# Latency bands (upper bound in ms, label), lowest first
+LATENCY_BANDS = [
+    (50, "Real-time (<50 ms)"),
+    (100, "Interactive (50-100 ms)"),
+    (150, "Tolerable (100-150 ms)"),
+    (np.inf, "Batch only (150+ ms)"),
+]
+
+
+def latency_band(rtt_ms):
+    """Band label per RTT value (NaN -> None)."""
+    rtt = np.asarray(rtt_ms, dtype=np.float64)
+    edges = np.asarray([upper for upper, _ in LATENCY_BANDS[:-1]])
+    labels = np.asarray([label for _, label in LATENCY_BANDS] + [None], dtype=object)
+    codes = np.where(np.isnan(rtt), len(LATENCY_BANDS), np.searchsorted(edges, rtt, side="right"))
+    return labels[codes]
+
+
+# ---------------------------
+# GREAT-CIRCLE ESTIMATES
+# ---------------------------
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Great-circle distance; inputs broadcast (pass column/row vectors for a matrix)."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=np.float64)) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def estimate_rtt_ms(distance_km, path_factor=FIBER_PATH_FACTOR, overhead_ms=BASE_OVERHEAD_MS):
+    return 2 * np.asarray(distance_km) * path_factor / FIBER_KM_PER_MS + overhead_ms
+
+
+def rtt_matrix(lat1, lon1, lat2, lon2, path_factor=FIBER_PATH_FACTOR):
+    """(N, M) float32 estimated RTT between two point sets."""
+    lat1 = np.asarray(lat1, dtype=np.float64)[:, None]
+    lon1 = np.asarray(lon1, dtype=np.float64)[:, None]
+    lat2 = np.asarray(lat2, dtype=np.float64)[None, :]
+    lon2 = np.asarray(lon2, dtype=np.float64)[None, :]
+    return estimate_rtt_ms(haversine_km(lat1, lon1, lat2, lon2), path_factor).astype(np.float32)
+
+
+class LatencyModel:
+    """Nearest-hub RTTs per site from one batched spatial query.
+
+    ``nearest_hub_ms`` counts a site that is itself a hub (a GPU market) at
+    0 ms; ``nearest_other_hub`` is the closest hub other than the site. The
+    dense site->hub and site->site matrices are only built on first use.
+    """
+
+    def __init__(self, df, hubs, path_factor=FIBER_PATH_FACTOR):
+        from readiness.routing import HubIndex
+
+        self.sites = df["country"].to_numpy(dtype=object)
+        self.hubs = hubs["name"].to_numpy(dtype=object)
+        self.path_factor = path_factor
+        self._lat = df["latitude"].to_numpy(dtype=np.float64)
+        self._lon = df["longitude"].to_numpy(dtype=np.float64)
+        self._hub_lat = hubs["lat"].to_numpy(dtype=np.float64)
+        self._hub_lon = hubs["lon"].to_numpy(dtype=np.float64)
+        self.site_pos = {name: i for i, name in reversed(list(enumerate(self.sites)))}
+        self.hub_pos = {name: j for j, name in enumerate(self.hubs)}
+
+        n = len(self.sites)
+        self.nearest_hub_ms = np.full(n, np.inf, dtype=np.float32)
+        self.nearest_other_idx = np.full(n, -1, dtype=np.intp)
+        self.nearest_other_ms = np.full(n, np.inf, dtype=np.float32)
+        if len(self.hubs):
+            # Two nearest hubs: a site's own hub, if any, is one of them
+            dist, idx = HubIndex(hubs).query(self._lat, self._lon, k=2)
+            rtt = estimate_rtt_ms(dist, path_factor).astype(np.float32)
+            is_self = self.hubs[idx] == self.sites[:, None]
+            self.nearest_hub_ms = np.where(is_self.any(axis=1), np.float32(0), rtt[:, 0])
+            col = is_self[:, 0].astype(np.intp)
+            rows = np.flatnonzero(col < idx.shape[1])
+            self.nearest_other_idx[rows] = idx[rows, col[rows]]
+            self.nearest_other_ms[rows] = rtt[rows, col[rows]]
+        self._site_to_hub = None
+        self._site_to_site = None
+
+    @property
+    def site_to_hub(self):
+        """(N, M) float32 RTT matrix (raw estimates, own hub included)."""
+        if self._site_to_hub is None:
+            self._site_to_hub = rtt_matrix(self._lat, self._lon, self._hub_lat, self._hub_lon, self.path_factor)
+        return self._site_to_hub
+
+    @property
+    def site_to_site(self):
+        if self._site_to_site is None:
+            self._site_to_site = rtt_matrix(self._lat, self._lon, self._lat, self._lon, self.path_factor)
+        return self._site_to_site
+
+    def hub_rtt(self, site, hub):
+        if site == hub:
+            return 0.0
+        i, j = self.site_pos[site], self.hub_pos[hub]
+        km = haversine_km(self._lat[i], self._lon[i], self._hub_lat[j], self._hub_lon[j])
+        return float(estimate_rtt_ms(km, self.path_factor))
+
+    def site_rtt(self, site_a, site_b):
+        return float(self.site_to_site[self.site_pos[site_a], self.site_pos[site_b]])
+
+    def nearest_hub(self, site):
+        """(hub name, estimated RTT ms, latency band) of the closest other hub to ``site``."""
+        i = self.site_pos[site]
+        j = self.nearest_other_idx[i]
+        if j < 0:
+            return None, float("nan"), None
+        ms = float(self.nearest_other_ms[i])
+        return self.hubs[j], ms, latency_band(ms)
+
+    def within(self, max_ms, hubs=None):
+        """Boolean mask of sites with some hub (optionally a subset) under ``max_ms``.
+
+        A site that is one of the hubs counts as 0 ms away.
+        """
+        if hubs is None:
+            return self.nearest_hub_ms < max_ms
+        cols = np.asarray([self.hub_pos[h] for h in hubs], dtype=np.intp)
+        own = np.isin(self.sites, self.hubs[cols])
+        if self._site_to_hub is not None:
+            return own | (self._site_to_hub[:, cols] < max_ms).any(axis=1)
+        # Only the requested columns, not the full matrix
+        rtt = rtt_matrix(self._lat, self._lon, self._hub_lat[cols], self._hub_lon[cols], self.path_factor)
+        return own | (rtt < max_ms).any(axis=1)
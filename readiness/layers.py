@@ -0,0 +1,178 @@
+"""pydeck layer and deck construction shared by the app and the benchmarks."""
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+import pydeck as pdk
+
+from readiness.dataset import founder_rgba, policy_rgba
+
+MAPBOX_LIGHT_STYLE = "mapbox://styles/mapbox/light-v11"
+
+# Streamlit serves <app dir>/static at app/static when
+# server.enableStaticServing is on (see .streamlit/config.toml)
+STATIC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static")
+STATIC_URL = "app/static"
+
+# ~1 m; plenty for a continental map and keeps the text payload short
+COORD_DECIMALS = 5
+
+LAYER_FILES = ("scatter", "paths")
+
+
+# ---------------------------
+# COMPACT LAYER FRAMES
+# ---------------------------
+# Each layer gets only the columns it (or the tooltip) reads, under short
+# names, with colors split into flat uint8 channels instead of nested
+# per-row lists. Accessors below are expressions over these columns.
+def scatter_frame(df):
+    founder = founder_rgba(df)
+    policy = policy_rgba(df)
+    frame = pd.DataFrame({
+        "country": df["country"].to_numpy(),
+        "status": df["ai_inference_readiness"].to_numpy(),
+        "signal": df["ai_policy_signal"].to_numpy(),
+        "x": df["longitude"].to_numpy().round(COORD_DECIMALS),
+        "y": df["latitude"].to_numpy().round(COORD_DECIMALS),
+        "r": df["radius"].to_numpy().round().astype(np.int32),
+    })
+    for prefix, rgba in (("f", founder), ("p", policy)):
+        for i, channel in enumerate("rgba"):
+            frame[prefix + channel] = rgba[:, i]
+    return frame
+
+
+def path_frame(paths):
+    """Two-point routes as source/target columns."""
+    coords = np.asarray(paths["path"].tolist(), dtype=np.float64).reshape(-1, 2, 2).round(COORD_DECIMALS)
+    return pd.DataFrame({
+        "sx": coords[:, 0, 0], "sy": coords[:, 0, 1],
+        "tx": coords[:, 1, 0], "ty": coords[:, 1, 1],
+    })
+
+
+def layer_data(data, project):
+    # URLs (see publish_layer_data) are already projected
+    return data if isinstance(data, str) else project(data)
+
+
+def path_layer(paths):
+    # 1. Path Layer (Same for both modes, context useful in both)
+    return pdk.Layer(
+        "PathLayer", id="routes", data=layer_data(paths, path_frame),
+        get_path="[[sx, sy], [tx, ty]]", get_width=4,
+        get_color=[60, 120, 216], opacity=0.5, pickable=False
+    )
+
+
+def scatter_layer(df, is_policy_mode=False):
+    # 2. Base Scatter Layer - COLOR SWAPS HERE
+    active_color = "[pr, pg, pb, pa]" if is_policy_mode else "[fr, fg, fb, fa]"
+    return pdk.Layer(
+        "ScatterplotLayer",
+        id="base-scatter",
+        data=layer_data(df, scatter_frame),
+        get_position="[x, y]",
+        get_fill_color=active_color, # Dynamic Color Channels
+        get_radius="r",
+        get_line_color=[255, 255, 255],
+        get_line_width=2,
+        pickable=True,
+        stroked=True,
+        auto_highlight=True,
+        radius_min_pixels=10,
+        radius_max_pixels=45,
+    )
+
+
+def halo_layer(highlight_df):
+    # 3. Highlight Layer
+    return pdk.Layer(
+        "ScatterplotLayer",
+        id="highlight-halo",
+        data=scatter_frame(highlight_df)[["x", "y", "r"]],
+        get_position="[x, y]",
+        get_radius="r",
+        get_fill_color=[0, 0, 0, 0],
+        get_line_color=[0, 200, 255],
+        get_line_width=8000,
+        stroked=True, filled=False,
+        radius_scale=1.2, radius_min_pixels=15, pickable=False
+    )
+
+
+def view_state_for(row):
+    return pdk.ViewState(
+        latitude=float(row["latitude"]),
+        longitude=float(row["longitude"]),
+        zoom=5.2, pitch=45.0, bearing=0
+    )
+
+
+def tooltip(is_policy_mode=False):
+    if is_policy_mode:
+        return {"html": "<b>{country}</b><br/>Policy Signal: {signal}"}
+    return {"html": "<b>{country}</b><br/>Status: {status}"}
+
+
+def build_deck(df, paths, highlight_df, view_state, is_policy_mode=False, mapbox_token=None):
+    """``df`` and ``paths`` may be frames or URLs from ``publish_layer_data``."""
+    return pdk.Deck(
+        map_style=MAPBOX_LIGHT_STYLE if mapbox_token else None,
+        api_keys={"mapbox": mapbox_token} if mapbox_token else None,
+        layers=[path_layer(paths), scatter_layer(df, is_policy_mode), halo_layer(highlight_df)],
+        initial_view_state=view_state,
+        tooltip=tooltip(is_policy_mode),
+    )
+
+
+# ---------------------------
+# STATIC LAYER DATA
+# ---------------------------
+def layer_paths(version, static_dir=STATIC_DIR):
+    """name -> file of a version's base layers."""
+    version_dir = os.path.join(static_dir, "layers", version)
+    return {name: os.path.join(version_dir, f"{name}.csv") for name in LAYER_FILES}
+
+
+def publish_layer_data(df, paths, version, static_dir=STATIC_DIR):
+    """Write the projected base layers for ``version`` once; returns their URLs.
+
+    deck.gl fetches a layer's URL data once and keeps it for as long as the
+    URL stays the same, so the browser downloads the scatter and path rows
+    once per dataset version instead of with every rerun. CSV keeps the
+    payload to a header plus plain numbers per row. Files are only removed
+    by ``remove_layer_data`` / ``prune_layer_data`` (when the dataset store
+    drops the version), never while a session may still reference them.
+    """
+    frames = {"scatter": lambda: scatter_frame(df), "paths": lambda: path_frame(paths)}
+    urls = {}
+    for name, target in layer_paths(version, static_dir).items():
+        if not os.path.exists(target):
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            tmp = f"{target}.tmp"
+            frames[name]().to_csv(tmp, index=False)
+            os.replace(tmp, target)
+        urls[name] = f"{STATIC_URL}/layers/{version}/{name}.csv"
+    return urls
+
+
+def layer_data_exists(version, static_dir=STATIC_DIR):
+    return all(os.path.exists(p) for p in layer_paths(version, static_dir).values())
+
+
+def remove_layer_data(version, static_dir=STATIC_DIR):
+    shutil.rmtree(os.path.join(static_dir, "layers", version), ignore_errors=True)
+
+
+def prune_layer_data(keep, static_dir=STATIC_DIR):
+    """Drop every version directory not in ``keep`` (e.g. left over from a previous process)."""
+    root = os.path.join(static_dir, "layers")
+    if not os.path.isdir(root):
+        return
+    keep = set(keep)
+    for name in os.listdir(root):
+        if name not in keep:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
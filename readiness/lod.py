@@ -0,0 +1,208 @@
+"""Level-of-detail bins for dense site maps.
+
+Sites are binned into a quadtree of Web Mercator tiles (level L has
+2**L x 2**L cells); tile indices are computed once at the finest level and
+coarser levels are bit shifts of them. Each occupied cell becomes one
+"site-like" row (centroid, dominant readiness / policy labels with the
+dataset's categories, per-level counts) so the existing scatter layer,
+tooltip and readiness colors render bins unchanged.
+
+    grid = SiteGrid(df, paths)                 # once per dataset version
+    level, bins = grid.query(zoom, bounds)     # cells for this zoom/viewport
+    routes = grid.route_bins(level, bounds)
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+MAX_LEVEL = 16
+TILE_PX = 256
+# Target on-screen cell size: level = zoom + log2(TILE_PX / CELL_PX)
+CELL_PX = 64
+MAX_MERCATOR_LAT = 85.05112878
+EARTH_CIRCUMFERENCE_M = 40_075_016.7
+
+DEFAULT_MIN_SITES = int(os.environ.get("READINESS_LOD_MIN_SITES", "5000"))
+DEFAULT_MAX_BINS = int(os.environ.get("READINESS_LOD_MAX_BINS", "4000"))
+
+
+# ---------------------------
+# TILE MATH
+# ---------------------------
+def tile_xy(lat, lon, level):
+    """Web Mercator tile indices at ``level`` (vectorized)."""
+    n = 2 ** level
+    lat = np.clip(np.asarray(lat, dtype=np.float64), -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)
+    lon = np.asarray(lon, dtype=np.float64)
+    sin_lat = np.sin(np.radians(lat))
+    x = np.floor((lon + 180.0) / 360.0 * n)
+    y = np.floor((0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)) * n)
+    return np.clip(x, 0, n - 1).astype(np.int64), np.clip(y, 0, n - 1).astype(np.int64)
+
+
+def level_for(zoom, max_level=MAX_LEVEL):
+    offset = int(np.log2(TILE_PX // CELL_PX))
+    return int(np.clip(np.floor(zoom) + offset, 0, max_level))
+
+
+def viewport_bounds(lat, lon, zoom, width=1200, height=700, margin=1.0):
+    """(west, south, east, north) seen at ``zoom``, padded by ``margin`` viewports per side."""
+    world_px = TILE_PX * 2 ** zoom
+    half_w = width * (0.5 + margin) * 360.0 / world_px
+    # Mercator y in [0, 1] so the latitude span widens towards the poles
+    sin_lat = np.sin(np.radians(np.clip(lat, -MAX_MERCATOR_LAT, MAX_MERCATOR_LAT)))
+    center_y = 0.5 - np.log((1 + sin_lat) / (1 - sin_lat)) / (4 * np.pi)
+    half_h = height * (0.5 + margin) / world_px
+
+    def y_to_lat(y):
+        return float(np.degrees(np.arctan(np.sinh(np.pi * (1 - 2 * np.clip(y, 0.0, 1.0))))))
+
+    return (
+        max(lon - half_w, -180.0), y_to_lat(center_y + half_h),
+        min(lon + half_w, 180.0), y_to_lat(center_y - half_h),
+    )
+
+
+def within(lon, lat, bounds):
+    """Boolean mask of points inside (west, south, east, north); all True for None."""
+    if bounds is None:
+        return np.ones(len(lon), dtype=bool)
+    west, south, east, north = bounds
+    lon = np.asarray(lon)
+    lat = np.asarray(lat)
+    return (lon >= west) & (lon <= east) & (lat >= south) & (lat <= north)
+
+
+def label_counts(counts, labels):
+    """'Viable 3 · Emerging 10' per row of a (bins, labels) count matrix."""
+    parts = [
+        np.where(counts[:, i] > 0, np.char.add(f"{label} ", counts[:, i].astype(str)), "")
+        for i, label in enumerate(labels)
+    ]
+    return [" · ".join(p for p in row if p) for row in zip(*parts)] if parts else [""] * len(counts)
+
+
+# ---------------------------
+# SITE GRID
+# ---------------------------
+class SiteGrid:
+    """Per-level site bins, computed lazily and kept for the dataset's lifetime."""
+
+    def __init__(self, df, paths=None, max_level=MAX_LEVEL):
+        self.max_level = max_level
+        self.size = len(df)
+        self.lat = df["latitude"].to_numpy(dtype=np.float64)
+        self.lon = df["longitude"].to_numpy(dtype=np.float64)
+        self.x, self.y = tile_xy(self.lat, self.lon, max_level)
+        self.names = df["country"].to_numpy(dtype=object)
+        self.status = df["ai_inference_readiness"].astype("category").array
+        self.signal = df["ai_policy_signal"].astype("category").array
+        self.score = df["readiness_score"].to_numpy(dtype=np.float64)
+        self.paths = paths
+        self._bins = {}
+        self._routes = {}
+        self._lock = threading.Lock()
+
+    def level_for(self, zoom):
+        return level_for(zoom, self.max_level)
+
+    def cells(self, level):
+        """(unique cell keys, per-site cell number) at ``level``."""
+        shift = self.max_level - level
+        key = ((self.x >> shift) << 32) | (self.y >> shift)
+        return np.unique(key, return_inverse=True)
+
+    def _category_counts(self, inverse, n_bins, values):
+        # Missing labels (code -1) get their own trailing column
+        k = len(values.categories)
+        codes = np.where(values.codes < 0, k, values.codes)
+        counts = np.bincount(inverse * (k + 1) + codes, minlength=n_bins * (k + 1))
+        return counts.reshape(n_bins, k + 1)
+
+    def _dominant(self, counts, values):
+        known = counts[:, :-1]
+        codes = np.where(known.sum(axis=1) > 0, known.argmax(axis=1), -1)
+        return pd.Categorical.from_codes(codes, dtype=values.dtype)
+
+    def bins(self, level):
+        """One site-like row per occupied cell at ``level``."""
+        with self._lock:
+            if level in self._bins:
+                return self._bins[level]
+
+            keys, inverse = self.cells(level)
+            n_bins = len(keys)
+            count = np.bincount(inverse, minlength=n_bins)
+            lat = np.bincount(inverse, weights=self.lat, minlength=n_bins) / count
+            lon = np.bincount(inverse, weights=self.lon, minlength=n_bins) / count
+            status_counts = self._category_counts(inverse, n_bins, self.status)
+            signal_counts = self._category_counts(inverse, n_bins, self.signal)
+
+            # Representative site (highest score) for click-to-select
+            order = np.lexsort((-self.score, inverse))
+            site = order[np.searchsorted(inverse[order], np.arange(n_bins))]
+
+            # Cell width in meters at the centroid, scaled by relative density
+            cell_m = EARTH_CIRCUMFERENCE_M * np.cos(np.radians(lat)) / 2 ** level
+            radius = 0.5 * cell_m * np.clip(np.sqrt(count / count.max()), 0.3, 1.0)
+
+            # Tooltip label: the site name, or the readiness breakdown of the cell
+            labels = list(self.status.categories)
+            summary = label_counts(status_counts[:, :-1], labels)
+            frame = pd.DataFrame({
+                "country": [f"{n} sites · {text}" if n > 1 else name
+                            for n, text, name in zip(count, summary, self.names[site])],
+                "ai_inference_readiness": self._dominant(status_counts, self.status),
+                "ai_policy_signal": self._dominant(signal_counts, self.signal),
+                "latitude": lat,
+                "longitude": lon,
+                "radius": radius.astype(np.float32),
+                "count": count,
+                "site": site,
+                "cell_x": keys >> 32,
+                "cell_y": keys & 0xFFFFFFFF,
+            })
+            for i, label in enumerate(labels):
+                frame[f"n_{label}"] = status_counts[:, i]
+            self._bins[level] = frame
+            return frame
+
+    def route_bins(self, level, bounds=None):
+        """Routes grouped by (origin cell, hub): one path from the cell centroid per hub."""
+        if self.paths is None or not len(self.paths):
+            return pd.DataFrame({"country": [], "hub": [], "path": []})
+        with self._lock:
+            if level not in self._routes:
+                coords = np.asarray(self.paths["path"].tolist(), dtype=np.float64).reshape(-1, 2, 2)
+                x, y = tile_xy(coords[:, 0, 1], coords[:, 0, 0], level)
+                self._routes[level] = pd.DataFrame({
+                    "cell": (x << 32) | y,
+                    "hub": self.paths["hub"].to_numpy(dtype=object),
+                    "sx": coords[:, 0, 0], "sy": coords[:, 0, 1],
+                    "tx": coords[:, 1, 0], "ty": coords[:, 1, 1],
+                }).groupby(["cell", "hub"], sort=False).agg(
+                    sx=("sx", "mean"), sy=("sy", "mean"), tx=("tx", "first"), ty=("ty", "first"),
+                    count=("sx", "size"),
+                ).reset_index()
+            grouped = self._routes[level]
+
+        grouped = grouped[within(grouped["sx"], grouped["sy"], bounds)]
+        return pd.DataFrame({
+            "country": grouped["count"].astype(str) + " sites",
+            "hub": grouped["hub"].to_numpy(),
+            "path": [[[sx, sy], [tx, ty]] for sx, sy, tx, ty in
+                     zip(grouped["sx"], grouped["sy"], grouped["tx"], grouped["ty"])],
+            "count": grouped["count"].to_numpy(),
+        })
+
+    def query(self, zoom, bounds=None, max_bins=DEFAULT_MAX_BINS):
+        """(level, bins) for ``zoom`` inside ``bounds``; coarsens until <= ``max_bins``."""
+        level = self.level_for(zoom)
+        while True:
+            frame = self.bins(level)
+            frame = frame[within(frame["longitude"], frame["latitude"], bounds)]
+            if len(frame) <= max_bins or level == 0:
+                return level, frame.reset_index(drop=True)
+            level -= 1
@@ -0,0 +1,360 @@
+"""Filter / sort / rank / route / summary queries over the readiness dataset.
+
+Queries are plain JSON-able dicts so the same spec works from Python, the
+CLI and the HTTP endpoint (see readiness/api.py):
+
+    service = QueryService.from_path()
+    service.run({"op": "filter", "where": {"region": "East Africa"}, "sort": "-readiness_score"})
+    service.run({"op": "rank", "weights": {"power_reliability": 1}, "limit": 5})
+    service.run({"op": "route", "countries": ["Kenya", "Ghana"], "k": 2})
+    service.run({"op": "route", "sites": [{"name": "Lagos DC", "lat": 6.5, "lon": 3.4}]})
+    service.run({"op": "filter", "max_hub_ms": 80})   # markets under 80 ms to a GPU hub
+    service.run({"op": "summary", "mode": "Policy Mode"})
+    service.run({"op": "filter", "as_of": "2025-03-01"})   # any op, against a recorded snapshot
+    service.run({"op": "diff", "from": "2025-01-01", "to": "latest"})
+    service.run_batch([...])   # list of queries, one response each
+
+Responses are cached per (dataset version, normalized query) in an LRU.
+"""
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from readiness import runtime
+from readiness.aggregates import SUMMARY_CARDS, summary_cards
+from readiness.dataset import DATA_PATH, DERIVED_COLUMNS
+from readiness.history import snapshot_version
+from readiness.ingest import SOURCES_DIR, merged_version
+from readiness.scoring import classify, score
+from readiness.store import DatasetStore
+
+DEFAULT_CACHE_SIZE = int(os.environ.get("READINESS_QUERY_CACHE", "1024"))
+# Countries / sites per route query and queries per batch
+MAX_ITEMS = int(os.environ.get("READINESS_QUERY_MAX_ITEMS", "5000"))
+MAX_BATCH = int(os.environ.get("READINESS_QUERY_MAX_BATCH", "1000"))
+# Nearest hubs per route row
+MAX_K = int(os.environ.get("READINESS_QUERY_MAX_K", "20"))
+
+DEFAULT_COLUMNS = [
+    "country", "region", "ai_inference_readiness", "readiness_score",
+    "primary_inference_route", "ai_compute_availability", "ai_policy_signal",
+    "est_rtt_to_europe_ms",
+]
+COMPARISONS = {
+    "==": lambda s, v: s == v,
+    "!=": lambda s, v: s != v,
+    ">": lambda s, v: s > v,
+    ">=": lambda s, v: s >= v,
+    "<": lambda s, v: s < v,
+    "<=": lambda s, v: s <= v,
+    "in": lambda s, v: s.isin(v),
+    "contains": lambda s, v: s.astype(str).str.contains(str(v), case=False, regex=False),
+}
+
+
+class QueryError(ValueError):
+    """Malformed query (maps to HTTP 400)."""
+
+
+def records(frame):
+    """JSON-safe row dicts (missing / unbounded values as None, numpy scalars unwrapped)."""
+    numeric = frame.select_dtypes("number").columns
+    frame = frame.replace({c: {np.inf: None, -np.inf: None} for c in numeric}) if len(numeric) else frame
+    frame = frame.astype(object).where(frame.notna(), None)
+    return json.loads(json.dumps(frame.to_dict(orient="records"), default=_json_default))
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class ResponseCache:
+    """Small thread-safe LRU of serialized responses."""
+
+    def __init__(self, capacity=DEFAULT_CACHE_SIZE):
+        self.capacity = capacity
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.capacity:
+                self._items.popitem(last=False)
+
+
+class QueryService:
+    """Runs JSON query specs against the current dataset version."""
+
+    def __init__(self, store, version_fn, cache_size=DEFAULT_CACHE_SIZE):
+        self.store = store
+        # Callable returning the current dataset version (e.g. a watcher's)
+        self.version_fn = version_fn
+        self.cache = ResponseCache(cache_size)
+
+    @classmethod
+    def from_path(cls, path=DATA_PATH, watch=False, sources_dir=SOURCES_DIR, **kwargs):
+        from readiness.watcher import DatasetWatcher
+
+        store = DatasetStore(runtime.read_dataset(path, sources_dir))
+        if watch:
+            watcher = DatasetWatcher(store, path, sources_dir=sources_dir).start()
+            return cls(store, lambda: watcher.version, **kwargs)
+        return cls(store, lambda: merged_version(path, sources_dir), **kwargs)
+
+    # ---------------------------
+    # ENTRY POINTS
+    # ---------------------------
+    def run(self, query):
+        """Response dict for one query (served from cache when possible)."""
+        if not isinstance(query, dict):
+            raise QueryError("A query must be a JSON object")
+        version = self.version_fn() if query.get("as_of") is None else self.snapshot(query["as_of"])
+        # Snapshot count too: recording one changes "latest", diffs and the log
+        key = f"{version}:{len(runtime.shared_history())}:{json.dumps(query, sort_keys=True, default=str)}"
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+        df, index = self.store.get(version)
+        if df is None:
+            raise FileNotFoundError("Dataset not available")
+
+        handler = getattr(self, f"_op_{query.get('op', 'filter')}", None)
+        if handler is None:
+            raise QueryError(f"Unknown op: {query.get('op')!r}")
+        try:
+            response = {"version": version, **handler(df, index, version, query)}
+        except QueryError:
+            raise
+        except (TypeError, ValueError) as exc:
+            # Values of the wrong type that got past the checks below
+            raise QueryError(f"Invalid query: {exc}") from exc
+        self.cache.put(key, response)
+        return response
+
+    def run_batch(self, queries):
+        """One response per query; errors are reported per item, not raised."""
+        if not isinstance(queries, list):
+            raise QueryError("A batch must be a JSON array of queries")
+        if len(queries) > MAX_BATCH:
+            raise QueryError(f"Batch too large ({len(queries)} > {MAX_BATCH})")
+        out = []
+        for query in queries:
+            try:
+                out.append(self.run(query))
+            except (QueryError, FileNotFoundError) as exc:
+                out.append({"error": str(exc)})
+        return out
+
+    # ---------------------------
+    # HELPERS
+    # ---------------------------
+    @staticmethod
+    def snapshot(ref):
+        """Store version of the recorded snapshot for a date / snapshot number."""
+        if not isinstance(ref, (str, int)) or isinstance(ref, bool):
+            raise QueryError(f"Not a date or snapshot number: {ref!r}")
+        try:
+            return snapshot_version(runtime.shared_history().resolve(ref))
+        except LookupError as exc:
+            raise QueryError(str(exc)) from exc
+
+    def routing(self, version):
+        # Same artifact as the app's, so the watcher can patch it
+        return runtime.routing_engine(self.store, version)
+
+    @staticmethod
+    def integer(query, key, default=None, minimum=0, maximum=None):
+        """``query[key]`` as an int within bounds (QueryError otherwise)."""
+        value = query.get(key, default)
+        if value is None:
+            return None
+        if isinstance(value, bool) or not isinstance(value, (int, str)) or not str(value).strip().lstrip("-").isdigit():
+            raise QueryError(f"{key!r} must be an integer")
+        value = int(value)
+        if value < minimum or (maximum is not None and value > maximum):
+            bounds = f">= {minimum}" if maximum is None else f"between {minimum} and {maximum}"
+            raise QueryError(f"{key!r} must be {bounds}")
+        return value
+
+    @staticmethod
+    def names(value, key):
+        """A string or list of strings as a list (a lone string is one item, not its characters)."""
+        if isinstance(value, str):
+            return [value]
+        if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+            raise QueryError(f"{key!r} must be a string or a list of strings")
+        return value
+
+    @staticmethod
+    def where(df, conditions):
+        """Boolean mask for ``{"column": value | [values] | {"op": value}}``."""
+        mask = np.ones(len(df), dtype=bool)
+        if conditions is not None and not isinstance(conditions, dict):
+            raise QueryError("'where' must be an object of column conditions")
+        for column, condition in (conditions or {}).items():
+            if column not in df.columns:
+                raise QueryError(f"Unknown column: {column!r}")
+            series = df[column]
+            if isinstance(condition, dict):
+                for op, value in condition.items():
+                    if op not in COMPARISONS:
+                        raise QueryError(f"Unknown comparison: {op!r}")
+                    if op == "in" and not isinstance(value, list):
+                        raise QueryError(f"'in' on {column!r} needs a list of values")
+                    if isinstance(value, (dict, list)) and op != "in":
+                        raise QueryError(f"{op!r} on {column!r} needs a single value")
+                    try:
+                        mask &= np.asarray(COMPARISONS[op](series, value), dtype=bool)
+                    except (TypeError, ValueError) as exc:
+                        raise QueryError(f"Cannot compare {column!r} {op} {value!r}") from exc
+            elif isinstance(condition, list):
+                mask &= series.isin(condition).to_numpy()
+            else:
+                mask &= (series == condition).to_numpy(dtype=bool)
+        return mask
+
+    def hub_reach(self, df, version, query):
+        """Mask of markets with a GPU hub under ``max_hub_ms`` (own hub = 0 ms), or all rows."""
+        max_ms = query.get("max_hub_ms")
+        if max_ms is None:
+            return np.ones(len(df), dtype=bool)
+        if isinstance(max_ms, bool) or not isinstance(max_ms, (int, float)):
+            raise QueryError("'max_hub_ms' must be a number")
+        return runtime.latency_model(self.store, version).within(max_ms)
+
+    @staticmethod
+    def columns(df, requested):
+        if requested in (None, []):
+            return [c for c in DEFAULT_COLUMNS if c in df.columns]
+        if requested == "*":
+            return [c for c in df.columns if c not in DERIVED_COLUMNS or c == "readiness_score"]
+        requested = QueryService.names(requested, "columns")
+        unknown = [c for c in requested if c not in df.columns]
+        if unknown:
+            raise QueryError(f"Unknown column: {unknown[0]!r}")
+        return list(requested)
+
+    @staticmethod
+    def order(frame, sort):
+        if not sort:
+            return frame
+        keys = QueryService.names(sort, "sort")
+        by = [k.lstrip("-") for k in keys]
+        unknown = [c for c in by if c not in frame.columns]
+        if unknown:
+            raise QueryError(f"Unknown sort column: {unknown[0]!r}")
+        return frame.sort_values(by, ascending=[not k.startswith("-") for k in keys], kind="stable")
+
+    @staticmethod
+    def page(frame, query):
+        offset = QueryService.integer(query, "offset", 0)
+        limit = QueryService.integer(query, "limit")
+        return frame.iloc[offset:] if limit is None else frame.iloc[offset:offset + int(limit)]
+
+    # ---------------------------
+    # OPS
+    # ---------------------------
+    def _op_filter(self, df, index, version, query):
+        columns = self.columns(df, query.get("columns"))
+        matched = df[self.where(df, query.get("where")) & self.hub_reach(df, version, query)]
+        ordered = self.order(matched, query.get("sort"))
+        return {"total": int(len(matched)), "rows": records(self.page(ordered, query)[columns])}
+
+    def _op_rank(self, df, index, version, query):
+        """Rank by readiness_score, or by a score under custom ``weights``."""
+        matched = df[self.where(df, query.get("where")) & self.hub_reach(df, version, query)]
+        columns = self.columns(df, query.get("columns"))
+        if query.get("weights") and not isinstance(query["weights"], dict):
+            raise QueryError("'weights' must be an object of column weights")
+        try:
+            scores = score(matched, query["weights"]).to_numpy() if query.get("weights") else \
+                matched["readiness_score"].to_numpy()
+        except ValueError as exc:
+            raise QueryError(str(exc)) from exc
+        ranked = matched[columns].assign(score=scores, band=classify(scores).astype(str))
+        ranked = ranked.sort_values("score", ascending=False, kind="stable")
+        ranked.insert(0, "rank", np.arange(1, len(ranked) + 1))
+        return {"total": int(len(ranked)), "rows": records(self.page(ranked, query))}
+
+    def _op_route(self, df, index, version, query):
+        """Route targets for dataset countries, or k nearest hubs for arbitrary sites."""
+        engine = self.routing(version)
+        k = self.integer(query, "k", 3, minimum=1, maximum=MAX_K)
+        if "sites" in query:
+            sites = query["sites"]
+            if not isinstance(sites, list) or not all(isinstance(s, dict) for s in sites):
+                raise QueryError("'sites' must be a list of {name, lat, lon} objects")
+            if len(sites) > MAX_ITEMS:
+                raise QueryError(f"Too many sites ({len(sites)} > {MAX_ITEMS})")
+            try:
+                frame = pd.DataFrame({
+                    "country": [str(s.get("name", i)) for i, s in enumerate(sites)],
+                    "latitude": [float(s["lat"]) for s in sites],
+                    "longitude": [float(s["lon"]) for s in sites],
+                })
+            except (KeyError, TypeError, ValueError) as exc:
+                raise QueryError("Each site needs numeric 'lat' and 'lon'") from exc
+            return {"rows": records(engine.assign(frame, k))}
+
+        countries = query.get("countries")
+        if countries is None:
+            rows = np.arange(len(df))
+        else:
+            countries = self.names(countries, "countries")
+            if len(countries) > MAX_ITEMS:
+                raise QueryError(f"Too many countries ({len(countries)} > {MAX_ITEMS})")
+            unknown = [c for c in countries if c not in index]
+            if unknown:
+                raise QueryError(f"Unknown country: {unknown[0]!r}")
+            rows = np.asarray([index.position(c) for c in countries], dtype=np.intp)
+        subset = df.iloc[rows]
+        targets = engine.route_targets(subset)
+        nearest = engine.assign(subset, k).drop(columns="country")
+        routed = pd.concat([targets, nearest], axis=1)
+        return {"rows": records(self.page(routed, query))}
+
+    def _op_summary(self, df, index, version, query):
+        mode = query.get("mode", "Founder Mode")
+        if not isinstance(mode, str) or mode not in SUMMARY_CARDS:
+            raise QueryError(f"Unknown mode: {mode!r}")
+        if query.get("group") is not None and not isinstance(query["group"], str):
+            raise QueryError("'group' must be a string")
+        aggregates = runtime.aggregates(self.store, version)
+        cards = summary_cards(aggregates, mode, group=query.get("group"))
+        return {"cards": [{"label": label, "value": value, "subtext": subtext} for label, value, subtext in cards]}
+
+    def _op_countries(self, df, index, version, query):
+        return {"countries": index.countries}
+
+    def _op_snapshots(self, df, index, version, query):
+        return {"snapshots": runtime.shared_history().log()}
+
+    def _op_diff(self, df, index, version, query):
+        """Added / removed / changed countries between two recorded snapshots."""
+        if "from" not in query:
+            raise QueryError("A diff needs 'from' (date or snapshot number)")
+        try:
+            return runtime.shared_history().diff(query["from"], query.get("to", "latest"))
+        except LookupError as exc:
+            raise QueryError(str(exc)) from exc
@@ -0,0 +1,141 @@
+"""Nearest-hub routing over a spatial index of inference hubs.
+
+Hubs are indexed as 3D unit vectors in a KD-tree (scipy's cKDTree), where
+straight-line (chord) order equals great-circle order, so one batched
+tree query gives every site its k nearest hubs by haversine distance.
+Hubs grow with the dataset (every GPU market is one), so lookups stay
+O(log M) per site instead of scanning every hub.
+"""
+import numpy as np
+import pandas as pd
+from scipy.spatial import cKDTree
+
+from readiness.latency import EARTH_RADIUS_KM, estimate_rtt_ms
+
+
+def to_unit_xyz(lat, lon):
+    lat = np.radians(np.asarray(lat, dtype=np.float64))
+    lon = np.radians(np.asarray(lon, dtype=np.float64))
+    cos_lat = np.cos(lat)
+    return np.column_stack([cos_lat * np.cos(lon), cos_lat * np.sin(lon), np.sin(lat)])
+
+
+def chord_to_km(chord):
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.clip(chord / 2, 0.0, 1.0))
+
+
+class HubIndex:
+    """k-nearest-hub queries by haversine distance, batched over many points."""
+
+    def __init__(self, hubs):
+        self.hubs = hubs.reset_index(drop=True)
+        self.names = self.hubs["name"].to_numpy(dtype=object)
+        self._xyz = to_unit_xyz(self.hubs["lat"], self.hubs["lon"])
+        self._tree = cKDTree(self._xyz) if len(self.hubs) else None
+
+    def __len__(self):
+        return len(self.hubs)
+
+    def query(self, lat, lon, k=1):
+        """(distance_km, hub_idx), both shaped (N, k) and sorted nearest first."""
+        xyz = to_unit_xyz(lat, lon)
+        k = min(k, len(self.hubs))
+        if k == 0:
+            return np.empty((len(xyz), 0)), np.empty((len(xyz), 0), dtype=np.intp)
+        chord, idx = self._tree.query(xyz, k=k)
+        return chord_to_km(chord.reshape(len(xyz), k)), idx.reshape(len(xyz), k).astype(np.intp)
+
+
+class RoutingEngine:
+    """Assigns each site its nearest viable hubs and resolves route targets.
+
+    - Local-Native: served in-country, no path
+    - Regional-Tethered: nearest GPU market other than the site itself
+    - Hybrid-Edge: nearest offshore hub
+    """
+
+    def __init__(self, hubs):
+        self.hubs = hubs.reset_index(drop=True)
+        self.index = HubIndex(self.hubs)
+        self.onshore = HubIndex(self.hubs[self.hubs["kind"] == "gpu-market"])
+        self.offshore = HubIndex(self.hubs[self.hubs["kind"] == "offshore"])
+
+    def nearest(self, df, k=3, index=None, exclude_self=True):
+        """(distance_km, hub_idx) of the k nearest hubs per row, as (N, k) arrays.
+
+        ``hub_idx`` points into ``index.hubs``; missing slots (fewer than k
+        hubs) are NaN / -1.
+        """
+        index = self.index if index is None else index
+        extra = 1 if exclude_self else 0
+        dist, idx = index.query(df["latitude"], df["longitude"], k + extra)
+
+        if exclude_self and idx.shape[1]:
+            # Stable sort pushes a site's own entry to the end of its row
+            is_self = index.names[idx] == df["country"].to_numpy(dtype=object)[:, None]
+            order = np.argsort(is_self, axis=1, kind="stable")
+            dist = np.take_along_axis(np.where(is_self, np.nan, dist), order, axis=1)
+            idx = np.take_along_axis(np.where(is_self, -1, idx), order, axis=1)
+
+        out_dist = np.full((len(df), k), np.nan)
+        out_idx = np.full((len(df), k), -1, dtype=np.intp)
+        width = min(k, idx.shape[1])
+        out_dist[:, :width] = dist[:, :width]
+        out_idx[:, :width] = idx[:, :width]
+        return out_dist, out_idx
+
+    @staticmethod
+    def _take(index, idx, column, missing):
+        values = index.hubs[column].to_numpy()
+        if not len(values):
+            return np.full(idx.shape, missing, dtype=object if missing is None else float)
+        picked = values[np.clip(idx, 0, None)]
+        return np.where(idx >= 0, picked, missing)
+
+    def assign(self, df, k=3):
+        """Frame of the k nearest viable hubs per country (one batch query)."""
+        dist, idx = self.nearest(df, k)
+        names = self._take(self.index, idx, "name", None)
+        out = {"country": df["country"].to_numpy(dtype=object)}
+        for i in range(k):
+            out[f"hub_{i + 1}"] = names[:, i]
+            out[f"hub_{i + 1}_km"] = dist[:, i]
+            out[f"hub_{i + 1}_rtt_ms"] = estimate_rtt_ms(dist[:, i])
+        return pd.DataFrame(out, index=df.index)
+
+    def route_targets(self, df):
+        """Target hub per row according to primary_inference_route (None if local)."""
+        route = df["primary_inference_route"].astype(str).to_numpy()
+        is_regional = route == "Regional-Tethered"
+        is_hybrid = route == "Hybrid-Edge"
+
+        regional_km, regional_idx = self.nearest(df, 1, index=self.onshore)
+        offshore_km, offshore_idx = self.nearest(df, 1, index=self.offshore, exclude_self=False)
+
+        def pick(column, missing):
+            regional = self._take(self.onshore, regional_idx[:, 0], column, missing)
+            offshore = self._take(self.offshore, offshore_idx[:, 0], column, missing)
+            return np.where(is_regional, regional, np.where(is_hybrid, offshore, missing))
+
+        km = np.where(is_regional, regional_km[:, 0], np.where(is_hybrid, offshore_km[:, 0], np.nan))
+        return pd.DataFrame({
+            "country": df["country"].to_numpy(dtype=object),
+            "route": route,
+            "hub": pick("name", None),
+            "hub_lat": pick("lat", np.nan).astype(float),
+            "hub_lon": pick("lon", np.nan).astype(float),
+            "distance_km": km,
+            "rtt_ms": estimate_rtt_ms(km),
+        }, index=df.index)
+
+    def paths(self, df):
+        """PathLayer frame: [[site_lon, site_lat], [hub_lon, hub_lat]] per routed row."""
+        targets = self.route_targets(df)
+        routed = targets["hub"].notna().to_numpy()
+        starts = df.loc[routed, ["longitude", "latitude"]].to_numpy(dtype=float)
+        ends = targets.loc[routed, ["hub_lon", "hub_lat"]].to_numpy(dtype=float)
+        return pd.DataFrame({
+            "country": targets.loc[routed, "country"].to_numpy(),
+            "hub": targets.loc[routed, "hub"].to_numpy(),
+            "path": np.stack([starts, ends], axis=1).tolist(),
+        })
@@ -0,0 +1,221 @@
+"""Process-wide dataset store, watcher and named derived artifacts.
+
+The app, the query service and the boot-time warm-up all go through the
+same store and the same artifact names, so whatever one of them builds
+(or the watcher patches) the others reuse:
+
+    store = shared_store()
+    version = shared_watcher().version
+    paths = route_paths(store, version)
+
+Cold starts:
+
+    python -m readiness.runtime warm                    # parse + sidecar + layer files, then exit
+    python -m readiness.runtime serve [streamlit args]  # warm in-process, then start the app
+
+``serve`` runs Streamlit in this process and warms the shared store on a
+background thread while the server boots, so the first session finds the
+modules imported and the dataset and map artifacts already built.
+"""
+import importlib
+import os
+import sys
+import threading
+import time
+
+from readiness.aggregates import build_aggregates
+from readiness.dataset import DATA_PATH, CountryIndex
+from readiness.history import History, parse_version
+from readiness.hubs import hub_frame
+from readiness.ingest import SOURCES_DIR, load_merged, merged_version
+from readiness.latency import LatencyModel
+from readiness.routing import RoutingEngine
+from readiness.store import DatasetStore
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+_lock = threading.Lock()
+_store = None
+_watcher = None
+_history = None
+
+
+# ---------------------------
+# SHARED STORE / WATCHER
+# ---------------------------
+def read_dataset(path=DATA_PATH, sources_dir=SOURCES_DIR):
+    """Store loader: (df, CountryIndex) or (None, None) when the CSV is missing.
+
+    History versions ("history-<seq>", see readiness/history.py) load that
+    snapshot, so derived artifacts work the same for past snapshots.
+    """
+    def load(version=None):
+        seq = parse_version(version)
+        try:
+            df = load_merged(path, sources_dir) if seq is None else shared_history().frame(seq)
+        except FileNotFoundError:
+            return None, None
+        return df, CountryIndex(df)
+    return load
+
+
+def shared_store():
+    global _store
+    with _lock:
+        if _store is None:
+            _store = DatasetStore(read_dataset(), on_evict=drop_layer_files)
+        return _store
+
+
+def shared_history():
+    global _history
+    with _lock:
+        if _history is None:
+            _history = History()
+        return _history.refresh()
+
+
+def shared_watcher():
+    global _watcher
+    from readiness.watcher import DatasetWatcher
+
+    store = shared_store()
+    with _lock:
+        if _watcher is None:
+            _watcher = DatasetWatcher(store, DATA_PATH, sources_dir=SOURCES_DIR).start()
+        return _watcher
+
+
+# ---------------------------
+# NAMED ARTIFACTS
+# ---------------------------
+# Names are the store keys the watcher patches (see readiness/watcher.py).
+# Map and scenario modules (and pydeck with them) are imported on first
+# use, so headless callers such as the query API never load them.
+def routing_engine(store, version):
+    # Spatial index over GPU markets + offshore hubs
+    return store.derived(version, "routing_engine", lambda data: RoutingEngine(hub_frame(data[0])))
+
+
+def route_paths(store, version):
+    # Route geometry depends only on the dataset and the hubs, so every
+    # primary_inference_route is resolved to its nearest hub in one batch.
+    def build(data):
+        import pandas as pd
+
+        df, _ = data
+        if df is None:
+            return pd.DataFrame({"country": [], "hub": [], "path": []})
+        return routing_engine(store, version).paths(df)
+    return store.derived(version, "route_paths", build)
+
+
+def aggregates(store, version):
+    # Founder + Policy counts (overall and per region) in one pass
+    return store.derived(version, "aggregates", lambda data: build_aggregates(data[0]))
+
+
+def latency_model(store, version):
+    # Nearest GPU hub per site (one spatial query; dense matrices on demand).
+    # GPU markets only: the card is about in-region compute, not the EU anchor
+    return store.derived(version, "latency_model", lambda data: LatencyModel(data[0], hub_frame(data[0], offshore=False)))
+
+
+def site_grid(store, version):
+    # Level-of-detail bins for dense datasets (built per level on first use)
+    from readiness.lod import SiteGrid
+
+    return store.derived(version, "site_grid", lambda data: SiteGrid(data[0], route_paths(store, version)))
+
+
+def scenario_engine(store, version):
+    # Base factor matrix and route targets shared by every what-if scenario
+    from readiness.scenarios import ScenarioEngine
+
+    return store.derived(version, "scenario_engine", lambda data: ScenarioEngine(data[0]))
+
+
+def layer_urls(store, version):
+    # Base layer rows written to ./static once per version (see readiness/layers.py).
+    # Files live exactly as long as the store holds the version (drop_layer_files);
+    # they are re-checked here in case something else removed them.
+    from readiness.layers import layer_data_exists, prune_layer_data, publish_layer_data
+
+    def build(data):
+        # Leftovers from earlier processes that no store holds any more
+        prune_layer_data([*store.stats()["versions"], version])
+        return publish_layer_data(data[0], route_paths(store, version), version)
+
+    urls = store.derived(version, "layer_urls", build)
+    if not layer_data_exists(version):
+        df, _ = store.get(version)
+        urls = publish_layer_data(df, route_paths(store, version), version)
+    return urls
+
+
+def drop_layer_files(version, derived):
+    """DatasetStore eviction hook: delete the layer files of a dropped version."""
+    if "layer_urls" in derived:
+        from readiness.layers import remove_layer_data
+
+        remove_layer_data(version)
+
+
+# ---------------------------
+# WARM-UP
+# ---------------------------
+def warm(store=None, version=None):
+    """Build what the first render needs; returns {step: seconds}."""
+    from readiness.lod import DEFAULT_MIN_SITES, level_for
+    from readiness.layers import view_state_for
+
+    store = store or shared_store()
+    version = version if version is not None else shared_watcher().version
+    timings = {}
+
+    def step(name, fn):
+        start = time.perf_counter()
+        value = fn()
+        timings[name] = round(time.perf_counter() - start, 4)
+        return value
+
+    df, index = step("dataset", lambda: store.get(version))
+    if df is None:
+        return timings
+    step("aggregates", lambda: aggregates(store, version))
+    step("route_paths", lambda: route_paths(store, version))
+    if len(df) >= DEFAULT_MIN_SITES:
+        # Bins for the initial view (first market's zoom)
+        zoom = view_state_for(index.row(df, index.countries[0])).zoom
+        step("site_grid", lambda: site_grid(store, version).bins(level_for(zoom)))
+    else:
+        step("layer_urls", lambda: layer_urls(store, version))
+    # Imported by the app's first map render
+    step("imports", lambda: __import__("pydeck"))
+    return timings
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    command = argv[0] if argv else "warm"
+    if command == "warm":
+        # Separate process: only the disk caches (sidecar, layer files) outlive it
+        timings = warm(DatasetStore(read_dataset()), merged_version(DATA_PATH, SOURCES_DIR))
+        print(" ".join(f"{k}={v * 1000:.0f}ms" for k, v in timings.items()))
+        return 0
+    if command == "serve":
+        # Warm while Streamlit boots; sessions wait on the store's lock, never on a second load.
+        # Run as `-m`, this module is __main__, while app.py imports readiness.runtime:
+        # warm that one so the app finds the store (and watcher) already filled.
+        shared = importlib.import_module("readiness.runtime")
+        threading.Thread(target=shared.warm, name="readiness-warmup", daemon=True).start()
+        from streamlit.web import cli
+
+        sys.argv = ["streamlit", "run", APP_PATH, *argv[1:]]
+        return cli.main()
+    print("usage: python -m readiness.runtime [warm | serve [streamlit args]]", file=sys.stderr)
+    return 2
+
+
+if __name__ == "__main__":
+    sys.exit(main())
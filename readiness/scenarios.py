@@ -0,0 +1,290 @@
+"""What-if scenarios evaluated as copy-on-write column patches.
+
+A scenario maps countries (or "*" for every row) to column overrides:
+
+    engine = ScenarioEngine(df)                 # once per dataset version
+    result = engine.evaluate({
+        "Kenya gets local GPUs": {"Kenya": {"ai_compute_availability": "GPU available"}},
+        "Power improves": {"*": {"power_reliability": "+1"}},
+    })
+    result["summary"], result["scores"], result["routes"]
+
+Overrides are compiled to (row positions, labels) per column and never
+copy the base frame. Scores reuse the base (N, K) factor matrix: a patch
+only changes its own cells, so every scenario's score deltas come out of a
+single scatter-add over all patches. Route and summary-metric deltas are
+computed on the patched rows (plus the rows a changed hub set can reroute).
+"""
+import numpy as np
+import pandas as pd
+
+from readiness.aggregates import SUMMARY_CARDS, metric_flags
+from readiness.hubs import gpu_mask, hub_frame
+from readiness.routing import HubIndex, RoutingEngine
+from readiness.scoring import (
+    DEFAULT_WEIGHTS,
+    FACTOR_LEVELS,
+    FACTORS,
+    UNKNOWN_FACTOR,
+    classify,
+    factor_matrix,
+    weight_matrix,
+)
+
+ALL_ROWS = "*"
+EDITABLE_COLUMNS = FACTORS + ["primary_inference_route", "ai_inference_readiness"]
+# Columns metric_flags reads
+METRIC_COLUMNS = [
+    "ai_inference_readiness", "ai_compute_availability", "ai_policy_signal",
+    "ai_data_governance_posture", "ai_compute_policy_commitment",
+]
+METRIC_LABELS = {key: label for cards in SUMMARY_CARDS.values() for key, label, _ in cards}
+
+
+def same_values(a, b):
+    """Elementwise equality where missing == missing."""
+    a = np.asarray(a, dtype=object)
+    b = np.asarray(b, dtype=object)
+    return (a == b) | (pd.isna(a) & pd.isna(b))
+
+
+def factor_values(labels, column):
+    levels = FACTOR_LEVELS[column]
+    return np.asarray([levels.get(label, UNKNOWN_FACTOR) for label in labels], dtype=np.float32)
+
+
+def step_labels(labels, column, steps):
+    """Move each label ``steps`` rungs up (or down) its factor ladder."""
+    levels = FACTOR_LEVELS[column]
+    ladder = sorted(levels, key=levels.get)
+    factors = np.asarray([levels[label] for label in ladder])
+
+    def step(label):
+        current = levels.get(label, UNKNOWN_FACTOR)
+        if steps > 0:
+            rung = np.searchsorted(factors, current, side="right") + steps - 1
+        else:
+            rung = np.searchsorted(factors, current, side="left") + steps
+        return ladder[rung] if 0 <= rung < len(ladder) else label
+
+    # One lookup per distinct label
+    mapping = {label: step(label) for label in pd.unique(labels)}
+    return np.asarray([mapping[label] for label in labels], dtype=object)
+
+
+class ScenarioEngine:
+    """Evaluates many override scenarios against one shared base frame."""
+
+    def __init__(self, df, weights=None):
+        self.df = df
+        self.names = df["country"].to_numpy(dtype=object)
+        self.positions = pd.Index(self.names)
+        self.weights = weight_matrix([DEFAULT_WEIGHTS if weights is None else weights])[:, 0]
+        # Shared by every scenario; patches only ever read from it
+        self.factors = factor_matrix(df)
+        self.base_scores = self.factors @ self.weights * 100
+        self.gpu = gpu_mask(df)
+        self.routing = RoutingEngine(hub_frame(df))
+        self._base_targets = None
+        self._regional = None
+
+    @property
+    def base_targets(self):
+        if self._base_targets is None:
+            self._base_targets = self.routing.route_targets(self.df)
+        return self._base_targets
+
+    @property
+    def regional(self):
+        """(rows, hub, distance_km) of the base Regional-Tethered routes."""
+        if self._regional is None:
+            base = self.base_targets
+            rows = np.flatnonzero((base["route"] == "Regional-Tethered").to_numpy())
+            self._regional = (
+                rows,
+                base["hub"].to_numpy(dtype=object)[rows],
+                base["distance_km"].fillna(np.inf).to_numpy()[rows],
+            )
+        return self._regional
+
+    # ---------------------------
+    # COMPILE
+    # ---------------------------
+    def rows_for(self, key):
+        if key == ALL_ROWS:
+            return np.arange(len(self.df))
+        keys = [key] if isinstance(key, str) else list(key)
+        rows = self.positions.get_indexer(keys)
+        if (rows < 0).any():
+            missing = [k for k, r in zip(keys, rows) if r < 0]
+            raise ValueError(f"Unknown country: {missing[0]!r}")
+        return rows
+
+    def compile(self, overrides):
+        """{column: (sorted rows, labels)}; later overrides win on overlap."""
+        pieces = {}
+        for key, columns in overrides.items():
+            rows = self.rows_for(key)
+            for column, value in columns.items():
+                if column not in EDITABLE_COLUMNS:
+                    raise ValueError(f"Column can't be overridden: {column!r}")
+                if isinstance(value, str) and value[:1] in "+-" and value[1:].isdigit():
+                    if column not in FACTOR_LEVELS:
+                        raise ValueError(f"Steps need an ordinal factor column: {column!r}")
+                    base = self.df[column].to_numpy(dtype=object)[rows]
+                    labels = step_labels(base, column, int(value))
+                else:
+                    labels = np.full(len(rows), value, dtype=object)
+                pieces.setdefault(column, []).append((rows, labels))
+
+        patches = {}
+        for column, parts in pieces.items():
+            rows = np.concatenate([r for r, _ in parts])
+            labels = np.concatenate([l for _, l in parts])
+            # Last occurrence per row wins
+            unique, last = np.unique(rows[::-1], return_index=True)
+            patches[column] = (unique, labels[::-1][last])
+        return patches
+
+    def view(self, patches, rows, columns):
+        """Patched copy of ``columns`` for ``rows`` only (sorted positions)."""
+        out = self.df.iloc[rows][list(columns)].copy()
+        for column, (patched, labels) in patches.items():
+            if column not in out.columns:
+                continue
+            keep = np.isin(patched, rows)
+            values = out[column].to_numpy(dtype=object, copy=True)
+            values[np.searchsorted(rows, patched[keep])] = labels[keep]
+            out[column] = pd.Series(values, index=out.index).astype("category")
+        return out
+
+    # ---------------------------
+    # EVALUATE
+    # ---------------------------
+    def score_deltas(self, compiled):
+        """(scenario, row, delta) for every patched row, in one vectorized pass."""
+        n = len(self.df)
+        factor_pos = {col: k for k, col in enumerate(FACTORS)}
+        scen, rows, deltas = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)], [np.empty(0)]
+        for s, patches in enumerate(compiled):
+            for column, (patched, labels) in patches.items():
+                k = factor_pos.get(column)
+                change = np.zeros(len(patched))
+                if k is not None:
+                    change = (factor_values(labels, column) - self.factors[patched, k]) * self.weights[k] * 100
+                scen.append(np.full(len(patched), s, dtype=np.intp))
+                rows.append(patched)
+                deltas.append(change)
+
+        key = np.concatenate(scen) * n + np.concatenate(rows)
+        unique, inverse = np.unique(key, return_inverse=True)
+        total = np.bincount(inverse, weights=np.concatenate(deltas), minlength=len(unique))
+        return unique // n, unique % n, total
+
+    def route_changes(self, patches):
+        """New route targets for the rows a scenario can reroute."""
+        candidates = [np.empty(0, dtype=np.intp)]
+        for column in ("primary_inference_route", "ai_compute_availability"):
+            if column in patches:
+                candidates.append(patches[column][0])
+
+        gpu = self.gpu
+        if "ai_compute_availability" in patches:
+            rows, labels = patches["ai_compute_availability"]
+            gpu = gpu.copy()
+            gpu[rows] = ["gpu" in str(label).lower() for label in labels]
+        added = np.flatnonzero(gpu & ~self.gpu)
+        removed = set(self.names[self.gpu & ~gpu])
+
+        routing = self.routing
+        if len(added) or removed:
+            routing = RoutingEngine(hub_frame(self.df, mask=gpu))
+            rows, hub, km = self.regional
+            # Lost their hub, or an added hub is closer than the current one
+            affected = np.isin(hub, list(removed))
+            if len(added):
+                added_hubs = HubIndex(pd.DataFrame({
+                    "name": self.names[added],
+                    "lat": self.df["latitude"].to_numpy()[added],
+                    "lon": self.df["longitude"].to_numpy()[added],
+                }))
+                dist, _ = added_hubs.query(self.df["latitude"].to_numpy()[rows], self.df["longitude"].to_numpy()[rows], 1)
+                affected |= ~(dist[:, 0] >= km)
+            candidates.append(rows[affected])
+
+        rows = np.unique(np.concatenate(candidates))
+        if not len(rows):
+            return rows, None
+        view = self.view(patches, rows, ["country", "latitude", "longitude", "primary_inference_route"])
+        return rows, routing.route_targets(view)
+
+    def evaluate(self, scenarios):
+        """Summary, per-row score and route deltas for ``{name: overrides}``."""
+        names = list(scenarios)
+        compiled = [self.compile(overrides) for overrides in scenarios.values()]
+
+        s_idx, rows, delta = self.score_deltas(compiled)
+        base = self.base_scores[rows]
+        base_band = classify(base)
+        band = classify(base + delta)
+        scores = pd.DataFrame({
+            "scenario": np.asarray(names, dtype=object)[s_idx],
+            "country": self.names[rows],
+            "base_score": base,
+            "score": base + delta,
+            "delta": delta,
+            "base_band": base_band,
+            "band": band,
+        })
+
+        summary, route_frames = [], []
+        for s, (name, patches) in enumerate(zip(names, compiled)):
+            mine = s_idx == s
+            row = {
+                "scenario": name,
+                "patched_rows": int(mine.sum()),
+                "mean_score_delta": float(delta[mine].sum() / max(len(self.df), 1)),
+                "band_ups": int((band.codes[mine] > base_band.codes[mine]).sum()),
+                "band_downs": int((band.codes[mine] < base_band.codes[mine]).sum()),
+            }
+
+            routed_rows, targets = self.route_changes(patches)
+            if targets is not None:
+                before = self.base_targets.iloc[routed_rows]
+                moved = ~(
+                    same_values(before["hub"], targets["hub"]) & same_values(before["route"], targets["route"])
+                )
+                if moved.any():
+                    route_frames.append(pd.DataFrame({
+                        "scenario": name,
+                        "country": targets["country"].to_numpy()[moved],
+                        "base_route": before["route"].to_numpy()[moved],
+                        "route": targets["route"].to_numpy()[moved],
+                        "base_hub": before["hub"].to_numpy()[moved],
+                        "hub": targets["hub"].to_numpy()[moved],
+                        "base_rtt_ms": before["rtt_ms"].to_numpy()[moved],
+                        "rtt_ms": targets["rtt_ms"].to_numpy()[moved],
+                    }))
+                row["route_changes"] = int(moved.sum())
+            else:
+                row["route_changes"] = 0
+
+            # Summary-card deltas from the patched rows alone
+            metric_rows = np.unique(np.concatenate(
+                [patches[c][0] for c in METRIC_COLUMNS if c in patches] + [np.empty(0, dtype=np.intp)]
+            ))
+            if len(metric_rows):
+                after = metric_flags(self.view(patches, metric_rows, METRIC_COLUMNS)).sum()
+                before = metric_flags(self.df.iloc[metric_rows]).sum()
+                deltas = (after - before).astype(int)
+            else:
+                deltas = pd.Series(0, index=list(METRIC_LABELS))
+            for key, label in METRIC_LABELS.items():
+                row[label] = int(deltas.get(key, 0))
+            summary.append(row)
+
+        routes = pd.concat(route_frames, ignore_index=True) if route_frames else pd.DataFrame(
+            columns=["scenario", "country", "base_route", "route", "base_hub", "hub", "base_rtt_ms", "rtt_ms"]
+        )
+        routes["rtt_delta_ms"] = routes["rtt_ms"] - routes["base_rtt_ms"]
+        return {"summary": pd.DataFrame(summary), "scores": scores, "routes": routes}
@@ -0,0 +1,355 @@
+"""Declarative dataset schema, compiled into one vectorized normalization pass.
+
+Every source column has a rule in ``SCHEMA``:
+
+    key      required, whitespace-trimmed identifier (``country``)
+    number   numeric with optional bounds; ``required`` rows are rejected when invalid
+    ordinal  known levels (lowest first) + synonyms -> ordered Categorical
+    nominal  synonyms -> unordered Categorical
+    range    free text such as "15-25", "~160", "<50", "20+" -> float32 low/high/mid columns
+    text     free text, kept as-is
+
+plus an optional ``default`` for missing columns and empty cells, and
+``flags`` (label substring -> boolean column). Rules are compiled once:
+label cleaning, synonym matching and range parsing run per distinct value
+(a few dozen even for million-row feeds) and are gathered back through the
+factorized codes, so each column costs one factorize plus one take.
+
+    typed, issues = DATASET_SCHEMA.apply(raw)
+    python -m readiness.schema data/ai_inference_readiness_africa_v0.csv
+
+Rows failing a required rule are left out of ``typed`` and listed in
+``issues`` (row, column, value, problem, rejected) together with the
+non-fatal problems (unknown labels, unparsed ranges) that were kept.
+"""
+import re
+import sys
+
+import numpy as np
+import pandas as pd
+
+# ---------------------------
+# DEFAULTS FOR MISSING COLUMNS
+# ---------------------------
+# Ensure v2 columns exist even if CSV is outdated, to prevent app crash
+V2_DEFAULTS = {
+    'ai_policy_signal': 'Unclear',
+    'ai_data_governance_posture': 'Unclear',
+    'ai_compute_policy_commitment': 'Absent',
+    'cross_border_ai_alignment': 'Unclear'
+}
+
+# Founder columns are filled non-destructively (existing values kept)
+FOUNDER_DEFAULTS = {
+    'primary_inference_route': 'Unclear',
+    'ai_compute_availability': 'Unclear',
+    'power_reliability': 'Unclear',
+    'cloud_maturity': 'Unclear',
+    'ops_friction': 'Unclear',
+    'founder_insight': 'Founder insight pending.',
+}
+
+# ---------------------------
+# CATEGORICAL ENCODINGS
+# ---------------------------
+# Known levels, lowest -> highest. Labels not listed here are kept and
+# appended after the known levels, so nothing is lost to NaN.
+ORDINAL_LEVELS = {
+    'ai_inference_readiness': ["Emerging (Early)", "Emerging", "Viable"],
+    'power_reliability': ["Unclear", "Low", "Low-Medium", "Medium", "Medium (High Cost)", "Medium-High", "High"],
+    'ai_compute_availability': ["Unclear", "CPU-focused", "Limited GPU", "GPU available"],
+    'cloud_maturity': ["Unclear", "PoP", "Local Zone", "Region"],
+    'ops_friction': ["Unclear", "Low", "Medium", "High"],
+    'dc_pipeline': ["Planned", "Under construction"],
+    'ai_policy_signal': ["Unclear", "Emerging", "Strong"],
+    'ai_compute_policy_commitment': ["Absent", "Implied", "Explicit"],
+    'cross_border_ai_alignment': ["Unclear", "Conditional", "Supported"],
+}
+
+# Unordered labels that still repeat heavily across rows
+NOMINAL_COLUMNS = [
+    'region',
+    'connectivity_role',
+    'data_residency_constraint',
+    'primary_inference_route',
+    'ai_data_governance_posture',
+]
+
+# Alternate spellings seen in feeds -> canonical label (matched after clean_label)
+SYNONYMS = {
+    'ai_inference_readiness': {"early": "Emerging (Early)", "emerging early": "Emerging (Early)", "ready": "Viable"},
+    'power_reliability': {
+        "low medium": "Low-Medium", "medium high": "Medium-High", "med": "Medium",
+        "medium-high cost": "Medium (High Cost)", "medium high cost": "Medium (High Cost)",
+    },
+    'ai_compute_availability': {
+        "gpu": "GPU available", "gpus available": "GPU available", "limited gpus": "Limited GPU",
+        "cpu": "CPU-focused", "cpu only": "CPU-focused", "cpu-only": "CPU-focused",
+    },
+    'cloud_maturity': {"cloud region": "Region", "local zones": "Local Zone", "point of presence": "PoP"},
+    'dc_pipeline': {"construction": "Under construction", "in construction": "Under construction"},
+    'data_residency_constraint': {
+        "no": "No / Sector-specific", "sector-specific": "No / Sector-specific",
+        "sector specific": "No / Sector-specific",
+    },
+    'primary_inference_route': {
+        "local": "Local-Native", "regional": "Regional-Tethered", "hybrid": "Hybrid-Edge",
+    },
+}
+
+# Cells that mean "no value" (-> default, if the column has one)
+MISSING_TOKENS = {"", "-", "n/a", "na", "none", "null", "unknown", "tbd"}
+
+# "~160", "80-120", "<50", ">5", "20+", "160 ms" -> qualifier, low, high
+RANGE_PATTERN = (
+    r"^\s*(?P<qual>[~<>≈]?)\s*(?P<low>\d+(?:\.\d+)?)\s*"
+    r"(?:[-–]\s*(?P<high>\d+(?:\.\d+)?))?\s*(?P<plus>\+?)\s*(?:ms)?\s*$"
+)
+
+# ---------------------------
+# SCHEMA
+# ---------------------------
+SCHEMA = {
+    'country': {"kind": "key"},
+    'latitude': {"kind": "number", "min": -90.0, "max": 90.0, "required": True},
+    'longitude': {"kind": "number", "min": -180.0, "max": 180.0, "required": True},
+    # Ordinal factors (levels above; defaults fill missing columns and cells)
+    'ai_inference_readiness': {"kind": "ordinal", "levels": ORDINAL_LEVELS['ai_inference_readiness']},
+    'power_reliability': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['power_reliability'],
+        "default": FOUNDER_DEFAULTS['power_reliability'], "flags": {"power_high_cost": "high cost"},
+    },
+    'ai_compute_availability': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['ai_compute_availability'],
+        "default": FOUNDER_DEFAULTS['ai_compute_availability'],
+    },
+    'cloud_maturity': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['cloud_maturity'], "default": FOUNDER_DEFAULTS['cloud_maturity'],
+    },
+    'ops_friction': {"kind": "ordinal", "levels": ORDINAL_LEVELS['ops_friction'], "default": FOUNDER_DEFAULTS['ops_friction']},
+    'dc_pipeline': {"kind": "ordinal", "levels": ORDINAL_LEVELS['dc_pipeline']},
+    'ai_policy_signal': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['ai_policy_signal'], "default": V2_DEFAULTS['ai_policy_signal'],
+    },
+    'ai_compute_policy_commitment': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['ai_compute_policy_commitment'],
+        "default": V2_DEFAULTS['ai_compute_policy_commitment'],
+    },
+    'cross_border_ai_alignment': {
+        "kind": "ordinal", "levels": ORDINAL_LEVELS['cross_border_ai_alignment'],
+        "default": V2_DEFAULTS['cross_border_ai_alignment'],
+    },
+    # Nominal labels
+    'region': {"kind": "nominal"},
+    'connectivity_role': {"kind": "nominal"},
+    'data_residency_constraint': {"kind": "nominal"},
+    'primary_inference_route': {"kind": "nominal", "default": FOUNDER_DEFAULTS['primary_inference_route']},
+    'ai_data_governance_posture': {"kind": "nominal", "default": V2_DEFAULTS['ai_data_governance_posture']},
+    # Raw text stays for display; parsed bounds land in <into>_low / _high / midpoint
+    'est_rtt_to_europe_ms': {"kind": "range", "into": ("rtt_europe", "_ms")},
+    'active_data_centers': {"kind": "range", "into": ("dc_count", "")},
+    'founder_insight': {"kind": "text", "default": FOUNDER_DEFAULTS['founder_insight']},
+}
+
+ISSUE_COLUMNS = ["row", "column", "value", "problem", "rejected"]
+
+
+def clean_label(value):
+    """Matching form of a label: casefolded, single spaces, plain dashes, tight separators."""
+    text = " ".join(str(value).split()).casefold().replace("–", "-").replace("—", "-")
+    return re.sub(r"\s*([-/])\s*", r"\1", text)
+
+
+# ---------------------------
+# COMPILED SCHEMA
+# ---------------------------
+class Schema:
+    """``SCHEMA``-style rules compiled into per-value lookup tables."""
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.lookups = {}
+        for column, rule in rules.items():
+            if rule["kind"] in ("ordinal", "nominal"):
+                lookup = {clean_label(level): level for level in rule.get("levels", [])}
+                for variant, label in SYNONYMS.get(column, {}).items():
+                    lookup.setdefault(clean_label(variant), label)
+                self.lookups[column] = lookup
+
+    @property
+    def columns(self):
+        return list(self.rules)
+
+    def outputs(self, column):
+        """Extra typed columns a rule adds next to its source column."""
+        rule = self.rules[column]
+        if rule["kind"] == "range":
+            prefix, suffix = rule["into"]
+            return [f"{prefix}_low{suffix}", f"{prefix}_high{suffix}", f"{prefix}{suffix}"]
+        return list(rule.get("flags", {}))
+
+    # ---------------------------
+    # PER-KIND NORMALIZERS
+    # ---------------------------
+    # Each gets the raw column and returns (typed column, extra columns,
+    # [(row mask, problem, reject)]).
+    @staticmethod
+    def _factorize(series):
+        codes, uniques = pd.factorize(series, use_na_sentinel=True)
+        return codes, np.asarray(uniques, dtype=object)
+
+    @staticmethod
+    def _gather(codes, table, missing):
+        # Trailing slot is what the -1 (missing) code indexes into
+        return np.append(np.asarray(table, dtype=object), missing)[codes]
+
+    def _labels(self, column, series, rule):
+        codes, uniques = self._factorize(series)
+        lookup = self.lookups[column]
+        cleaned = [clean_label(v) for v in uniques]
+        missing = np.asarray([c in MISSING_TOKENS for c in cleaned] + [True])
+        known = np.asarray([c in lookup for c in cleaned] + [False])
+        labels = [lookup.get(c, " ".join(str(v).split())) for c, v in zip(cleaned, uniques)]
+        default = rule.get("default", np.nan)
+        values = self._gather(codes, [default if m else l for l, m in zip(labels, missing[:-1])], default)
+
+        problems = []
+        if "levels" in rule:
+            unknown = ~known & ~missing
+            problems.append((unknown[codes], "unknown label", False))
+        levels = rule.get("levels")
+        if levels is None:
+            typed = pd.Series(values, dtype=object, name=column).astype("category")
+        else:
+            seen = pd.unique(values[pd.notna(values)])
+            extra = sorted(str(v) for v in seen if v not in levels)
+            typed = pd.Series(pd.Categorical(values, categories=list(levels) + extra, ordered=True), name=column)
+
+        extras = {}
+        for flag, needle in rule.get("flags", {}).items():
+            per_category = [needle in clean_label(c) for c in typed.cat.categories] + [False]
+            extras[flag] = np.asarray(per_category)[typed.cat.codes.to_numpy()]
+        return typed, extras, problems
+
+    def _number(self, column, series, rule):
+        values = pd.to_numeric(series, errors="coerce").to_numpy(dtype=np.float64)
+        invalid = np.isnan(values) & series.notna().to_numpy()
+        missing = np.isnan(values) & ~invalid
+        low, high = rule.get("min", -np.inf), rule.get("max", np.inf)
+        out_of_range = ~np.isnan(values) & ((values < low) | (values > high))
+        required = rule.get("required", False)
+        problems = [
+            (invalid, "not a number", required),
+            (out_of_range, f"outside [{low:g}, {high:g}]", required),
+        ]
+        if required:
+            problems.append((missing, "missing", True))
+        return pd.Series(values, name=column), {}, problems
+
+    def _key(self, column, series, rule):
+        text = series.astype("str").str.strip()
+        missing = (series.isna() | (text == "")).to_numpy()
+        # One row per key, as multi-source ingestion folds them: the last row wins
+        duplicate = text.duplicated(keep="last").to_numpy() & ~missing
+        return text.rename(column), {}, [(missing, "missing key", True), (duplicate, "duplicate key", True)]
+
+    def _range(self, column, series, rule):
+        codes, uniques = self._factorize(series)
+        parts = pd.Series(uniques, dtype="str").str.extract(RANGE_PATTERN)
+        low = pd.to_numeric(parts["low"], errors="coerce")
+        high = pd.to_numeric(parts["high"], errors="coerce").fillna(low)
+        # "<50" means anywhere up to 50; "20+" / ">20" have no upper bound
+        low = low.mask(parts["qual"].eq("<").fillna(False), 0.0)
+        open_ended = (parts["qual"].eq(">") | parts["plus"].eq("+")).fillna(False)
+        high = high.mask(open_ended, np.inf)
+        mid = ((low + high) / 2).mask(open_ended, low)
+
+        cleaned = [clean_label(v) for v in uniques]
+        unparsed = np.append((low.isna() & ~pd.Series([c in MISSING_TOKENS for c in cleaned])).to_numpy(), False)
+        low_col, high_col, mid_col = self.outputs(column)
+        extras = {
+            name: np.append(values.to_numpy(dtype=np.float32), np.float32("nan"))[codes]
+            for name, values in ((low_col, low), (high_col, high), (mid_col, mid))
+        }
+        return series.rename(column), extras, [(unparsed[codes], "unparsed range", False)]
+
+    def _text(self, column, series, rule):
+        return series.rename(column), {}, []
+
+    # ---------------------------
+    # APPLY
+    # ---------------------------
+    def apply(self, raw):
+        """(typed frame of accepted rows, issues frame) for a raw string frame."""
+        raw = raw.rename(columns=lambda c: str(c).strip())
+        n = len(raw)
+        typed, derived = {}, {}
+        rejected = np.zeros(n, dtype=bool)
+        issues = []
+        handlers = {"key": self._key, "number": self._number, "ordinal": self._labels,
+                    "nominal": self._labels, "range": self._range, "text": self._text}
+
+        for column, rule in self.rules.items():
+            if column in raw.columns:
+                series = raw[column].reset_index(drop=True)
+                if "default" in rule and rule["kind"] not in ("ordinal", "nominal"):
+                    series = series.fillna(rule["default"])
+            elif "default" in rule:
+                series = pd.Series(rule["default"], index=pd.RangeIndex(n), dtype=object)
+            elif rule["kind"] == "range":
+                series = pd.Series(np.nan, index=pd.RangeIndex(n), dtype=object)
+            else:
+                continue
+            values, extras, problems = handlers[rule["kind"]](column, series, rule)
+            typed[column] = values
+            derived.update(extras)
+            for mask, problem, reject in problems:
+                if mask.any():
+                    rows = np.flatnonzero(mask)
+                    issues.append(pd.DataFrame({
+                        "row": rows, "column": column,
+                        "value": series.to_numpy(dtype=object)[rows],
+                        "problem": problem, "rejected": reject,
+                    }))
+                    if reject:
+                        rejected |= mask
+
+        # Source columns (including ones outside the schema, untouched), then
+        # defaulted columns the source lacked, then parsed outputs
+        order = list(raw.columns) + [c for c in typed if c not in raw.columns and "default" in self.rules[c]]
+        frame = pd.DataFrame({
+            **{c: typed[c] if c in typed else raw[c].reset_index(drop=True) for c in order},
+            **derived,
+        })
+        frame = frame.loc[~rejected].reset_index(drop=True)
+        report = pd.concat(issues, ignore_index=True) if issues else pd.DataFrame(columns=ISSUE_COLUMNS)
+        return frame, report.sort_values(["row", "column"], kind="stable", ignore_index=True)
+
+
+DATASET_SCHEMA = Schema(SCHEMA)
+
+
+def summarize(issues):
+    """Counts per (column, problem, rejected)."""
+    if not len(issues):
+        return issues.assign(rows=[])[["column", "problem", "rejected", "rows"]]
+    return issues.groupby(["column", "problem", "rejected"], sort=False).size().rename("rows").reset_index()
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    from readiness.dataset import DATA_PATH
+
+    path = argv[0] if argv else DATA_PATH
+    typed, issues = DATASET_SCHEMA.apply(pd.read_csv(path))
+    rejected = issues.loc[issues["rejected"].astype(bool), "row"].nunique()
+    print(f"{path}: {len(typed)} rows accepted, {rejected} rejected")
+    if len(issues):
+        print(summarize(issues).to_string(index=False))
+        print()
+        print(issues.head(50).to_string(index=False))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""Numeric readiness scoring, independent of the UI.
+
+Each ordinal column is mapped to a factor in [0, 1] once per category,
+gathered through the category codes into an (N, K) matrix, and scored
+against one or many weight vectors with a single matrix product.
+"""
+import numpy as np
+import pandas as pd
+
+from readiness.encoding import lookup_by_code
+
+# ---------------------------
+# FACTOR LEVELS (0 = blocker, 1 = deployment-ready)
+# ---------------------------
+FACTOR_LEVELS = {
+    # Founder signals
+    'power_reliability': {
+        "Low": 0.1, "Low-Medium": 0.3, "Medium": 0.5,
+        "Medium (High Cost)": 0.6, "Medium-High": 0.75, "High": 1.0,
+    },
+    'ai_compute_availability': {"CPU-focused": 0.2, "Limited GPU": 0.55, "GPU available": 1.0},
+    'cloud_maturity': {"PoP": 0.3, "Local Zone": 0.65, "Region": 1.0},
+    # Friction is inverted: low friction scores high
+    'ops_friction': {"High": 0.1, "Medium": 0.5, "Low": 1.0},
+    'data_residency_constraint': {"Yes": 0.3, "Unclear": 0.5, "No / Sector-specific": 1.0},
+    # Policy signals
+    'ai_policy_signal': {"Unclear": 0.2, "Emerging": 0.5, "Strong": 1.0},
+    'ai_data_governance_posture': {"Restricted": 0.3, "Unclear": 0.5, "Flexible": 1.0},
+    'ai_compute_policy_commitment': {"Absent": 0.1, "Implied": 0.5, "Explicit": 1.0},
+    'cross_border_ai_alignment': {"Unclear": 0.3, "Conditional": 0.6, "Supported": 1.0},
+}
+
+# "Unclear" and unlisted labels land here rather than at zero
+UNKNOWN_FACTOR = 0.3
+
+FACTORS = list(FACTOR_LEVELS)
+
+# Power + compute dominate, matching the "Readiness Status" definition
+DEFAULT_WEIGHTS = {
+    'power_reliability': 0.25,
+    'ai_compute_availability': 0.25,
+    'cloud_maturity': 0.15,
+    'ops_friction': 0.10,
+    'data_residency_constraint': 0.05,
+    'ai_policy_signal': 0.10,
+    'ai_data_governance_posture': 0.04,
+    'ai_compute_policy_commitment': 0.03,
+    'cross_border_ai_alignment': 0.03,
+}
+
+# Score (0-100) -> readiness label, lowest band first
+READINESS_BANDS = [
+    (0, "Emerging (Early)"),
+    (45, "Emerging"),
+    (70, "Viable"),
+]
+
+
+def factor_column(series, levels):
+    return lookup_by_code(series, levels, UNKNOWN_FACTOR, np.float32)
+
+
+def factor_matrix(df, factors=None):
+    """(N, K) float32 matrix of factor values, one column per factor.
+
+    Factors whose column is missing from ``df`` score UNKNOWN_FACTOR.
+    """
+    factors = FACTORS if factors is None else list(factors)
+    out = np.full((len(df), len(factors)), UNKNOWN_FACTOR, dtype=np.float32)
+    for j, col in enumerate(factors):
+        if col in df.columns:
+            out[:, j] = factor_column(df[col], FACTOR_LEVELS[col])
+    return out
+
+
+def weight_matrix(scenarios, factors=None):
+    """(K, S) matrix of normalized weights, one column per scenario."""
+    factors = FACTORS if factors is None else list(factors)
+    out = np.zeros((len(factors), len(scenarios)), dtype=np.float32)
+    position = {col: j for j, col in enumerate(factors)}
+    for s, weights in enumerate(scenarios):
+        for col, w in weights.items():
+            if col not in position:
+                raise ValueError(f"Unknown scoring factor: {col!r}")
+            out[position[col], s] = w
+    totals = out.sum(axis=0)
+    if np.any(totals <= 0):
+        raise ValueError("Each weight scenario needs a positive total weight")
+    return out / totals
+
+
+def score(df, weights=None):
+    """Readiness score (0-100) per row for a single weight scenario."""
+    weights = DEFAULT_WEIGHTS if weights is None else weights
+    scores = factor_matrix(df) @ weight_matrix([weights])
+    return pd.Series(scores[:, 0] * 100, index=df.index, name="readiness_score")
+
+
+def score_scenarios(df, scenarios, factors=None):
+    """Score every row under many weight scenarios in one matrix product.
+
+    ``scenarios`` is a dict of name -> weights (or a list of weights).
+    Returns an (N, S) DataFrame with one column per scenario.
+    """
+    if isinstance(scenarios, dict):
+        names, weights = list(scenarios), list(scenarios.values())
+    else:
+        names, weights = list(range(len(scenarios))), list(scenarios)
+    scores = factor_matrix(df, factors) @ weight_matrix(weights, factors)
+    return pd.DataFrame(scores * 100, index=df.index, columns=names)
+
+
+def classify(scores, bands=None):
+    """Map scores onto readiness labels as an ordered Categorical."""
+    bands = READINESS_BANDS if bands is None else bands
+    edges = np.asarray([edge for edge, _ in bands[1:]], dtype=np.float32)
+    labels = [label for _, label in bands]
+    codes = np.digitize(np.asarray(scores, dtype=np.float32), edges)
+    return pd.Categorical.from_codes(codes, categories=labels, ordered=True)
@@ -0,0 +1,192 @@
+"""Process-wide dataset store shared by every session.
+
+Values are handed out by reference (no per-session copies), so callers
+must treat them as read-only. Entries are keyed by dataset version and
+evicted least-recently-used once the estimated memory ceiling is
+exceeded; the most recent entry is always kept so there is something to
+serve.
+"""
+import os
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_MAX_MB = int(os.environ.get("READINESS_CACHE_MAX_MB", "512"))
+DEFAULT_MAX_VERSIONS = int(os.environ.get("READINESS_CACHE_MAX_VERSIONS", "4"))
+
+
+def estimate_bytes(value):
+    """Rough deep size of frames, arrays and containers of them."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        usage = value.memory_usage(deep=True)
+        return int(usage.sum() if isinstance(usage, pd.Series) else usage)
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (list, tuple)):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(estimate_bytes(v) for v in value.values())
+    if hasattr(value, "__dict__"):
+        return sys.getsizeof(value) + estimate_bytes(vars(value))
+    return sys.getsizeof(value)
+
+
+class _Entry:
+    def __init__(self, value):
+        self.value = value
+        self.derived = {}
+        self.nbytes = estimate_bytes(value)
+
+
+class DatasetStore:
+    """LRU store of dataset versions plus their derived artifacts."""
+
+    def __init__(self, loader, max_bytes=DEFAULT_MAX_MB * 1024 * 1024, max_versions=DEFAULT_MAX_VERSIONS,
+                 on_evict=None):
+        self.loader = loader
+        # Called as on_evict(version, derived) when a version leaves the store,
+        # e.g. to delete files its artifacts published
+        self.on_evict = on_evict
+        self.max_bytes = max_bytes
+        self.max_versions = max_versions
+        self._entries = OrderedDict()
+        # Guards the entries and counters only; builds run under per-version locks
+        self._lock = threading.RLock()
+        self._build_locks = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # ---------------------------
+    # LOOKUPS
+    # ---------------------------
+    def _build_lock(self, version):
+        """Lock serializing loads and artifact builds of one version.
+
+        Re-entrant, since builders look up other artifacts of the same version.
+        """
+        with self._lock:
+            return self._build_locks.setdefault(version, threading.RLock())
+
+    def _entry(self, version, count=True):
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is not None:
+                self._entries.move_to_end(version)
+                self.hits += count
+                return entry
+            self.misses += count
+        # Concurrent sessions share one load; other versions stay servable meanwhile
+        with self._build_lock(version):
+            with self._lock:
+                entry = self._entries.get(version)
+                if entry is not None:
+                    self._entries.move_to_end(version)
+                    return entry
+            entry = _Entry(self.loader(version))
+            with self._lock:
+                self._entries[version] = entry
+                self._evict()
+            return entry
+
+    def get(self, version):
+        """Shared (read-only) value for ``version``, loading it on a miss."""
+        return self._entry(version).value
+
+    def derived(self, version, name, builder):
+        """Artifact computed once per version by ``builder(value)``.
+
+        Derived artifacts live and die with their dataset version.
+        """
+        entry = self._entry(version, count=False)
+        with self._lock:
+            if name in entry.derived:
+                self.hits += 1
+                return entry.derived[name]
+        with self._build_lock(version):
+            with self._lock:
+                if name in entry.derived:
+                    self.hits += 1
+                    return entry.derived[name]
+                self.misses += 1
+            result = builder(entry.value)
+            nbytes = estimate_bytes(result)
+            with self._lock:
+                entry.derived[name] = result
+                entry.nbytes += nbytes
+                self._evict()
+            return result
+
+    def peek(self, version):
+        """(value, derived) if cached, without touching LRU order or counters."""
+        with self._lock:
+            entry = self._entries.get(version)
+            if entry is None:
+                return None
+            return entry.value, dict(entry.derived)
+
+    def put(self, version, value, derived=None):
+        """Insert a prepared version (e.g. an incrementally patched one)."""
+        with self._lock:
+            entry = _Entry(value)
+            for name, result in (derived or {}).items():
+                entry.derived[name] = result
+                entry.nbytes += estimate_bytes(result)
+            self._entries[version] = entry
+            self._entries.move_to_end(version)
+            self._evict()
+
+    # ---------------------------
+    # EVICTION
+    # ---------------------------
+    def _evict(self):
+        while len(self._entries) > 1 and (
+            len(self._entries) > self.max_versions or self.nbytes > self.max_bytes
+        ):
+            version, entry = self._entries.popitem(last=False)
+            self.evictions += 1
+            self._evicted(version, entry)
+
+    def _evicted(self, version, entry):
+        self._build_locks.pop(version, None)
+        if self.on_evict is not None:
+            self.on_evict(version, entry.derived)
+
+    def evict(self, version=None):
+        """Drop one version (or everything when ``version`` is None)."""
+        with self._lock:
+            if version is None:
+                self.evictions += len(self._entries)
+                dropped = list(self._entries.items())
+                self._entries.clear()
+            else:
+                entry = self._entries.pop(version, None)
+                dropped = [] if entry is None else [(version, entry)]
+                self.evictions += len(dropped)
+            for dropped_version, entry in dropped:
+                self._evicted(dropped_version, entry)
+
+    @property
+    def nbytes(self):
+        return sum(e.nbytes for e in self._entries.values())
+
+    def __contains__(self, version):
+        return version in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "versions": list(self._entries),
+                "entries": len(self._entries),
+                "bytes": self.nbytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
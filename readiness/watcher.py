@@ -0,0 +1,215 @@
+"""Hot reload: watch the CSV and patch the loaded dataset incrementally.
+
+The CSV is re-parsed when its mtime changes, diffed against the frame in
+the store by ``country`` and only the added/edited rows get their derived
+columns recomputed. Derived artifacts that the app keeps in the store
+("aggregates", "routing_engine", "route_paths", "latency_model") are
+patched or reused where possible; anything else is rebuilt lazily.
+"""
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from readiness.aggregates import update_aggregates
+from readiness.dataset import (
+    DATA_PATH,
+    DERIVED_COLUMNS,
+    CountryIndex,
+    add_render_columns,
+)
+from readiness.hubs import hub_frame
+from readiness.ingest import merged_version, parse_merged
+
+DEFAULT_INTERVAL = float(os.environ.get("READINESS_WATCH_INTERVAL", "2"))
+
+
+# ---------------------------
+# ROW DIFF
+# ---------------------------
+class FrameDiff:
+    """Keys added/removed/changed between two frames, plus their positions."""
+
+    def __init__(self, added, removed, changed, new_rows, old_rows, same_order):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        # Positions (new frame) of added + changed rows
+        self.new_rows = new_rows
+        # Positions (old frame) of removed + changed rows
+        self.old_rows = old_rows
+        self.same_order = same_order
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        return {"added": self.added, "removed": self.removed, "changed": self.changed}
+
+
+def source_columns(df):
+    return [c for c in df.columns if c not in DERIVED_COLUMNS]
+
+
+def diff_frames(old, new, key="country"):
+    """Row diff by ``key``; None when the frames can't be diffed (full rebuild)."""
+    columns = source_columns(new)
+    if source_columns(old) != columns or not len(old):
+        return None
+    old_keys = pd.Index(old[key].to_numpy(dtype=object))
+    new_keys = pd.Index(new[key].to_numpy(dtype=object))
+    if not old_keys.is_unique or not new_keys.is_unique:
+        return None
+
+    common = new_keys.intersection(old_keys, sort=False)
+    old_at = old_keys.get_indexer(common)
+    new_at = new_keys.get_indexer(common)
+    changed = np.zeros(len(common), dtype=bool)
+    for col in columns:
+        a = old[col].to_numpy(dtype=object)[old_at]
+        b = new[col].to_numpy(dtype=object)[new_at]
+        changed |= ~((a == b) | (pd.isna(a) & pd.isna(b)))
+
+    added = new_keys.difference(old_keys, sort=False)
+    removed = old_keys.difference(new_keys, sort=False)
+    changed = common[changed]
+    return FrameDiff(
+        added=added.tolist(),
+        removed=removed.tolist(),
+        changed=changed.tolist(),
+        new_rows=np.sort(new_keys.get_indexer(added.append(changed))),
+        old_rows=np.sort(old_keys.get_indexer(removed.append(changed))),
+        same_order=old_keys.equals(new_keys),
+    )
+
+
+def apply_diff(old, new, diff, key="country"):
+    """Carry old derived columns over by key; recompute only diff.new_rows."""
+    take = pd.Index(old[key].to_numpy(dtype=object)).get_indexer(new[key].to_numpy(dtype=object))
+    # Added rows point at row 0 here and are overwritten just below
+    take = np.clip(take, 0, None)
+    for col in DERIVED_COLUMNS:
+        new[col] = old[col].to_numpy()[take]
+    return add_render_columns(new, rows=diff.new_rows)
+
+
+# ---------------------------
+# DERIVED ARTIFACTS
+# ---------------------------
+def patch_artifacts(old_df, old_derived, new_df, diff):
+    """Reuse or patch the store's derived artifacts for the new frame."""
+    derived = {}
+    if "aggregates" in old_derived:
+        derived["aggregates"] = update_aggregates(
+            old_derived["aggregates"], old_df.iloc[diff.old_rows], new_df.iloc[diff.new_rows]
+        )
+
+    # Routing only depends on the hub set
+    hubs_unchanged = hub_frame(old_df).equals(hub_frame(new_df))
+    engine = old_derived.get("routing_engine")
+    if engine is not None and hubs_unchanged:
+        derived["routing_engine"] = engine
+        old_paths = old_derived.get("route_paths")
+        if old_paths is not None:
+            stale = set(diff.removed) | set(diff.changed)
+            kept = old_paths[~old_paths["country"].isin(stale)]
+            fresh = engine.paths(new_df.iloc[diff.new_rows])
+            paths = pd.concat([kept, fresh], ignore_index=True)
+            # Same row order as a full build
+            order = pd.Index(new_df["country"].to_numpy(dtype=object)).get_indexer(paths["country"])
+            derived["route_paths"] = paths.iloc[np.argsort(order, kind="stable")].reset_index(drop=True)
+
+    # The RTT matrix only depends on site coordinates and hubs
+    latency = old_derived.get("latency_model")
+    if latency is not None and hubs_unchanged and diff.same_order and not diff.added and not diff.removed:
+        coords = ["latitude", "longitude"]
+        if np.array_equal(old_df[coords].to_numpy(), new_df[coords].to_numpy()):
+            derived["latency_model"] = latency
+    return derived
+
+
+# ---------------------------
+# WATCHER
+# ---------------------------
+class DatasetWatcher:
+    """Polls the CSV mtime and publishes new versions into a DatasetStore.
+
+    Sessions read ``watcher.version`` on every rerun; the new version is
+    only published once its (patched) frame is already in the store.
+    """
+
+    def __init__(self, store, path=DATA_PATH, interval=DEFAULT_INTERVAL, sources_dir=None):
+        self.store = store
+        self.path = path
+        # Optional directory of extra source CSVs merged in (see readiness/ingest.py)
+        self.sources_dir = sources_dir
+        self.interval = interval
+        self.version = merged_version(path, sources_dir)
+        self.reloads = 0
+        self.full_rebuilds = 0
+        self.last_diff = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def poll(self):
+        """Check the CSV once; returns True when a new version was published."""
+        version = merged_version(self.path, self.sources_dir)
+        if version == self.version:
+            return False
+        with self._lock:
+            if version == self.version:
+                return False
+            self._reload(version)
+            return True
+
+    def _reload(self, version):
+        previous = self.store.peek(self.version)
+        if previous is None or previous[0][0] is None or version is None:
+            # Nothing loaded yet (or the file vanished): let the store load lazily
+            self.version = version
+            return
+
+        (old_df, old_index), old_derived = previous
+        try:
+            new_df = parse_merged(self.path, self.sources_dir)
+        except FileNotFoundError:
+            self.version = None
+            return
+
+        diff = diff_frames(old_df, new_df)
+        if diff is None:
+            new_df = add_render_columns(new_df)
+            index, derived = CountryIndex(new_df), {}
+            self.full_rebuilds += 1
+        else:
+            new_df = apply_diff(old_df, new_df, diff)
+            reuse_index = diff.same_order and not diff.added and not diff.removed
+            index = old_index if reuse_index else CountryIndex(new_df)
+            derived = patch_artifacts(old_df, old_derived, new_df, diff)
+        self.store.put(version, (new_df, index), derived)
+        self.last_diff = diff
+        self.reloads += 1
+        self.version = version
+
+    # ---------------------------
+    # BACKGROUND POLLING
+    # ---------------------------
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.poll()
+            except Exception:
+                # A half-written CSV must not kill the watcher; retry next tick
+                continue
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="dataset-watcher", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
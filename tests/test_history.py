@@ -0,0 +1,98 @@
+"""History: as-of lookups, diffs and raw (string) row round-trips."""
+import pandas as pd
+import pandas.testing as pdt
+import pytest
+
+from readiness.dataset import DATA_PATH, load_dataset
+from readiness.history import History, read_raw
+
+
+@pytest.fixture
+def raw(tmp_path):
+    return read_raw(DATA_PATH, sources_dir=str(tmp_path / "no-sources"))
+
+
+def by_country(frame):
+    return frame.sort_values("country", ignore_index=True)
+
+
+def record_three(history, raw):
+    """2025-01-01 bundled, 2025-02-01 Ghana edited + Rwanda removed, 2025-03-01 Rwanda back."""
+    history.record(raw, "2025-01-01", "v0")
+    edited = raw[raw["country"] != "Rwanda"].copy()
+    edited.loc[edited["country"] == "Ghana", "power_reliability"] = "High"
+    history.record(edited, "2025-02-01")
+    history.record(raw, "2025-03-01")
+    return edited
+
+
+def test_as_of_round_trip(tmp_path, raw):
+    # Checkpoint every other snapshot so both replay paths are exercised
+    history = History(str(tmp_path / "history"), checkpoint_every=2)
+    edited = record_three(history, raw)
+
+    assert [e["seq"] for e in history.log()] == [0, 1, 2]
+    assert history.resolve("2025-01-15") == 0
+    assert history.resolve("2025-02-01") == 1
+    assert history.resolve("latest") == 2
+    with pytest.raises(LookupError):
+        history.resolve("2024-12-31")
+
+    pdt.assert_frame_equal(by_country(history.raw_frame("2025-01-31")), by_country(raw), check_dtype=False)
+    pdt.assert_frame_equal(by_country(history.raw_frame(1)), by_country(edited), check_dtype=False)
+    pdt.assert_frame_equal(by_country(history.raw_frame("latest")), by_country(raw), check_dtype=False)
+
+    # A fresh reader over the same directory sees the same snapshots
+    reread = History(str(tmp_path / "history"), checkpoint_every=2).refresh()
+    pdt.assert_frame_equal(by_country(reread.raw_frame(1)), by_country(edited), check_dtype=False)
+
+    # Typed snapshot frames load like the app's
+    expected = load_dataset(use_cache=False)
+    assert sorted(history.frame(0)["country"]) == sorted(expected["country"])
+    assert history.frame(0)["readiness_score"].sum() == pytest.approx(expected["readiness_score"].sum())
+
+
+def test_diff_round_trip(tmp_path, raw):
+    history = History(str(tmp_path / "history"))
+    record_three(history, raw)
+    old_power = raw.loc[raw["country"] == "Ghana", "power_reliability"].iloc[0]
+
+    forward = history.diff("2025-01-01", "2025-02-01")
+    assert forward["from"] == "2025-01-01" and forward["to"] == "2025-02-01"
+    assert forward["removed"] == ["Rwanda"] and forward["added"] == []
+    assert forward["changed"] == [{"country": "Ghana", "columns": {"power_reliability": [old_power, "High"]}}]
+
+    back = history.diff(1, 2)
+    assert back["added"] == ["Rwanda"]
+    assert back["changed"] == [{"country": "Ghana", "columns": {"power_reliability": ["High", old_power]}}]
+
+    # The round trip nets out
+    assert history.diff(0, 2) == {"from": "2025-01-01", "to": "2025-03-01", "added": [], "removed": [], "changed": []}
+
+
+def test_unchanged_and_out_of_order_records(tmp_path, raw):
+    history = History(str(tmp_path / "history"))
+    first = history.record(raw, "2025-01-01")
+    assert history.record(raw, "2025-02-01") == first
+    assert len(history) == 1
+    with pytest.raises(ValueError):
+        history.record(raw, "2024-06-01")
+
+
+def test_read_raw_keeps_missing_cells_missing(tmp_path):
+    source = pd.read_csv(DATA_PATH, dtype=str)
+    source.loc[source["country"] == "Kenya", ["ops_friction", "founder_insight"]] = None
+    path = tmp_path / "gaps.csv"
+    source.to_csv(path, index=False)
+
+    raw = read_raw(str(path), sources_dir=str(tmp_path / "no-sources"))
+    kenya = raw[raw["country"] == "Kenya"].iloc[0]
+    assert pd.isna(kenya["ops_friction"]) and pd.isna(kenya["founder_insight"])
+    assert not (raw == "None").any().any() and not (raw == "nan").any().any()
+
+    # ... and survives a snapshot round trip, so the schema default applies later
+    history = History(str(tmp_path / "history"))
+    history.record(raw, "2025-01-01")
+    stored = history.raw_frame(0).set_index("country")
+    assert pd.isna(stored.loc["Kenya", "ops_friction"])
+    assert history.frame(0).set_index("country").loc["Kenya", "ops_friction"] == "Unclear"
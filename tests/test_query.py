@@ -0,0 +1,70 @@
+"""QueryService: rejected specs and response-cache invalidation."""
+import pytest
+
+from readiness import runtime
+from readiness.dataset import DATA_PATH, CountryIndex, load_dataset
+from readiness.history import History, read_raw
+from readiness.query import QueryError, QueryService
+from readiness.store import DatasetStore
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_dataset(use_cache=False)
+
+
+@pytest.fixture
+def service(df, tmp_path, monkeypatch):
+    # An empty history of our own, so snapshot ops never touch data/history
+    monkeypatch.setattr(runtime, "_history", History(str(tmp_path / "history")))
+    store = DatasetStore(lambda version: (df, CountryIndex(df)))
+    return QueryService(store, lambda: "v1")
+
+
+@pytest.mark.parametrize("query, message", [
+    ({"columns": ["country", "nope"]}, "Unknown column: 'nope'"),
+    ({"columns": 5}, "'columns' must be a string or a list of strings"),
+    ({"sort": "-nope"}, "Unknown sort column: 'nope'"),
+    ({"where": {"nope": 1}}, "Unknown column: 'nope'"),
+    ({"where": ["region"]}, "'where' must be an object"),
+    ({"where": {"region": {"~=": "East"}}}, "Unknown comparison: '~='"),
+    ({"where": {"region": {"in": "East Africa"}}}, "'in' on 'region' needs a list"),
+    ({"where": {"latitude": {">": [1]}}}, "'>' on 'latitude' needs a single value"),
+    ({"limit": -1}, "'limit' must be >= 0"),
+    ({"limit": "ten"}, "'limit' must be an integer"),
+    ({"limit": True}, "'limit' must be an integer"),
+    ({"offset": 2.5}, "'offset' must be an integer"),
+    ({"op": "route", "countries": ["Kenya"], "k": 0}, "'k' must be between"),
+    ({"max_hub_ms": "80"}, "'max_hub_ms' must be a number"),
+    ({"op": "rank", "weights": ["power_reliability"]}, "'weights' must be an object"),
+    ({"op": "drop"}, "Unknown op: 'drop'"),
+])
+def test_invalid_queries_raise_query_error(service, query, message):
+    with pytest.raises(QueryError, match=message.replace("(", r"\(")):
+        service.run(query)
+
+
+def test_valid_filter(service):
+    response = service.run({"where": {"region": "East Africa"}, "sort": "country", "limit": 1})
+    assert response["total"] == 2
+    assert [row["country"] for row in response["rows"]] == ["Kenya"]
+
+
+def test_batch_reports_errors_per_item(service):
+    out = service.run_batch([{"limit": 1}, {"limit": "x"}])
+    assert len(out[0]["rows"]) == 1
+    assert out[1] == {"error": "'limit' must be an integer"}
+
+
+def test_cache_invalidated_when_history_grows(service):
+    query = {"op": "snapshots"}
+    first = service.run(query)
+    assert first["snapshots"] == []
+    assert service.run(query) is first
+
+    runtime.shared_history().record(read_raw(DATA_PATH, sources_dir=None), "2025-01-01")
+    second = service.run(query)
+    assert second is not first
+    assert [s["as_of"] for s in second["snapshots"]] == ["2025-01-01"]
+    # Snapshot refs resolve against the new entry too
+    assert service.snapshot("2025-01-01") == service.snapshot(second["snapshots"][0]["seq"])
@@ -0,0 +1,76 @@
+"""Hub routing: every tethered market gets a path; k-nearest order matches haversine."""
+import numpy as np
+import pytest
+
+from readiness.dataset import load_dataset
+from readiness.hubs import hub_frame
+from readiness.latency import haversine_km
+from readiness.routing import HubIndex, RoutingEngine
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_dataset(use_cache=False)
+
+
+@pytest.fixture(scope="module")
+def engine(df):
+    return RoutingEngine(hub_frame(df))
+
+
+def test_east_africa_routes_are_not_dropped(df, engine):
+    # The old REGIONAL_HUBS table was keyed "East" and silently skipped these rows
+    targets = engine.route_targets(df).set_index("country")
+    east = df.loc[df["region"] == "East Africa", "country"]
+    assert set(east) == {"Kenya", "Rwanda"}
+    rwanda = targets.loc["Rwanda"]
+    assert rwanda["route"] == "Regional-Tethered"
+    assert rwanda["hub"] == "Kenya"
+    site, hub = (df.set_index("country").loc[c, ["latitude", "longitude"]] for c in ("Rwanda", "Kenya"))
+    assert rwanda["distance_km"] == pytest.approx(haversine_km(*site, *hub))
+    assert "Rwanda" in set(engine.paths(df)["country"])
+
+
+def test_every_routed_row_has_a_path(df, engine):
+    targets = engine.route_targets(df)
+    remote = targets["route"].isin(["Regional-Tethered", "Hybrid-Edge"])
+    assert targets.loc[remote, "hub"].notna().all()
+    assert targets.loc[~remote, "hub"].isna().all()
+    paths = engine.paths(df)
+    assert list(paths["country"]) == list(targets.loc[remote, "country"])
+    # Regional routes never point a market at itself
+    assert not (targets["hub"] == targets["country"]).any()
+
+
+def brute_force(hubs, lat, lon, k):
+    km = haversine_km(np.asarray(lat)[:, None], np.asarray(lon)[:, None], hubs["lat"].to_numpy()[None, :],
+                      hubs["lon"].to_numpy()[None, :])
+    idx = np.argsort(km, axis=1, kind="stable")[:, :k]
+    return np.take_along_axis(km, idx, axis=1), idx
+
+
+@pytest.mark.parametrize("k", [1, 3, 8])
+def test_k_nearest_matches_brute_force(df, k):
+    hubs = hub_frame(df)
+    rng = np.random.default_rng(7)
+    lat, lon = rng.uniform(-40, 40, 500), rng.uniform(-25, 60, 500)
+    dist, idx = HubIndex(hubs).query(lat, lon, k)
+    expected_dist, expected_idx = brute_force(hubs, lat, lon, k)
+    np.testing.assert_allclose(dist, expected_dist, rtol=1e-9, atol=1e-6)
+    np.testing.assert_array_equal(idx, expected_idx)
+    assert (np.diff(dist, axis=1) >= 0).all()
+
+
+def test_assign_excludes_own_hub(df, engine):
+    assigned = engine.assign(df, k=2).set_index("country")
+    for country in ["Kenya", "Egypt"]:
+        assert country not in set(assigned.loc[country, ["hub_1", "hub_2"]])
+    kenya = assigned.loc["Kenya"]
+    assert kenya["hub_1_km"] <= kenya["hub_2_km"]
+
+
+def test_k_larger_than_hub_count_pads(df):
+    engine = RoutingEngine(hub_frame(df.head(2), offshore=False))
+    dist, idx = engine.nearest(df, k=3)
+    assert dist.shape == idx.shape == (7, 3)
+    assert (idx[:, 2] == -1).all() and np.isnan(dist[:, 2]).all()
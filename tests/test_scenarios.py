@@ -0,0 +1,102 @@
+"""ScenarioEngine against a brute-force recompute on the bundled CSV."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from readiness.aggregates import metric_flags
+from readiness.dataset import load_dataset
+from readiness.hubs import hub_frame
+from readiness.routing import RoutingEngine
+from readiness.scenarios import ALL_ROWS, METRIC_LABELS, ScenarioEngine, step_labels
+from readiness.scoring import score
+
+
+@pytest.fixture(scope="module")
+def df():
+    return load_dataset(use_cache=False)
+
+
+def scenarios_for(df):
+    countries = df["country"].tolist()
+    scenarios = {
+        f"{c} gets local GPUs": {c: {"ai_compute_availability": "GPU available", "primary_inference_route": "Local-Native"}}
+        for c in countries
+    }
+    scenarios.update({f"{c} loses GPUs": {c: {"ai_compute_availability": "CPU-focused"}} for c in countries})
+    scenarios.update({
+        "Power +1 everywhere": {ALL_ROWS: {"power_reliability": "+1"}},
+        "Ops friction -1 everywhere": {ALL_ROWS: {"ops_friction": "-1"}},
+        "Strong policy everywhere": {ALL_ROWS: {"ai_policy_signal": "Strong"}},
+        "Everyone regional": {ALL_ROWS: {"primary_inference_route": "Regional-Tethered"}},
+        "Overlapping overrides": {
+            ALL_ROWS: {"cloud_maturity": "Region", "power_reliability": "+2"},
+            countries[0]: {"cloud_maturity": "None", "ai_inference_readiness": "Viable"},
+        },
+    })
+    return scenarios
+
+
+def patched_frame(df, overrides):
+    """Full copy of ``df`` with every override applied in order."""
+    out = df.copy()
+    for key, columns in overrides.items():
+        rows = np.arange(len(df)) if key == ALL_ROWS else np.flatnonzero(df["country"].to_numpy() == key)
+        for column, value in columns.items():
+            values = out[column].to_numpy(dtype=object, copy=True)
+            if value[:1] in "+-" and value[1:].isdigit():
+                values[rows] = step_labels(values[rows], column, int(value))
+            else:
+                values[rows] = value
+            out[column] = pd.Series(values, index=out.index).astype("category")
+    return out
+
+
+def route_table(frame):
+    return RoutingEngine(hub_frame(frame)).route_targets(frame)
+
+
+def same(a, b):
+    a, b = np.asarray(a, dtype=object), np.asarray(b, dtype=object)
+    return (a == b) | (pd.isna(a) & pd.isna(b))
+
+
+def test_scores_match_full_recompute(df):
+    scenarios = scenarios_for(df)
+    result = ScenarioEngine(df).evaluate(scenarios)
+    base = score(df).to_numpy()
+    for name, overrides in scenarios.items():
+        full = score(patched_frame(df, overrides)).to_numpy()
+        mine = result["scores"][result["scores"]["scenario"] == name].set_index("country")
+        expected = pd.Series(full, index=df["country"])
+        np.testing.assert_allclose(mine["score"].to_numpy(), expected[mine.index].to_numpy(), atol=1e-3, err_msg=name)
+        # Rows the engine leaves out are unchanged
+        untouched = ~df["country"].isin(mine.index).to_numpy()
+        np.testing.assert_allclose(full[untouched], base[untouched], atol=1e-3, err_msg=name)
+
+
+def test_routes_match_full_recompute(df):
+    scenarios = scenarios_for(df)
+    result = ScenarioEngine(df).evaluate(scenarios)
+    before = route_table(df)
+    for name, overrides in scenarios.items():
+        after = route_table(patched_frame(df, overrides))
+        moved = ~(same(before["hub"], after["hub"]) & same(before["route"], after["route"]))
+        expected = after[moved].set_index("country")
+        routes = result["routes"][result["routes"]["scenario"] == name].set_index("country")
+        assert sorted(routes.index) == sorted(expected.index), name
+        for column in ("route", "hub"):
+            assert same(routes.loc[expected.index, column], expected[column]).all(), (name, column)
+        np.testing.assert_allclose(
+            routes.loc[expected.index, "rtt_ms"].to_numpy(dtype=float),
+            expected["rtt_ms"].to_numpy(dtype=float), err_msg=name,
+        )
+
+
+def test_summary_metrics_match_full_recompute(df):
+    scenarios = scenarios_for(df)
+    summary = ScenarioEngine(df).evaluate(scenarios)["summary"].set_index("scenario")
+    before = metric_flags(df).sum()
+    for name, overrides in scenarios.items():
+        delta = metric_flags(patched_frame(df, overrides)).sum() - before
+        for key, label in METRIC_LABELS.items():
+            assert summary.loc[name, label] == int(delta.get(key, 0)), (name, label)
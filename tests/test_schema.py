@@ -0,0 +1,92 @@
+"""Compiled schema: value parsing, synonyms and rejected-row reporting."""
+import numpy as np
+import pandas as pd
+import pytest
+
+from readiness.schema import DATASET_SCHEMA, summarize
+
+
+def frame(**columns):
+    """Raw string frame with valid keys and coordinates unless overridden."""
+    n = len(next(iter(columns.values())))
+    raw = {"country": [f"C{i}" for i in range(n)], "latitude": ["1.0"] * n, "longitude": ["2.0"] * n}
+    raw.update(columns)
+    return pd.DataFrame(raw, dtype=object)
+
+
+@pytest.mark.parametrize("text, low, high, mid", [
+    ("~160", 160, 160, 160),
+    ("15-25", 15, 25, 20),
+    ("15 – 25", 15, 25, 20),
+    ("<50", 0, 50, 25),
+    ("20+", 20, np.inf, 20),
+    ("160 ms", 160, 160, 160),
+])
+def test_range_parsing(text, low, high, mid):
+    typed, issues = DATASET_SCHEMA.apply(frame(est_rtt_to_europe_ms=[text]))
+    row = typed.iloc[0]
+    assert (row["rtt_europe_low_ms"], row["rtt_europe_high_ms"], row["rtt_europe_ms"]) == (low, high, mid)
+    assert row["est_rtt_to_europe_ms"] == text
+    assert issues.empty
+
+
+def test_unparsed_range_is_kept_and_reported():
+    typed, issues = DATASET_SCHEMA.apply(frame(active_data_centers=["lots", "n/a"]))
+    assert len(typed) == 2
+    assert typed["dc_count"].isna().all()
+    assert issues[["row", "problem", "rejected"]].values.tolist() == [[0, "unparsed range", False]]
+
+
+def test_high_cost_label_and_flag():
+    typed, _ = DATASET_SCHEMA.apply(frame(power_reliability=["Medium (High Cost)", "medium-high  cost", "High"]))
+    assert list(typed["power_reliability"]) == ["Medium (High Cost)", "Medium (High Cost)", "High"]
+    assert list(typed["power_high_cost"]) == [True, True, False]
+
+
+@pytest.mark.parametrize("column, variant, label", [
+    ("ai_compute_availability", "GPU", "GPU available"),
+    ("ai_compute_availability", "cpu only", "CPU-focused"),
+    ("ai_compute_availability", " Limited  GPUs ", "Limited GPU"),
+    ("ai_inference_readiness", "Emerging  early", "Emerging (Early)"),
+    ("cloud_maturity", "Point of Presence", "PoP"),
+    ("primary_inference_route", "regional", "Regional-Tethered"),
+    ("data_residency_constraint", "Sector specific", "No / Sector-specific"),
+])
+def test_synonyms(column, variant, label):
+    typed, issues = DATASET_SCHEMA.apply(frame(**{column: [variant]}))
+    assert typed[column].iloc[0] == label
+    assert issues.empty
+
+
+def test_ordinal_levels_and_unknown_labels():
+    typed, issues = DATASET_SCHEMA.apply(frame(ops_friction=["High", "Low", "Extreme"]))
+    col = typed["ops_friction"]
+    assert col.cat.ordered and col.cat.codes.iloc[0] > col.cat.codes.iloc[1]
+    # Unknown labels are kept after the known levels and reported, not rejected
+    assert col.cat.categories[-1] == "Extreme"
+    assert issues[["row", "problem", "rejected"]].values.tolist() == [[2, "unknown label", False]]
+
+
+def test_missing_cells_take_defaults():
+    typed, issues = DATASET_SCHEMA.apply(frame(ai_compute_availability=["tbd", np.nan]))
+    assert list(typed["ai_compute_availability"]) == ["Unclear", "Unclear"]
+    # Columns absent from the source are filled too
+    assert set(typed["ai_policy_signal"]) == {"Unclear"}
+    assert issues.empty
+
+
+def test_rejected_rows_are_reported():
+    raw = frame(country=["Kenya", "", "Ghana", "Nigeria", "Ghana"], latitude=["1", "2", "north", "95", "3"])
+    typed, issues = DATASET_SCHEMA.apply(raw)
+    # Empty key, bad latitude, out-of-range latitude, and the first of two Ghana rows
+    assert list(typed["country"]) == ["Kenya", "Ghana"]
+    assert typed["latitude"].tolist() == [1.0, 3.0]
+    rejected = issues[issues["rejected"].astype(bool)]
+    assert rejected[["row", "column", "problem"]].values.tolist() == [
+        [1, "country", "missing key"],
+        [2, "country", "duplicate key"],
+        [2, "latitude", "not a number"],
+        [3, "latitude", "outside [-90, 90]"],
+    ]
+    counts = summarize(issues).set_index("problem")["rows"]
+    assert counts.to_dict() == {"missing key": 1, "duplicate key": 1, "not a number": 1, "outside [-90, 90]": 1}
@@ -0,0 +1,107 @@
+"""DatasetStore: LRU eviction, counters, eviction hook and shared builds."""
+import threading
+import time
+
+import numpy as np
+
+from readiness.store import DatasetStore, estimate_bytes
+
+MB = 1024 * 1024
+
+
+def array_loader(version):
+    """One megabyte per version."""
+    return np.zeros(MB, dtype=np.uint8)
+
+
+def test_lru_by_version_count():
+    store = DatasetStore(array_loader, max_bytes=100 * MB, max_versions=2)
+    store.get("a")
+    store.get("b")
+    store.get("a")  # "b" becomes least recently used
+    store.get("c")
+    assert store.stats()["versions"] == ["a", "c"]
+    assert store.evictions == 1
+
+
+def test_lru_by_bytes():
+    store = DatasetStore(array_loader, max_bytes=int(2.5 * MB), max_versions=10)
+    for version in "abc":
+        store.get(version)
+    assert store.stats()["versions"] == ["b", "c"]
+    # Derived artifacts count against the same budget
+    store.derived("c", "big", lambda value: np.zeros(MB, dtype=np.uint8))
+    assert store.stats()["versions"] == ["c"]
+    assert store.nbytes == 2 * estimate_bytes(np.zeros(MB, dtype=np.uint8))
+
+
+def test_most_recent_entry_is_always_kept():
+    store = DatasetStore(array_loader, max_bytes=1, max_versions=1)
+    store.get("a")
+    assert "a" in store and len(store) == 1
+
+
+def test_hit_miss_counters():
+    store = DatasetStore(array_loader)
+    store.get("a")
+    store.get("a")
+    store.derived("a", "sum", lambda value: int(value.sum()))
+    store.derived("a", "sum", lambda value: int(value.sum()))
+    store.peek("a")  # does not count
+    stats = store.stats()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+
+def test_on_evict_receives_derived_artifacts():
+    evicted = []
+    store = DatasetStore(array_loader, max_versions=1, on_evict=lambda v, d: evicted.append((v, sorted(d))))
+    store.derived("a", "layer", lambda value: "a.json")
+    store.get("b")
+    assert evicted == [("a", ["layer"])]
+    store.evict()
+    assert evicted == [("a", ["layer"]), ("b", [])]
+    assert len(store) == 0 and store.evictions == 2
+
+
+def test_concurrent_derived_shares_one_build():
+    store = DatasetStore(array_loader)
+    calls = []
+
+    def builder(value):
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    start = threading.Barrier(8)
+    results = []
+
+    def worker():
+        start.wait()
+        results.append(store.derived("a", "slow", builder))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(calls) == 1
+    assert len(results) == 8 and all(r is results[0] for r in results)
+    # One build miss; the waiting callers are served the shared result
+    assert (store.hits, store.misses) == (7, 1)
+
+
+def test_loads_are_shared_across_threads():
+    loads = []
+
+    def loader(version):
+        loads.append(version)
+        time.sleep(0.05)
+        return version
+
+    store = DatasetStore(loader)
+    threads = [threading.Thread(target=store.get, args=("a",)) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert loads == ["a"]
@@ -0,0 +1,88 @@
+"""Incremental reload (apply_diff / patch_artifacts) against a full rebuild."""
+import pandas as pd
+import pandas.testing as pdt
+
+from readiness.aggregates import build_aggregates
+from readiness.dataset import DATA_PATH, DERIVED_COLUMNS, add_render_columns, parse_csv
+from readiness.hubs import hub_frame
+from readiness.routing import RoutingEngine
+from readiness.watcher import apply_diff, diff_frames, patch_artifacts
+
+
+def full_build(df):
+    engine = RoutingEngine(hub_frame(df))
+    return {"aggregates": build_aggregates(df), "routing_engine": engine, "route_paths": engine.paths(df)}
+
+
+def reload(tmp_path, edit):
+    """(patched frame, patched artifacts, rebuilt frame, rebuilt artifacts, diff) after ``edit(raw)``."""
+    raw = pd.read_csv(DATA_PATH)
+    raw.columns = raw.columns.str.strip()
+    old_path, new_path = tmp_path / "old.csv", tmp_path / "new.csv"
+    raw.to_csv(old_path, index=False)
+    edit(raw).to_csv(new_path, index=False)
+
+    old = add_render_columns(parse_csv(old_path))
+    new = parse_csv(new_path)
+    diff = diff_frames(old, new)
+    patched = apply_diff(old, new.copy(), diff)
+    artifacts = patch_artifacts(old, full_build(old), patched, diff)
+    rebuilt = add_render_columns(new)
+    return patched, artifacts, rebuilt, full_build(rebuilt), diff
+
+
+def edit_add_remove(raw):
+    raw = raw.copy()
+    ghana = raw["country"] == "Ghana"
+    raw.loc[ghana, "primary_inference_route"] = "Regional-Tethered"
+    raw.loc[ghana, "power_reliability"] = "High"
+    raw.loc[ghana, "ai_inference_readiness"] = "Viable"
+    raw = raw[raw["country"] != "Rwanda"]
+    added = raw[raw["country"] == "Ghana"].assign(
+        country="Tanzania", region="East Africa", latitude=-6.369, longitude=34.8888,
+        primary_inference_route="Hybrid-Edge", ai_inference_readiness="Emerging (Early)",
+    )
+    return pd.concat([raw, added], ignore_index=True)
+
+
+def test_diff_finds_edit_add_remove(tmp_path):
+    *_, diff = reload(tmp_path, edit_add_remove)
+    assert diff.summary() == {"added": ["Tanzania"], "removed": ["Rwanda"], "changed": ["Ghana"]}
+
+
+def test_patched_frame_matches_rebuild(tmp_path):
+    patched, _, rebuilt, _, _ = reload(tmp_path, edit_add_remove)
+    for col in DERIVED_COLUMNS:
+        pdt.assert_series_equal(patched[col], rebuilt[col], check_names=False)
+
+
+def test_patched_artifacts_match_rebuild(tmp_path):
+    _, artifacts, _, expected, _ = reload(tmp_path, edit_add_remove)
+    # CPU-only rows changed, so the hub set and its engine are reused
+    assert set(artifacts) == {"aggregates", "routing_engine", "route_paths"}
+    assert artifacts["aggregates"] == expected["aggregates"]
+    pdt.assert_frame_equal(
+        artifacts["route_paths"].reset_index(drop=True), expected["route_paths"].reset_index(drop=True)
+    )
+
+
+def test_hub_change_drops_routing_artifacts(tmp_path):
+    def kenya_loses_gpus(raw):
+        raw = raw.copy()
+        raw.loc[raw["country"] == "Kenya", "ai_compute_availability"] = "CPU-focused"
+        return raw
+
+    _, artifacts, _, expected, diff = reload(tmp_path, kenya_loses_gpus)
+    assert diff.changed == ["Kenya"]
+    # Routing depends on the hub set: rebuilt lazily instead of patched
+    assert "routing_engine" not in artifacts and "route_paths" not in artifacts
+    assert artifacts["aggregates"] == expected["aggregates"]
+
+
+def test_schema_change_needs_full_rebuild(tmp_path):
+    raw = pd.read_csv(DATA_PATH)
+    raw.columns = raw.columns.str.strip()
+    path = tmp_path / "new.csv"
+    raw.drop(columns="founder_insight").to_csv(path, index=False)
+    old = add_render_columns(parse_csv(DATA_PATH))
+    assert diff_frames(old, parse_csv(path)) is None